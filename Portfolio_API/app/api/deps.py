@@ -1,10 +1,18 @@
+import secrets
+import time
 from fastapi import Depends, HTTPException, status
-from fastapi.security import OAuth2PasswordBearer
-from sqlalchemy.orm import Session
-from app.core.database import get_db
+from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer, OAuth2PasswordBearer
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.config import settings
+from app.core.database import get_async_db
 from app.core import security
+from app.core.user_cache import invalidate_user, user_cache
+from app.crud import crud
 from app.models.models import User
+from app.schemas import schemas
 from typing import Optional
+from uuid import UUID
 
 reusable_oauth2 = OAuth2PasswordBearer(
     tokenUrl="/api/v1/auth/google-login"
@@ -15,32 +23,72 @@ optional_oauth2 = OAuth2PasswordBearer(
     auto_error=False
 )
 
-def get_current_user(
-    db: Session = Depends(get_db),
+monitoring_bearer = HTTPBearer(auto_error=False)
+
+# Changes made through the ORM; crud functions using Core statements invalidate explicitly
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _invalidate_cached_user(mapper, connection, target):
+    invalidate_user(target.id)
+
+def _cache_user(token: str, payload: dict, db_user: User) -> schemas.User:
+    user = schemas.User.model_validate(db_user)
+    # Tokens without an expiry are cached for the full AUTH_CACHE_TTL
+    exp = payload.get("exp")
+    ttl = settings.AUTH_CACHE_TTL if exp is None else min(settings.AUTH_CACHE_TTL, exp - time.time())
+    if ttl > 0:
+        user_cache.set(token, user, ttl=ttl)
+    return user
+
+async def get_current_user(
+    db: AsyncSession = Depends(get_async_db),
     token: str = Depends(reusable_oauth2)
-) -> User:
-    user_id = security.verify_token(token)
-    if not user_id:
+) -> schemas.User:
+    user = user_cache.get(token)
+    if user is not None:
+        return user
+
+    payload = security.decode_token(token)
+    if not payload or not payload.get("sub"):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Could not validate credentials",
         )
-    user = db.query(User).filter(User.id == user_id).first()
-    if not user:
+    db_user = await crud.get_user_by_id(db, UUID(payload["sub"]))
+    if not db_user:
         raise HTTPException(status_code=404, detail="User not found")
-    return user
+    if db_user.state_code != 0:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Inactive user")
+    return _cache_user(token, payload, db_user)
 
-def get_optional_user(
-    db: Session = Depends(get_db),
+async def get_optional_user(
+    db: AsyncSession = Depends(get_async_db),
     token: Optional[str] = Depends(optional_oauth2)
-) -> Optional[User]:
+) -> Optional[schemas.User]:
     # This is useful for public pages that might show different things to logged in users
     if not token:
         return None
+    user = user_cache.get(token)
+    if user is not None:
+        return user
     try:
-        user_id = security.verify_token(token)
-        if not user_id:
+        payload = security.decode_token(token)
+        if not payload or not payload.get("sub"):
             return None
-        return db.query(User).filter(User.id == user_id).first()
+        db_user = await crud.get_user_by_id(db, UUID(payload["sub"]))
+        return _cache_user(token, payload, db_user) if db_user and db_user.state_code == 0 else None
     except Exception:
         return None
+
+def verify_monitoring_token(credentials: Optional[HTTPAuthorizationCredentials] = Depends(monitoring_bearer)):
+    """Guards /metrics and /health/*, which expose internals: off unless MONITORING_TOKEN is set"""
+    if not settings.MONITORING_TOKEN:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
+    if credentials is None or not secrets.compare_digest(
+        credentials.credentials.encode(), settings.MONITORING_TOKEN.encode()
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid monitoring token",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
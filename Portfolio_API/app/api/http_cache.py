@@ -0,0 +1,102 @@
+import hashlib
+from datetime import timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from functools import lru_cache
+from typing import Any, Awaitable, Callable, List, Optional
+from uuid import UUID
+from fastapi import Request, Response
+from pydantic import TypeAdapter
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core import response_cache, serialization
+from app.core.config import settings
+from app.core.response_cache import CachedResponse
+from app.crud import crud
+from app.api.pagination import Page
+
+@lru_cache(maxsize=None)
+def _adapter(schema) -> TypeAdapter:
+    return TypeAdapter(schema)
+
+async def cached_read(
+    request: Request,
+    db: AsyncSession,
+    user_id: UUID,
+    sections: List[str],
+    load: Callable[[], Awaitable[Any]],
+    schema: Any,
+) -> Response:
+    """Serve a portfolio read through the response cache and HTTP validators.
+
+    A cached entry is served (or answered with 304) without any database work.
+    On a miss the validators are computed from crud.get_portfolio_version, the
+    payload is loaded with `load`, serialized with `schema` and cached until the
+    next write to this user's portfolio. `load` may return a pagination.Page, whose
+    cursor is sent in the X-Next-Cursor and Link headers.
+    """
+    key = f"{request.url.path}?{sorted(request.query_params.multi_items())}"
+    entry = await response_cache.get(user_id, key)
+
+    if entry is None:
+        generation = await response_cache.generation()
+        last_modified, row_count = await crud.get_portfolio_version(db, user_id, sections)
+        if last_modified is not None and last_modified.tzinfo is None:
+            last_modified = last_modified.replace(tzinfo=timezone.utc)
+
+        # The same URL can return different users' data (the default target is the
+        # logged-in user), so the target id is part of the validator.
+        version = f"{key}|{user_id}|{last_modified}|{row_count}"
+        etag = f'W/"{hashlib.sha1(version.encode()).hexdigest()}"'
+        http_date = format_datetime(last_modified, usegmt=True) if last_modified is not None else None
+
+        if _is_not_modified(request, etag, http_date):
+            return Response(status_code=304, headers=_headers(request, etag, http_date))
+
+        data, next_cursor = await load(), None
+        if isinstance(data, Page):
+            data, next_cursor = data.items, data.next_cursor
+        if serialization.enabled():
+            body = serialization.dump_json(schema, data)
+        else:
+            adapter = _adapter(schema)
+            body = adapter.dump_json(adapter.validate_python(data, from_attributes=True))
+        entry = CachedResponse(body=body, etag=etag, last_modified=http_date, next_cursor=next_cursor)
+        await response_cache.store(user_id, key, entry, generation)
+
+    headers = _headers(request, entry.etag, entry.last_modified)
+    if entry.next_cursor is not None:
+        headers["X-Next-Cursor"] = entry.next_cursor
+        headers["Link"] = f'<{request.url.include_query_params(cursor=entry.next_cursor)}>; rel="next"'
+    if _is_not_modified(request, entry.etag, entry.last_modified):
+        return Response(status_code=304, headers=headers)
+    return Response(content=entry.body, media_type="application/json", headers=headers)
+
+def _headers(request: Request, etag: str, last_modified: Optional[str]) -> dict:
+    headers = {"ETag": etag, "Vary": "Authorization"}
+    if last_modified is not None:
+        headers["Last-Modified"] = last_modified
+
+    # Only responses addressed by an explicit user_id, without credentials, are the
+    # same for everyone; anything else must be revalidated by the client itself.
+    if "user_id" in request.query_params and "authorization" not in request.headers:
+        headers["Cache-Control"] = f"public, max-age={settings.HTTP_CACHE_MAX_AGE}"
+    else:
+        headers["Cache-Control"] = "private, no-cache"
+    return headers
+
+def _is_not_modified(request: Request, etag: str, last_modified: Optional[str]) -> bool:
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        # If-None-Match takes precedence over If-Modified-Since (RFC 9110)
+        candidates = [tag.strip() for tag in if_none_match.split(",")]
+        return "*" in candidates or etag in candidates or etag[2:] in candidates
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since and last_modified is not None:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        if since.tzinfo is None:
+            since = since.replace(tzinfo=timezone.utc)
+        return parsedate_to_datetime(last_modified) <= since
+    return False
@@ -0,0 +1,104 @@
+"""
+Keyset pagination and sparse fieldsets for the portfolio list endpoints.
+
+`?limit=` sets the page size (PAGE_SIZE_DEFAULT when omitted, at most
+PAGE_SIZE_MAX). When there are more rows, the response carries an opaque cursor
+in the X-Next-Cursor header (and a Link rel="next" header); passing it back as
+`?cursor=` returns the rows after the last one of the page, with an index range
+scan instead of an OFFSET. The body stays a plain JSON list.
+
+`?fields=company_name,role,duties` returns only those attributes; only their
+columns (and the requested nested lists) are loaded from the database.
+"""
+import base64
+import binascii
+import json
+from dataclasses import dataclass
+from datetime import datetime
+from functools import lru_cache
+from typing import Any, Awaitable, Callable, List, Optional, Tuple
+from fastapi import HTTPException, Query
+from pydantic import create_model
+from app.core.config import settings
+from app.crud.crud import Keyset
+from app.schemas import schemas
+
+@dataclass(frozen=True)
+class Page:
+    items: list
+    next_cursor: Optional[str] = None
+
+def encode_cursor(row, keyset: Keyset) -> str:
+    values = [getattr(row, column.key) for column in keyset.columns]
+    raw = json.dumps(values, default=str, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+def decode_cursor(cursor: str, keyset: Keyset) -> tuple:
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        if not isinstance(values, list) or len(values) != len(keyset.columns):
+            raise ValueError("wrong number of values")
+        return tuple(_parse(column, value) for column, value in zip(keyset.columns, values))
+    except (ValueError, TypeError, binascii.Error):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+def _parse(column, value):
+    python_type = column.type.python_type
+    if python_type is datetime:
+        return datetime.fromisoformat(value)
+    return python_type(value)
+
+@lru_cache(maxsize=None)
+def fields_schema(schema, fields: Tuple[str, ...]):
+    """`schema` reduced to the given fields, built once per combination"""
+    return create_model(
+        f"{schema.__name__}Fields",
+        __base__=schemas.BaseSchema,
+        **{name: (schema.model_fields[name].annotation, schema.model_fields[name]) for name in fields},
+    )
+
+@dataclass
+class ListParams:
+    schema: Any
+    keyset: Keyset
+    limit: int
+    after: Optional[tuple]
+    fields: Optional[Tuple[str, ...]]
+
+    @property
+    def response_schema(self):
+        """Schema the page is serialized with: the item schema, reduced to `fields` if given"""
+        item = fields_schema(self.schema, self.fields) if self.fields else self.schema
+        return List[item]
+
+    async def load(self, read: Callable[..., Awaitable[list]], *args) -> Page:
+        """Call a crud list function for one page; one extra row tells whether there is a next page"""
+        rows = await read(*args, limit=self.limit + 1, after=self.after, fields=self.fields)
+        if len(rows) <= self.limit:
+            return Page(rows)
+        return Page(rows[:self.limit], encode_cursor(rows[self.limit - 1], self.keyset))
+
+def list_params(schema, keyset: Keyset):
+    """Dependency parsing ?limit=, ?cursor= and ?fields= for a list of `schema` ordered by `keyset`"""
+    def dependency(
+        limit: Optional[int] = Query(None, ge=1, le=settings.PAGE_SIZE_MAX, description="Page size"),
+        cursor: Optional[str] = Query(None, description="X-Next-Cursor of the previous page"),
+        fields: Optional[str] = Query(None, description="Comma-separated attributes to return"),
+    ) -> ListParams:
+        selected = None
+        if fields:
+            selected = tuple(dict.fromkeys(name.strip() for name in fields.split(",") if name.strip())) or None
+            unknown = [name for name in selected or () if name not in schema.model_fields]
+            if unknown:
+                raise HTTPException(
+                    status_code=400,
+                    detail=f"Unknown fields: {', '.join(unknown)}. Available: {', '.join(schema.model_fields)}",
+                )
+        return ListParams(
+            schema=schema,
+            keyset=keyset,
+            limit=limit or settings.PAGE_SIZE_DEFAULT,
+            after=decode_cursor(cursor, keyset) if cursor else None,
+            fields=selected,
+        )
+    return dependency
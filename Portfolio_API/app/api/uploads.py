@@ -0,0 +1,210 @@
+"""
+Size-bounded handling of CV uploads.
+
+UploadSizeLimitMiddleware counts the body of requests to the CV endpoints as it
+is received and rejects it with 413 as soon as it goes over the limit, before
+the multipart parser has buffered it. Each PDF is then copied in chunks to a
+temporary file (rejected on the first chunk if it is not a PDF) and hashed on
+the way, so the text extractor can map that file instead of receiving the
+upload as bytes.
+"""
+import asyncio
+import hashlib
+import os
+import sys
+import tempfile
+from contextlib import suppress
+from typing import BinaryIO, Optional
+from fastapi import HTTPException, UploadFile
+from fastapi.responses import JSONResponse
+from app.core.config import settings
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+PDF_MAGIC = b"%PDF-"
+ZIP_MAGIC = b"PK\x03\x04"
+CHUNK_SIZE = 64 * 1024
+MULTIPART_OVERHEAD = 64 * 1024  # boundaries, headers and the other form fields
+
+def is_pdf(head: bytes) -> bool:
+    # Readers accept up to 1 KB of junk before the header
+    return PDF_MAGIC in head[:1024]
+
+# =====================================================
+# Memory instrumentation
+# =====================================================
+def _rss_bytes() -> Optional[int]:
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        return None
+
+def _peak_rss_bytes() -> Optional[int]:
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024  # kilobytes on Linux
+
+class UploadStats:
+    """Upload sizes, rejections and the process memory high-water mark per CV request.
+
+    A request "raised the high-water mark" when the peak RSS of the process
+    grew while it ran; with concurrent requests the growth is shared between them.
+    """
+
+    def __init__(self):
+        self.requests = 0
+        self.rejected_too_large = 0
+        self.rejected_not_pdf = 0
+        self.in_flight_body_bytes = 0
+        self.peak_in_flight_body_bytes = 0
+        self.max_body_bytes = 0
+        self.high_water_raises = 0
+        self.max_high_water_growth_bytes = 0
+        self.paths = {}
+
+    def received(self, size: int):
+        self.in_flight_body_bytes += size
+        self.peak_in_flight_body_bytes = max(self.peak_in_flight_body_bytes, self.in_flight_body_bytes)
+
+    def finished(self, path: str, body_bytes: int, high_water_growth: int):
+        self.requests += 1
+        self.in_flight_body_bytes -= body_bytes
+        self.max_body_bytes = max(self.max_body_bytes, body_bytes)
+        if high_water_growth > 0:
+            self.high_water_raises += 1
+            self.max_high_water_growth_bytes = max(self.max_high_water_growth_bytes, high_water_growth)
+        per_path = self.paths.setdefault(path, {"requests": 0, "max_body_bytes": 0, "max_high_water_growth_bytes": 0})
+        per_path["requests"] += 1
+        per_path["max_body_bytes"] = max(per_path["max_body_bytes"], body_bytes)
+        per_path["max_high_water_growth_bytes"] = max(per_path["max_high_water_growth_bytes"], high_water_growth)
+
+    def stats(self) -> dict:
+        return {
+            "max_file_bytes": settings.CV_MAX_FILE_BYTES,
+            "requests": self.requests,
+            "rejected_too_large": self.rejected_too_large,
+            "rejected_not_pdf": self.rejected_not_pdf,
+            "in_flight_body_bytes": self.in_flight_body_bytes,
+            "peak_in_flight_body_bytes": self.peak_in_flight_body_bytes,
+            "max_body_bytes": self.max_body_bytes,
+            "high_water_raises": self.high_water_raises,
+            "max_high_water_growth_bytes": self.max_high_water_growth_bytes,
+            "rss_bytes": _rss_bytes(),
+            "peak_rss_bytes": _peak_rss_bytes(),
+            "paths": self.paths,
+        }
+
+upload_stats = UploadStats()
+
+# =====================================================
+# Request body limit
+# =====================================================
+def _body_limit(path: str) -> Optional[int]:
+    if not path.startswith(f"{settings.API_V1_STR}/cv/"):
+        return None
+    if path.rstrip("/").endswith("/batches"):
+        return settings.CV_BATCH_MAX_BYTES + MULTIPART_OVERHEAD
+    return settings.CV_MAX_FILE_BYTES + MULTIPART_OVERHEAD
+
+def _too_large(limit: int) -> str:
+    return f"Upload is larger than {limit} bytes"
+
+class UploadSizeLimitMiddleware:
+    """Rejects CV uploads over the size limit while they are streamed in"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        limit = _body_limit(scope["path"]) if scope["type"] == "http" and scope["method"] == "POST" else None
+        if limit is None:
+            await self.app(scope, receive, send)
+            return
+
+        content_length = dict(scope["headers"]).get(b"content-length", b"")
+        if content_length.isdigit() and int(content_length) > limit:
+            upload_stats.rejected_too_large += 1
+            await JSONResponse({"detail": _too_large(limit)}, status_code=413)(scope, receive, send)
+            return
+
+        body_bytes = 0
+        rejected = False
+
+        async def limited_receive():
+            nonlocal body_bytes, rejected
+            message = await receive()
+            if message["type"] == "http.request" and not rejected:
+                size = len(message.get("body", b""))
+                body_bytes += size
+                upload_stats.received(size)
+                if body_bytes > limit:
+                    rejected = True
+                    upload_stats.rejected_too_large += 1
+                    # Raised inside the form parser; FastAPI turns it into the 413 response
+                    raise HTTPException(status_code=413, detail=_too_large(limit))
+            return message
+
+        peak_before = _peak_rss_bytes() or 0
+        try:
+            await self.app(scope, limited_receive, send)
+        finally:
+            upload_stats.finished(scope["path"], body_bytes, (_peak_rss_bytes() or 0) - peak_before)
+
+# =====================================================
+# Spooled PDF files
+# =====================================================
+class SpooledPDF:
+    """An uploaded PDF copied to a temporary file, with its size and SHA-256"""
+
+    def __init__(self, filename: str, path: str, size: int, sha256: str):
+        self.filename = filename
+        self.path = path
+        self.size = size
+        self.sha256 = sha256
+
+    def read_bytes(self) -> bytes:
+        with open(self.path, "rb") as f:
+            return f.read()
+
+    def close(self):
+        with suppress(FileNotFoundError):
+            os.unlink(self.path)
+
+    def __enter__(self) -> "SpooledPDF":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+def _spool(source: BinaryIO, filename: str, max_bytes: int) -> SpooledPDF:
+    digest = hashlib.sha256()
+    size = 0
+    fd, path = tempfile.mkstemp(prefix="cv-upload-", suffix=".pdf", dir=settings.CV_UPLOAD_SPOOL_DIR)
+    try:
+        with os.fdopen(fd, "wb") as out:
+            while chunk := source.read(CHUNK_SIZE):
+                if size == 0 and not is_pdf(chunk):
+                    upload_stats.rejected_not_pdf += 1
+                    raise HTTPException(status_code=400, detail=f"{filename} is not a PDF file")
+                size += len(chunk)
+                if size > max_bytes:
+                    upload_stats.rejected_too_large += 1
+                    raise HTTPException(status_code=413, detail=f"{filename} is larger than {max_bytes} bytes")
+                digest.update(chunk)
+                out.write(chunk)
+        if size == 0:
+            raise HTTPException(status_code=400, detail=f"{filename} is empty")
+    except BaseException:
+        os.unlink(path)
+        raise
+    return SpooledPDF(filename, path, size, digest.hexdigest())
+
+async def spool_pdf(file: UploadFile, max_bytes: Optional[int] = None) -> SpooledPDF:
+    """Copy an uploaded PDF to a temporary file, checking its magic bytes and size on the way"""
+    await file.seek(0)
+    return await asyncio.to_thread(_spool, file.file, file.filename or "upload", max_bytes or settings.CV_MAX_FILE_BYTES)
@@ -1,10 +1,21 @@
+import asyncio
+import json
+import zipfile
+import zlib
 from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form, status
-from sqlalchemy.orm import Session
-from app.core.database import get_db
+from fastapi.responses import StreamingResponse
+from starlette.background import BackgroundTask
+from typing import BinaryIO, List, Tuple
+from uuid import UUID
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.database import get_async_db
 from app.crud import crud
-from app.services.llm_service import llm_service
+from app.services.cv_extraction_service import cv_extraction_cache
+from app.services.cv_job_service import cv_job_queue
 from app.api import deps
-from app.models.models import User
+from app.api.uploads import ZIP_MAGIC, is_pdf, spool_pdf
+from app.core.config import settings
+from app.schemas import schemas
 
 router = APIRouter()
 
@@ -12,8 +23,8 @@ router = APIRouter()
 async def process_cv(
     file: UploadFile = File(...),
     mode: str = Form("preview"), # mode can be 'preview' or 'replace'
-    db: Session = Depends(get_db),
-    current_user: User = Depends(deps.get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: schemas.User = Depends(deps.get_current_user)
 ):
     """
     Upload a CV PDF, analyze it using LLM.
@@ -26,12 +37,13 @@ async def process_cv(
     if mode not in ["preview", "replace"]:
         raise HTTPException(status_code=400, detail="Invalid mode. Use 'preview' or 'replace'.")
     
+    upload = await spool_pdf(file)
     try:
-        content = await file.read()
-        extracted_data = await llm_service.parse_cv(content)
+        # The spooled file is mapped by the PDF worker; the upload is never read into memory here
+        extracted_data = await cv_extraction_cache.parse_cv(upload.path, upload.sha256)
         
         if mode == "replace":
-            crud.bulk_replace_cv_data(db, extracted_data.model_dump(), current_user.id)
+            await crud.bulk_replace_cv_data(db, extracted_data.model_dump(), current_user.id)
             return {
                 "message": "Portfolio updated successfully from CV",
                 "success": True,
@@ -47,3 +59,201 @@ async def process_cv(
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error processing CV: {str(e)}")
+    finally:
+        upload.close()
+
+def _sse(event: str, data) -> str:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+@router.post("/process/stream", summary="Analyze CV PDF, streaming progress and sections (SSE)")
+async def stream_cv(
+    file: UploadFile = File(...),
+    current_user: schemas.User = Depends(deps.get_current_user)
+):
+    """
+    Preview a CV as Server-Sent Events:
+    - `progress`: {stage: text_extracted (with pages, characters) | model_started | cache_hit}
+    - `section`: {name, data} for each CVExtractionResponse section as soon as the model has written it
+    - `result`: the complete extracted data, last event on success
+    - `error`: {detail} if the extraction failed
+    """
+    if not file.filename.lower().endswith('.pdf'):
+        raise HTTPException(status_code=400, detail="Only PDF files are supported")
+    upload = await spool_pdf(file)
+
+    async def events():
+        stream = cv_extraction_cache.stream_cv(upload.path, upload.sha256)
+        try:
+            async for event, data in stream:
+                if event == "result":
+                    data = data.model_dump(mode="json")
+                yield _sse(event, data)
+        except Exception as e:
+            yield _sse("error", {"detail": f"Error processing CV: {str(e)}"})
+        finally:
+            # Releases the LLM slot right away if the client disconnected mid-stream
+            await stream.aclose()
+            upload.close()
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        background=BackgroundTask(upload.close),  # in case the stream never started
+    )
+
+@router.post("/jobs", response_model=schemas.CVJob, status_code=status.HTTP_202_ACCEPTED, summary="Queue CV PDF processing")
+async def create_cv_job(
+    file: UploadFile = File(...),
+    mode: str = Form("preview"), # mode can be 'preview' or 'replace'
+    db: AsyncSession = Depends(get_async_db),
+    current_user: schemas.User = Depends(deps.get_current_user)
+):
+    """
+    Upload a CV PDF and return immediately with a job id.
+    The CV is analyzed in the background (and applied if mode is 'replace');
+    poll GET /cv/jobs/{job_id} for the status and the extracted data.
+    """
+    if not file.filename.lower().endswith('.pdf'):
+        raise HTTPException(status_code=400, detail="Only PDF files are supported")
+
+    if mode not in ["preview", "replace"]:
+        raise HTTPException(status_code=400, detail="Invalid mode. Use 'preview' or 'replace'.")
+
+    if cv_job_queue.is_full():
+        raise HTTPException(status_code=503, detail="CV processing queue is full, please retry later")
+
+    # Jobs keep the PDF in cv_jobs, so it is read back once it has passed the checks
+    with await spool_pdf(file) as upload:
+        content = await asyncio.to_thread(upload.read_bytes)
+    db_job = await crud.create_cv_job(db, content, file.filename, mode, current_user.id)
+    try:
+        cv_job_queue.enqueue(db_job.id)
+    except asyncio.QueueFull:
+        pass  # Filled up during the upload; the row stays queued and a worker refill picks it up
+    return db_job
+
+@router.get("/jobs/{job_id}", response_model=schemas.CVJob, summary="Get CV processing job")
+async def read_cv_job(
+    job_id: UUID,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: schemas.User = Depends(deps.get_current_user)
+):
+    db_job = await crud.get_cv_job(db, job_id, current_user.id)
+    if not db_job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return db_job
+
+# =====================================================
+# Batch Endpoints
+# =====================================================
+class _BatchFiles:
+    """PDFs of a batch upload, checked against the count and total size limits as they are added"""
+
+    def __init__(self):
+        self.files: List[Tuple[str, bytes]] = []
+        self.total_bytes = 0
+
+    def check(self, size: int):
+        """Raise if one more PDF of `size` bytes would exceed the batch limits"""
+        if len(self.files) >= settings.CV_BATCH_MAX_FILES:
+            raise HTTPException(status_code=400, detail=f"A batch can contain at most {settings.CV_BATCH_MAX_FILES} PDFs")
+        if self.total_bytes + size > settings.CV_BATCH_MAX_BYTES:
+            raise HTTPException(
+                status_code=413, detail=f"The PDFs of a batch can total at most {settings.CV_BATCH_MAX_BYTES} bytes"
+            )
+
+    def add(self, name: str, content: bytes):
+        self.check(len(content))
+        self.files.append((name, content))
+        self.total_bytes += len(content)
+
+def _read_zip(archive_name: str, source: BinaryIO, batch: _BatchFiles):
+    """Add the PDF entries of a zip archive to `batch`, checked against the limits before decompressing"""
+    if source.read(len(ZIP_MAGIC)) != ZIP_MAGIC:
+        raise HTTPException(status_code=400, detail=f"{archive_name} is not a valid zip archive")
+    try:
+        archive = zipfile.ZipFile(source)
+    except zipfile.BadZipFile:
+        raise HTTPException(status_code=400, detail=f"{archive_name} is not a valid zip archive")
+    for info in archive.infolist():
+        name = info.filename.rsplit("/", 1)[-1]
+        if info.is_dir() or info.filename.startswith("__MACOSX/") or not name.lower().endswith(".pdf"):
+            continue
+        if info.file_size > settings.CV_MAX_FILE_BYTES:
+            raise HTTPException(status_code=413, detail=f"{info.filename} is larger than {settings.CV_MAX_FILE_BYTES} bytes")
+        batch.check(info.file_size)
+        try:
+            content = archive.read(info)
+        except (zipfile.BadZipFile, RuntimeError, NotImplementedError, zlib.error) as e:
+            # Bad CRC, encrypted entry or unsupported compression method
+            raise HTTPException(status_code=400, detail=f"{info.filename} could not be extracted from {archive_name}: {e}")
+        if not is_pdf(content):
+            raise HTTPException(status_code=400, detail=f"{info.filename} is not a PDF file")
+        batch.add(name, content)
+
+def _batch_response(jobs: List) -> schemas.CVBatch:
+    completed = sum(1 for job in jobs if job.status == "completed")
+    failed = sum(1 for job in jobs if job.status == "failed")
+    return schemas.CVBatch(
+        id=jobs[0].batch_id,
+        status="completed" if completed + failed == len(jobs) else "processing",
+        total=len(jobs),
+        completed=completed,
+        failed=failed,
+        jobs=jobs,
+    )
+
+@router.post("/batches", response_model=schemas.CVBatch, status_code=status.HTTP_202_ACCEPTED, summary="Queue a batch of CV PDFs")
+async def create_cv_batch(
+    files: List[UploadFile] = File(...),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: schemas.User = Depends(deps.get_current_user)
+):
+    """
+    Upload many CV PDFs (as several files and/or zip archives) for extraction.
+    Every PDF becomes a preview job processed by the background workers, so the
+    batch runs with the server's bounded concurrency; poll GET /cv/batches/{batch_id}
+    for the per-file status and extracted data.
+    """
+    # The limits are checked before each PDF is read, so a batch never holds more than CV_BATCH_MAX_BYTES
+    batch = _BatchFiles()
+    for file in files:
+        name = file.filename or ""
+        if name.lower().endswith(".zip"):
+            # Read from the multipart spool file, so the archive itself is not loaded into memory
+            await file.seek(0)
+            await asyncio.to_thread(_read_zip, name, file.file, batch)
+        elif name.lower().endswith(".pdf"):
+            batch.check(0)
+            with await spool_pdf(file) as upload:
+                batch.check(upload.size)
+                batch.add(name, await asyncio.to_thread(upload.read_bytes))
+        else:
+            raise HTTPException(status_code=400, detail=f"{name}: only PDF files and zip archives are supported")
+    pdfs = batch.files
+
+    if not pdfs:
+        raise HTTPException(status_code=400, detail="No PDF files found in the upload")
+
+    if not cv_job_queue.has_room(len(pdfs)):
+        raise HTTPException(status_code=503, detail="CV processing queue is full, please retry later")
+
+    db_jobs = await crud.create_cv_batch(db, pdfs, "preview", current_user.id)
+    for db_job in db_jobs:
+        try:
+            cv_job_queue.enqueue(db_job.id)
+        except asyncio.QueueFull:
+            break  # Filled up during the upload; the rest stay queued and a worker refill picks them up
+    return _batch_response(db_jobs)
+
+@router.get("/batches/{batch_id}", response_model=schemas.CVBatch, summary="Get CV batch")
+async def read_cv_batch(
+    batch_id: UUID,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: schemas.User = Depends(deps.get_current_user)
+):
+    db_jobs = await crud.get_cv_batch(db, batch_id, current_user.id)
+    if not db_jobs:
+        raise HTTPException(status_code=404, detail="Batch not found")
+    return _batch_response(db_jobs)
@@ -1,5 +1,5 @@
 from pydantic_settings import BaseSettings, SettingsConfigDict
-from typing import Optional, Any, Dict
+from typing import Optional, Any, Dict, Literal
 from pydantic import field_validator, model_validator
 
 class Settings(BaseSettings):
@@ -15,20 +15,120 @@ class Settings(BaseSettings):
     
     # Computed or direct URL
     DATABASE_URL: Optional[str] = None
+    # Same database through the async driver (asyncpg); derived from DATABASE_URL if not provided
+    ASYNC_DATABASE_URL: Optional[str] = None
+    # Direct or session-mode (Supabase port 5432) URL used by migrate_db.py; defaults to DATABASE_URL.
+    # Its lock is a session advisory lock, which a transaction-mode pooler (port 6543) does not keep
+    # on one backend, so concurrent deploys could both apply the migrations.
+    MIGRATION_DATABASE_URL: Optional[str] = None
+
+    # Client-side connection pool
+    # "null": open/close a connection per session (Supabase transaction-mode pooler)
+    # "queue": keep connections open (direct or session-mode connections)
+    DB_POOL_MODE: Literal["null", "queue"] = "null"
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: int = 30  # seconds to wait for a free connection
+    DB_POOL_RECYCLE: int = 1800  # seconds before a connection is replaced
+    DB_POOL_PRE_PING: bool = True
+
+    # Verified token -> user cache used by the auth dependencies (app/core/user_cache.py); changes are
+    # invalidated in this process only, so other workers see them after at most AUTH_CACHE_TTL
+    AUTH_CACHE_TTL: int = 60  # seconds; entries never outlive the token itself
+    AUTH_CACHE_MAX_SIZE: int = 10000
+
+    # HTTP caching of public portfolio reads
+    HTTP_CACHE_MAX_AGE: int = 60  # seconds shared caches may reuse an explicit ?user_id= response
+
+    # Server-side cache of serialized portfolio responses
+    RESPONSE_CACHE_ENABLED: bool = True
+    # The in-process cache assumes a single worker: with several, another worker's writes
+    # only reach it after RESPONSE_CACHE_TTL (see app/core/response_cache.py)
+    RESPONSE_CACHE_TTL: int = 600  # seconds; backstop for writes made by other workers
+    RESPONSE_CACHE_MAX_BYTES: int = 32 * 1024 * 1024
+
+    # Serialize portfolio reads straight from the ORM rows, without Pydantic validation
+    # (app/core/serialization.py; needs the "fast" extra, orjson, and is ignored without it)
+    FAST_SERIALIZATION: bool = False
+
+    # Portfolio list endpoints (?limit=, ?cursor=, ?fields=)
+    PAGE_SIZE_DEFAULT: int = 50  # rows per page when ?limit= is omitted
+    PAGE_SIZE_MAX: int = 200
+
+    # Request latency, database and CV stage metrics exported on GET /metrics (app/core/metrics.py)
+    METRICS_ENABLED: bool = True
+    # Bearer token required by GET /metrics and /health/*; unset = those endpoints answer 404
+    MONITORING_TOKEN: Optional[str] = None
+
+    # Background CV processing jobs
+    CV_JOB_WORKERS: int = 2  # jobs processed concurrently per API process
+    CV_JOB_QUEUE_SIZE: int = 100  # pending jobs before new uploads are rejected
+    CV_JOB_STALE_AFTER: int = 900  # seconds before a "processing" job is considered abandoned
+    CV_JOB_SWEEP_INTERVAL: int = 60  # seconds between requeues of abandoned jobs / refills from cv_jobs
+    CV_BATCH_MAX_FILES: int = 50  # PDFs accepted in one /cv/batches upload
+    CV_MAX_FILE_BYTES: int = 10 * 1024 * 1024  # per PDF, including files inside a zip
+    CV_BATCH_MAX_BYTES: int = 50 * 1024 * 1024  # all PDFs of one /cv/batches upload, after unzipping
+    CV_UPLOAD_SPOOL_DIR: Optional[str] = None  # where uploaded PDFs are spooled; defaults to the system temp dir
+
+    # PDF text extraction (process pool)
+    PDF_WORKERS: int = 2
+    PDF_MAX_PAGES: int = 20  # pages read per document; the rest is ignored
+    PDF_EXTRACT_TIMEOUT: float = 20.0  # seconds per document
+
+    # Gemini calls made by the CV extraction chain
+    LLM_MAX_CONCURRENCY: int = 4  # concurrent requests per API process; size against the quota
+    LLM_QUEUE_TIMEOUT: float = 120.0  # seconds a call may wait for a free slot
+    LLM_REQUEST_TIMEOUT: float = 90.0  # seconds per model request
+    LLM_MAX_RETRIES: int = 3  # retries of rate-limited (429) requests
+    LLM_RETRY_BASE_DELAY: float = 1.0  # seconds, doubled on every retry
+    LLM_RETRY_MAX_DELAY: float = 30.0
+    # Long CVs are split into experience/education/skills sections extracted in parallel
+    LLM_SECTION_SPLIT_ENABLED: bool = True
+    LLM_SECTION_SPLIT_MIN_CHARS: int = 6000  # shorter CVs are extracted in a single request
+    # Rule-based parsing of recognised CV layouts; sections below the confidence go to the LLM
+    CV_RULES_ENABLED: bool = True
+    CV_RULES_MIN_CONFIDENCE: float = 0.8
+
+    # Compaction of soft-deleted portfolio rows (python compact_db.py, or periodically in-process)
+    COMPACTION_RETENTION_DAYS: int = 30  # inactive rows older than this are reclaimed
+    COMPACTION_BATCH_SIZE: int = 500  # parent rows removed per transaction
+    COMPACTION_BATCH_PAUSE: float = 0.05  # seconds between batches, leaves room for request traffic
+    COMPACTION_ARCHIVE: bool = False  # copy rows to archived_rows before deleting them
+    COMPACTION_INTERVAL: int = 0  # seconds between in-process runs; 0 = only through compact_db.py
+
+    # Persisted cache of CV extraction results, keyed by PDF content hash
+    CV_EXTRACTION_CACHE_ENABLED: bool = True
+    CV_EXTRACTION_CACHE_TTL: int = 30 * 24 * 3600  # seconds since last use before an entry is evicted
+    CV_EXTRACTION_CACHE_MAX_BYTES: int = 64 * 1024 * 1024  # total size of stored results
+
+    # Google token verification
+    GOOGLE_USERINFO_URL: str = "https://www.googleapis.com/oauth2/v3/userinfo"
+    GOOGLE_HTTP_TIMEOUT: float = 5.0  # seconds, per read/write
+    GOOGLE_HTTP_CONNECT_TIMEOUT: float = 3.0
+    GOOGLE_HTTP_MAX_CONNECTIONS: int = 50
+    GOOGLE_TOKEN_CACHE_TTL: int = 60  # seconds a verified token -> userinfo result is reused
+    GOOGLE_TOKEN_CACHE_MAX_SIZE: int = 1000
 
     @model_validator(mode='after')
     def assemble_db_connection(self) -> 'Settings':
-        if self.DATABASE_URL:
-            return self
-        
-        # Build URL from components if not provided
-        url = f"postgresql+psycopg2://{self.DB_USER}:{self.DB_PASSWORD}@{self.DB_HOST}:{self.DB_PORT}/{self.DB_NAME}"
-        
-        # Add sslmode=require for remote Supabase
-        if self.DB_HOST not in ["127.0.0.1", "localhost"]:
-            url += "?sslmode=require"
-            
-        self.DATABASE_URL = url
+        if not self.DATABASE_URL:
+            # Build URL from components if not provided
+            url = f"postgresql+psycopg2://{self.DB_USER}:{self.DB_PASSWORD}@{self.DB_HOST}:{self.DB_PORT}/{self.DB_NAME}"
+
+            # Add sslmode=require for remote Supabase
+            if self.DB_HOST not in ["127.0.0.1", "localhost"]:
+                url += "?sslmode=require"
+
+            self.DATABASE_URL = url
+
+        if not self.ASYNC_DATABASE_URL:
+            # asyncpg spells the libpq "sslmode" option as "ssl"
+            self.ASYNC_DATABASE_URL = (
+                self.DATABASE_URL
+                .replace("postgresql+psycopg2://", "postgresql+asyncpg://", 1)
+                .replace("postgresql://", "postgresql+asyncpg://", 1)
+                .replace("sslmode=", "ssl=")
+            )
         return self
 
     model_config = SettingsConfigDict(env_file=".env", case_sensitive=True, extra="ignore")
@@ -1,22 +1,71 @@
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.pool import NullPool
 from app.core.config import settings
+from app.core.metrics import instrument_engine
+
+def get_pool_options(pool_mode: str = settings.DB_POOL_MODE) -> dict:
+    """Engine keyword arguments for the configured pool mode"""
+    # If using Supabase Pooler in transaction mode, it's recommended to use NullPool
+    # to let Supabase manage the connection pooling and avoid client-side state issues.
+    if pool_mode == "null":
+        return {"poolclass": NullPool}
+
+    # Direct or session-mode connections: keep them open so requests skip the
+    # TCP + TLS + auth handshake. create_engine picks QueuePool (AsyncAdaptedQueuePool
+    # for the async engine) by default.
+    return {
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+    }
 
-# If using Supabase Pooler (Transaction/Session mode), it's recommended to use NullPool
-# to let Supabase manage the connection pooling and avoid client-side state issues.
 engine = create_engine(
     settings.DATABASE_URL,
-    poolclass=NullPool,
+    **get_pool_options(),
 )
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Async engine used by the request handlers. Objects stay loaded after commit
+# (expire_on_commit=False) so they can be serialized without another round trip.
+async_engine = create_async_engine(
+    settings.ASYNC_DATABASE_URL,
+    **get_pool_options(),
+)
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
+instrument_engine(engine, "sync")
+instrument_engine(async_engine.sync_engine, "async")
+
 Base = declarative_base()
 
+def get_pool_stats() -> dict:
+    """Current pool statistics for the sync and async engines"""
+    stats = {"mode": settings.DB_POOL_MODE}
+    for name, pool in (("sync", engine.pool), ("async", async_engine.pool)):
+        if isinstance(pool, NullPool):
+            stats[name] = {"status": pool.status()}
+        else:
+            stats[name] = {
+                "size": pool.size(),
+                "checked_in": pool.checkedin(),
+                "checked_out": pool.checkedout(),
+                "overflow": pool.overflow(),
+                "status": pool.status(),
+            }
+    return stats
+
 def get_db():
     db = SessionLocal()
     try:
         yield db
     finally:
         db.close()
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
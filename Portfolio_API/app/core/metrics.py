@@ -0,0 +1,224 @@
+"""
+Request, database and CV pipeline metrics in the Prometheus text format (GET /metrics).
+
+MetricsMiddleware times every HTTP request by route template and, through a
+context variable, collects the number of queries and the database time spent
+on its behalf. instrument_engine hooks the SQLAlchemy engines: every cursor
+execution and every pool checkout (the wait for a free connection, pre-ping and
+any new connection included) is timed. The CV services report their stages
+with observe_stage.
+
+Recording a value is a bisect and two additions in process memory; the text is
+only rendered when /metrics is scraped. Values are per process: with several
+workers, each one is scraped (or aggregated) separately.
+"""
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+from typing import Dict, Optional, Tuple
+from app.core.config import settings
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+STAGE_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 20.0, 30.0, 60.0, 120.0)
+
+# =====================================================
+# Metric types
+# =====================================================
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+def _labels(names: Tuple[str, ...], values: Tuple[str, ...], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(str(value))}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+def _number(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+class Counter:
+    def __init__(self, name: str, help: str, labels: Tuple[str, ...] = ()):
+        self.name = name
+        self.help = help
+        self.label_names = labels
+        self.values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, *labels: str, amount: float = 1):
+        self.values[labels] = self.values.get(labels, 0) + amount
+
+    def render(self) -> list:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        for labels, value in sorted(self.values.items()):
+            lines.append(f"{self.name}{_labels(self.label_names, labels)} {_number(value)}")
+        return lines
+
+class Histogram:
+    def __init__(self, name: str, help: str, buckets: Tuple[float, ...], labels: Tuple[str, ...] = ()):
+        self.name = name
+        self.help = help
+        self.buckets = buckets
+        self.label_names = labels
+        # labels -> [count per bucket (the last one is +Inf, not cumulative), sum]
+        self.series: Dict[Tuple[str, ...], list] = {}
+
+    def observe(self, value: float, *labels: str):
+        series = self.series.get(labels)
+        if series is None:
+            series = self.series[labels] = [[0] * (len(self.buckets) + 1), 0.0]
+        series[0][bisect_left(self.buckets, value)] += 1
+        series[1] += value
+
+    def render(self) -> list:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        for labels, (counts, total) in sorted(self.series.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else _number(bound)
+                bucket_labels = _labels(self.label_names, labels, f'le="{le}"')
+                lines.append(f"{self.name}_bucket{bucket_labels} {cumulative}")
+            lines.append(f"{self.name}_sum{_labels(self.label_names, labels)} {_number(total)}")
+            lines.append(f"{self.name}_count{_labels(self.label_names, labels)} {cumulative}")
+        return lines
+
+# =====================================================
+# Metrics
+# =====================================================
+http_requests = Counter(
+    "http_requests_total", "HTTP requests by route template and status code", ("method", "route", "status"))
+http_request_duration = Histogram(
+    "http_request_duration_seconds", "HTTP request latency by route template", LATENCY_BUCKETS, ("method", "route"))
+http_request_queries = Histogram(
+    "http_request_db_queries", "Database queries executed per HTTP request", QUERY_COUNT_BUCKETS, ("method", "route"))
+http_request_db_time = Histogram(
+    "http_request_db_seconds", "Database time (queries and connection checkouts) per HTTP request",
+    LATENCY_BUCKETS, ("method", "route"))
+db_query_duration = Histogram(
+    "db_query_duration_seconds", "Duration of single database queries", QUERY_BUCKETS, ("engine",))
+db_connection_acquire = Histogram(
+    "db_connection_acquire_seconds", "Time to check a connection out of the pool, including new connections",
+    QUERY_BUCKETS, ("engine",))
+db_connections_opened = Counter(
+    "db_connections_opened_total", "New database connections opened by the pool", ("engine",))
+stage_duration = Histogram(
+    "cv_stage_duration_seconds", "Duration of the CV pipeline stages (PDF extraction, LLM queue and model calls, jobs)",
+    STAGE_BUCKETS, ("stage",))
+
+METRICS = (
+    http_requests, http_request_duration, http_request_queries, http_request_db_time,
+    db_query_duration, db_connection_acquire, db_connections_opened, stage_duration,
+)
+
+def observe_stage(stage: str, seconds: float):
+    """Record the duration of a CV pipeline stage"""
+    if settings.METRICS_ENABLED:
+        stage_duration.observe(seconds, stage)
+
+def render() -> str:
+    """All metrics in the Prometheus text exposition format"""
+    return "\n".join(line for metric in METRICS for line in metric.render()) + "\n"
+
+# =====================================================
+# Per-request database accounting
+# =====================================================
+class RequestStats:
+    __slots__ = ("queries", "db_seconds")
+
+    def __init__(self):
+        self.queries = 0
+        self.db_seconds = 0.0
+
+# Set by MetricsMiddleware for the duration of a request; None in background jobs
+_current_request: ContextVar[Optional[RequestStats]] = ContextVar("current_request", default=None)
+
+def _record_db_time(seconds: float, query: bool):
+    request = _current_request.get()
+    if request is not None:
+        request.queries += query
+        request.db_seconds += seconds
+
+def instrument_engine(engine, name: str):
+    """Time the queries and pool checkouts of a (sync) Engine; pass async_engine.sync_engine for async ones"""
+    from sqlalchemy import event  # not imported by the PDF worker processes, which only report stages
+
+    if not settings.METRICS_ENABLED:
+        return
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info["query_start"] = time.perf_counter()
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - conn.info.pop("query_start", time.perf_counter())
+        db_query_duration.observe(elapsed, name)
+        _record_db_time(elapsed, query=True)
+
+    @event.listens_for(engine, "connect")
+    def _connect(dbapi_connection, connection_record):
+        db_connections_opened.inc(name)
+
+    # The pool has no "checkout started" event, so its connect() is timed directly
+    pool = engine.pool
+    checkout = pool.connect
+
+    def timed_connect():
+        start = time.perf_counter()
+        try:
+            return checkout()
+        finally:
+            elapsed = time.perf_counter() - start
+            db_connection_acquire.observe(elapsed, name)
+            _record_db_time(elapsed, query=False)
+
+    pool.connect = timed_connect
+
+# =====================================================
+# Middleware
+# =====================================================
+def _route_template(scope) -> str:
+    """/api/v1/profile/{profile_id} rather than the raw path, so the label set stays small"""
+    route = scope.get("route")
+    template = getattr(route, "path_format", None) or getattr(route, "path", None)
+    if template is None:
+        return "unmatched"
+    # Routes of included routers may only know their path below the router prefix
+    segments = scope["path"].split("/")
+    prefix = "/".join(segments[:max(0, len(segments) - template.count("/"))])
+    return prefix + template
+
+class MetricsMiddleware:
+    """Records latency, status, query count and database time of every HTTP request"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not settings.METRICS_ENABLED:
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+        request = RequestStats()
+        token = _current_request.set(request)
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            elapsed = time.perf_counter() - start
+            _current_request.reset(token)
+            route = _route_template(scope)
+            method = scope["method"]
+            http_requests.inc(method, route, str(status))
+            http_request_duration.observe(elapsed, method, route)
+            http_request_queries.observe(request.queries, method, route)
+            http_request_db_time.observe(request.db_seconds, method, route)
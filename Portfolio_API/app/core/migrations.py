@@ -0,0 +1,136 @@
+"""
+Versioned schema migrations.
+
+Scripts live in Portfolio_API/migrations as NNNN_description.py and define
+`upgrade(connection)`. Applied versions are recorded in the schema_migrations
+table; `python migrate_db.py` applies the pending ones in order, each in its own
+transaction unless the script sets TRANSACTIONAL = False (needed for
+CREATE INDEX CONCURRENTLY on PostgreSQL).
+
+Concurrent runs are serialized by a session-level advisory lock held for the
+whole upgrade, so on PostgreSQL the engine must use a direct or session-mode
+connection (MIGRATION_DATABASE_URL), never a transaction-mode pooler.
+"""
+import importlib.util
+import re
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from types import ModuleType
+from typing import Callable, List, Optional
+from sqlalchemy import Column, DateTime, Integer, MetaData, String, Table, inspect, select, text
+from sqlalchemy.engine import Connection, Engine
+
+MIGRATIONS_DIR = Path(__file__).resolve().parents[2] / "migrations"
+_FILE_NAME = re.compile(r"^(\d{4})_(\w+)\.py$")
+# Serializes concurrent `migrate_db.py` runs (several containers starting at once)
+_ADVISORY_LOCK_ID = 7_310_452_019
+# Supabase's transaction-mode pooler, which hands each transaction to any backend
+TRANSACTION_POOLER_PORT = 6543
+
+schema_migrations = Table(
+    "schema_migrations",
+    MetaData(),
+    Column("version", Integer, primary_key=True),
+    Column("name", String(255), nullable=False),
+    Column("applied_on", DateTime(timezone=True), nullable=False),
+)
+
+@dataclass
+class Migration:
+    version: int
+    name: str
+    path: Path
+
+    def load(self) -> ModuleType:
+        spec = importlib.util.spec_from_file_location(f"migrations.{self.path.stem}", self.path)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        return module
+
+def discover(directory: Path = MIGRATIONS_DIR) -> List[Migration]:
+    migrations = []
+    for path in sorted(directory.glob("*.py")):
+        match = _FILE_NAME.match(path.name)
+        if match:
+            migrations.append(Migration(int(match.group(1)), match.group(2), path))
+    versions = [migration.version for migration in migrations]
+    if len(set(versions)) != len(versions):
+        raise ValueError(f"Duplicate migration versions in {directory}")
+    return migrations
+
+def applied_versions(connection: Connection) -> set:
+    if not inspect(connection).has_table(schema_migrations.name):
+        return set()
+    return set(connection.scalars(select(schema_migrations.c.version)))
+
+def pending(engine: Engine) -> List[Migration]:
+    with engine.connect() as connection:
+        applied = applied_versions(connection)
+    return [migration for migration in discover() if migration.version not in applied]
+
+def upgrade(
+    engine: Engine,
+    target: Optional[int] = None,
+    on_start: Callable[[Migration], None] = lambda migration: None,
+) -> List[Migration]:
+    """Apply the pending migrations up to `target` (all by default); returns those applied"""
+    applied = []
+    with engine.connect() as lock_connection:
+        is_postgres = engine.dialect.name == "postgresql"
+        if is_postgres:
+            lock_connection.exec_driver_sql(f"SELECT pg_advisory_lock({_ADVISORY_LOCK_ID})")
+            lock_connection.commit()
+        try:
+            with engine.begin() as connection:
+                schema_migrations.create(connection, checkfirst=True)
+            for migration in pending(engine):
+                if target is not None and migration.version > target:
+                    break
+                on_start(migration)
+                module = migration.load()
+                if getattr(module, "TRANSACTIONAL", True):
+                    with engine.begin() as connection:
+                        module.upgrade(connection)
+                        _record(connection, migration)
+                else:
+                    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as connection:
+                        module.upgrade(connection)
+                    with engine.begin() as connection:
+                        _record(connection, migration)
+                applied.append(migration)
+        finally:
+            if is_postgres:
+                lock_connection.exec_driver_sql(f"SELECT pg_advisory_unlock({_ADVISORY_LOCK_ID})")
+                lock_connection.commit()
+    return applied
+
+def _record(connection: Connection, migration: Migration):
+    connection.execute(schema_migrations.insert().values(
+        version=migration.version, name=migration.name, applied_on=datetime.utcnow()
+    ))
+
+# =====================================================
+# Helpers for migration scripts
+# =====================================================
+def has_column(connection: Connection, table: str, column: str) -> bool:
+    return column in {existing["name"] for existing in inspect(connection).get_columns(table)}
+
+def create_index(connection: Connection, name: str, table: str, columns: str, where: Optional[str] = None):
+    """CREATE INDEX IF NOT EXISTS, without blocking writes on PostgreSQL (needs TRANSACTIONAL = False)"""
+    concurrently = ""
+    if connection.dialect.name == "postgresql":
+        concurrently = " CONCURRENTLY"
+        # A failed concurrent build leaves an invalid index behind that IF NOT EXISTS would keep
+        invalid = connection.execute(text(
+            "SELECT 1 FROM pg_index i JOIN pg_class c ON c.oid = i.indexrelid WHERE c.relname = :name AND NOT i.indisvalid"
+        ), {"name": name}).first()
+        if invalid:
+            connection.exec_driver_sql(f"DROP INDEX CONCURRENTLY {name}")
+    predicate = f" WHERE {where}" if where else ""
+    connection.exec_driver_sql(f"CREATE INDEX{concurrently} IF NOT EXISTS {name} ON {table} ({columns}){predicate}")
+
+def drop_index(connection: Connection, name: str):
+    """DROP INDEX IF EXISTS, without blocking writes on PostgreSQL (needs TRANSACTIONAL = False)"""
+    concurrently = " CONCURRENTLY" if connection.dialect.name == "postgresql" else ""
+    connection.exec_driver_sql(f"DROP INDEX{concurrently} IF EXISTS {name}")
@@ -0,0 +1,154 @@
+"""
+Cache of serialized portfolio responses, keyed by target user and endpoint variant.
+
+Entries are invalidated per user by every mutating function in crud.py. The
+in-process backend is the default and assumes a single worker process (as the
+Dockerfile runs uvicorn): a write handled by one worker does not invalidate the
+others, which keep serving their copy (and answering 304 to it) for up to
+RESPONSE_CACHE_TTL. With several workers, implement ResponseCacheBackend over a
+shared store and install it with set_backend(), or disable the cache / lower the TTL.
+"""
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Optional
+from uuid import UUID
+from app.core.config import settings
+
+@dataclass(frozen=True)
+class CachedResponse:
+    body: bytes
+    etag: str
+    last_modified: Optional[str] = None
+    next_cursor: Optional[str] = None  # paginated lists
+
+class ResponseCacheBackend(ABC):
+    @abstractmethod
+    async def get(self, user_id: UUID, key: str) -> Optional[CachedResponse]:
+        ...
+
+    @abstractmethod
+    async def set(self, user_id: UUID, key: str, entry: CachedResponse, generation: int) -> None:
+        """Store an entry unless an invalidation happened since `generation` was read"""
+
+    @abstractmethod
+    async def generation(self) -> int:
+        """Counter bumped by every invalidation; read it before loading from the DB"""
+
+    @abstractmethod
+    async def invalidate_user(self, user_id: UUID) -> None:
+        ...
+
+    @abstractmethod
+    def stats(self) -> dict:
+        ...
+
+class NullResponseCache(ResponseCacheBackend):
+    """Disables response caching"""
+    async def get(self, user_id, key):
+        return None
+
+    async def set(self, user_id, key, entry, generation):
+        pass
+
+    async def generation(self):
+        return 0
+
+    async def invalidate_user(self, user_id):
+        pass
+
+    def stats(self):
+        return {"backend": "none"}
+
+class InMemoryResponseCache(ResponseCacheBackend):
+    """LRU cache bounded by total body size, with a TTL as a backstop for missed invalidations"""
+
+    def __init__(self, max_bytes: int, ttl: float):
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._data: "OrderedDict[tuple, tuple]" = OrderedDict()
+        self._size = 0
+        self._generation = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def _remove(self, cache_key):
+        _, entry = self._data.pop(cache_key)
+        self._size -= len(entry.body)
+
+    async def get(self, user_id, key):
+        with self._lock:
+            cached = self._data.get((user_id, key))
+            if cached is None or cached[0] <= time.monotonic():
+                if cached is not None:
+                    self._remove((user_id, key))
+                self.misses += 1
+                return None
+            self._data.move_to_end((user_id, key))
+            self.hits += 1
+            return cached[1]
+
+    async def set(self, user_id, key, entry, generation):
+        if len(entry.body) > self.max_bytes:
+            return
+        with self._lock:
+            if generation != self._generation:
+                return
+            if (user_id, key) in self._data:
+                self._remove((user_id, key))
+            self._data[(user_id, key)] = (time.monotonic() + self.ttl, entry)
+            self._size += len(entry.body)
+            while self._size > self.max_bytes:
+                self._remove(next(iter(self._data)))
+                self.evictions += 1
+
+    async def generation(self):
+        return self._generation
+
+    async def invalidate_user(self, user_id):
+        with self._lock:
+            self._generation += 1
+            self.invalidations += 1
+            for cache_key in [k for k in self._data if k[0] == user_id]:
+                self._remove(cache_key)
+
+    def stats(self):
+        return {
+            "backend": "memory",
+            "entries": len(self._data),
+            "size_bytes": self._size,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+        }
+
+backend: ResponseCacheBackend = (
+    InMemoryResponseCache(settings.RESPONSE_CACHE_MAX_BYTES, settings.RESPONSE_CACHE_TTL)
+    if settings.RESPONSE_CACHE_ENABLED else NullResponseCache()
+)
+
+def set_backend(new_backend: ResponseCacheBackend) -> None:
+    global backend
+    backend = new_backend
+
+async def get(user_id: UUID, key: str) -> Optional[CachedResponse]:
+    return await backend.get(user_id, key)
+
+async def store(user_id: UUID, key: str, entry: CachedResponse, generation: int) -> None:
+    await backend.set(user_id, key, entry, generation)
+
+async def generation() -> int:
+    return await backend.generation()
+
+async def invalidate_user(user_id: UUID) -> None:
+    await backend.invalidate_user(user_id)
+
+def stats() -> dict:
+    return backend.stats()
@@ -0,0 +1,94 @@
+"""
+Fast JSON serialization of ORM rows (FAST_SERIALIZATION).
+
+The default path validates every row into a Pydantic model (from_attributes)
+before dumping it. Here each response schema is compiled once into a plain
+function that reads the schema's fields straight off the rows into dicts, and
+the result is encoded with orjson. Values are not validated: the fast path
+trusts the ORM rows. Optional fields serialize exactly as on the default path,
+but a NULL in a column the schema declares required (for example a legacy
+experience without tech_stack) is written as null, where the default path fails
+validation with a 500.
+
+orjson is an optional dependency (pip install "portfolio-api[fast]"). Without
+it the compiled functions would have to be encoded with the json module, which
+is slower than the default path, so enabled() is False and FAST_SERIALIZATION
+is ignored with a warning.
+"""
+import json
+from datetime import date, datetime
+from functools import lru_cache
+from types import SimpleNamespace, UnionType
+from typing import Any, Callable, List, Optional, Union, get_args, get_origin
+from uuid import UUID
+from pydantic import BaseModel
+from app.core.config import settings
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+def enabled() -> bool:
+    """Whether portfolio reads use the fast path: FAST_SERIALIZATION, and orjson is installed"""
+    return settings.FAST_SERIALIZATION and orjson is not None
+
+def warn_if_unavailable():
+    """Called once at startup"""
+    if settings.FAST_SERIALIZATION and orjson is None:
+        print("FAST_SERIALIZATION is ignored: orjson is not installed (pip install \"portfolio-api[fast]\")")
+
+def _is_model(annotation) -> bool:
+    return isinstance(annotation, type) and issubclass(annotation, BaseModel)
+
+@lru_cache(maxsize=None)
+def serializer(schema) -> Optional[Callable[[Any], Any]]:
+    """Function mapping a value of type `schema` to JSON-ready data; None when the value can be used as is"""
+    origin = get_origin(schema)
+    if origin in (list, List):
+        item = serializer(get_args(schema)[0])
+        return (lambda rows: [item(row) for row in rows]) if item else list
+    if origin is Union or origin is UnionType:  # Optional[X] and X | None
+        inner = [arg for arg in get_args(schema) if arg is not type(None)]
+        item = serializer(inner[0]) if len(inner) == 1 else None
+        return (lambda value: None if value is None else item(value)) if item else None
+    if _is_model(schema):
+        return _compile(schema)
+    return None
+
+def _compile(schema) -> Callable[[Any], dict]:
+    # Generated once per schema: def serialize(obj): return {"id": obj.id, "duties": _duties(obj.duties), ...}
+    namespace = {"SimpleNamespace": SimpleNamespace}
+    items = []
+    for name, field in schema.model_fields.items():
+        nested = serializer(field.annotation)
+        if nested is None:
+            items.append(f"{name!r}: obj.{name}")
+        else:
+            namespace[f"_{name}"] = nested
+            items.append(f"{name!r}: _{name}(obj.{name})")
+    source = (
+        "def serialize(obj):\n"
+        "    if obj.__class__ is dict:\n"
+        "        obj = SimpleNamespace(**obj)\n"
+        f"    return {{{', '.join(items)}}}\n"
+    )
+    exec(compile(source, f"<serializer {schema.__name__}>", "exec"), namespace)
+    return namespace["serialize"]
+
+def _default(value):
+    if isinstance(value, datetime) and value.utcoffset() is not None and not value.utcoffset():
+        return value.replace(tzinfo=None).isoformat() + "Z"  # as Pydantic and orjson (OPT_UTC_Z)
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, UUID):
+        return str(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+def dump_json(schema, data) -> bytes:
+    """Serialize `data` (ORM rows, or dicts of them) as `schema` to JSON bytes"""
+    convert = serializer(schema)
+    value = convert(data) if convert else data
+    if orjson is not None:
+        return orjson.dumps(value, option=orjson.OPT_UTC_Z)
+    return json.dumps(value, default=_default, separators=(",", ":")).encode()
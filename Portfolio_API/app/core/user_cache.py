@@ -0,0 +1,19 @@
+"""
+Verified token -> user identity cache of the auth dependencies (app/api/deps.py).
+
+On a hit the auth dependencies neither decode the JWT nor touch the database.
+Entries are dropped by invalidate_user(), which every crud function changing a
+user calls after committing (Core update() statements fire no ORM events), and
+by ORM flushes of User objects. Other workers keep their entries until they
+expire, so AUTH_CACHE_TTL bounds how long they may still accept a user that
+was deactivated or changed elsewhere.
+"""
+from uuid import UUID
+from app.core.cache import TTLCache
+from app.core.config import settings
+
+user_cache = TTLCache(maxsize=settings.AUTH_CACHE_MAX_SIZE, ttl=settings.AUTH_CACHE_TTL)
+
+def invalidate_user(user_id: UUID) -> int:
+    """Forget every cached token of a user"""
+    return user_cache.delete_where(lambda token, user: user.id == user_id)
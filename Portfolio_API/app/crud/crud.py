@@ -1,262 +1,516 @@
-from sqlalchemy.orm import Session
-from typing import List, Optional
+import itertools
+import uuid
+from dataclasses import dataclass
+from sqlalchemy import select, insert, update, delete, func, or_, tuple_, union_all
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import defer, load_only, selectinload
+from datetime import datetime, timedelta
+from typing import List, Optional, Sequence, Tuple
 from uuid import UUID
+from app.core import response_cache, user_cache
 from app.models.models import (
     User, Profile, SkillCategory, Skill, OtherSkill,
-    Experience, ExperienceDuty, ExperienceDomain, Education
+    Experience, ExperienceDuty, ExperienceDomain, Education, CVJob, CVExtraction
 )
 
+# Note: every read that is serialized with nested schemas must eager-load its
+# relationships, since lazy loading is not available on an AsyncSession.
+# Every write must invalidate the user's cached responses after committing.
+
 # =====================================================
 # User CRUD
 # =====================================================
-def get_user_by_email(db: Session, email: str) -> Optional[User]:
-    return db.query(User).filter(User.email == email).first()
+async def get_user_by_email(db: AsyncSession, email: str) -> Optional[User]:
+    return await db.scalar(select(User).where(User.email == email))
+
+async def get_user_by_id(db: AsyncSession, user_id: UUID) -> Optional[User]:
+    return await db.get(User, user_id)
 
-def get_user_by_id(db: Session, user_id: UUID) -> Optional[User]:
-    return db.query(User).filter(User.id == user_id).first()
+async def get_first_user(db: AsyncSession) -> Optional[User]:
+    return await db.scalar(select(User).limit(1))
+
+async def update_user(db: AsyncSession, user_id: UUID, user_data: dict) -> bool:
+    """Update a user's columns (state_code=1 deactivates it); False if it does not exist"""
+    result = await db.execute(update(User).where(User.id == user_id).values(**user_data, modified_on=datetime.utcnow()))
+    await db.commit()
+    # Core statements fire no ORM events: drop the cached identity so the auth dependencies reload it
+    user_cache.invalidate_user(user_id)
+    return result.rowcount == 1
+
+# =====================================================
+# List reads: keyset pagination and sparse fieldsets
+# =====================================================
+@dataclass(frozen=True)
+class Keyset:
+    """ORDER BY of a paginated list; the last column makes the position unique"""
+    columns: tuple
+    descending: bool = False
+
+SKILL_CATEGORY_KEYSET = Keyset((SkillCategory.display_order, SkillCategory.id))
+OTHER_SKILL_KEYSET = Keyset((OtherSkill.created_on, OtherSkill.id))
+EXPERIENCE_KEYSET = Keyset((Experience.created_on, Experience.id), descending=True)  # newest first
+EDUCATION_KEYSET = Keyset((Education.created_on, Education.id))
+
+def _list_query(
+    query,
+    keyset: Keyset,
+    children: tuple = (),
+    limit: Optional[int] = None,
+    after: Optional[Sequence] = None,
+    fields: Optional[Sequence[str]] = None,
+):
+    """Order `query` by `keyset`, start after the position `after` (the keyset values of
+    the last row of the previous page) and load only the attributes named in `fields`:
+    columns, or the `children` relationships serialized with the rows (all when None)."""
+    if after is not None:
+        position, last = tuple_(*keyset.columns), tuple_(*after)
+        query = query.where(position < last if keyset.descending else position > last)
+    query = query.order_by(*(column.desc() if keyset.descending else column for column in keyset.columns))
+    if limit is not None:
+        query = query.limit(limit)
+
+    if fields is None:
+        return query.options(*(selectinload(child) for child in children))
+    model = keyset.columns[0].class_
+    relationships = {child.key for child in children}
+    return query.options(
+        load_only(*(getattr(model, name) for name in fields if name not in relationships), *keyset.columns),
+        *(selectinload(child) for child in children if child.key in fields),
+    )
 
 # =====================================================
 # Profile CRUD
 # =====================================================
-def get_profile(db: Session, user_id: UUID) -> Optional[Profile]:
+async def get_profile(db: AsyncSession, user_id: UUID) -> Optional[Profile]:
     """Get the active profile for a user"""
-    return db.query(Profile).filter(Profile.user_id == user_id, Profile.state_code == 0).first()
+    return await db.scalar(select(Profile).where(Profile.user_id == user_id, Profile.state_code == 0).limit(1))
 
-def create_profile(db: Session, profile_data: dict, user_id: UUID) -> Profile:
+async def create_profile(db: AsyncSession, profile_data: dict, user_id: UUID) -> Profile:
     """Create a new profile for a user"""
     db_profile = Profile(**profile_data, user_id=user_id)
     db.add(db_profile)
-    db.commit()
-    db.refresh(db_profile)
+    await db.commit()
+    await response_cache.invalidate_user(user_id)
     return db_profile
 
-def update_profile(db: Session, profile_id: UUID, profile_data: dict, user_id: UUID) -> Optional[Profile]:
+async def update_profile(db: AsyncSession, profile_id: UUID, profile_data: dict, user_id: UUID) -> Optional[Profile]:
     """Update an existing profile belonging to a specific user"""
-    db_profile = db.query(Profile).filter(Profile.id == profile_id, Profile.user_id == user_id).first()
+    db_profile = await db.scalar(select(Profile).where(Profile.id == profile_id, Profile.user_id == user_id))
     if db_profile:
         for key, value in profile_data.items():
             setattr(db_profile, key, value)
-        db.commit()
-        db.refresh(db_profile)
+        await db.commit()
+        await response_cache.invalidate_user(user_id)
     return db_profile
 
 # =====================================================
 # Skill Category CRUD
 # =====================================================
-def get_skill_categories(db: Session, user_id: UUID, include_inactive: bool = False) -> List[SkillCategory]:
-    """Get all skill categories for a user"""
-    query = db.query(SkillCategory).filter(SkillCategory.user_id == user_id)
+async def get_skill_categories(
+    db: AsyncSession, user_id: UUID, include_inactive: bool = False,
+    limit: Optional[int] = None, after: Optional[Sequence] = None, fields: Optional[Sequence[str]] = None,
+) -> List[SkillCategory]:
+    """Get the skill categories of a user with their active skills (a page of them when `limit` is given)"""
+    query = select(SkillCategory).where(SkillCategory.user_id == user_id)
+    skills = SkillCategory.skills
     if not include_inactive:
-        query = query.filter(SkillCategory.state_code == 0)
-    return query.order_by(SkillCategory.display_order).all()
+        query = query.where(SkillCategory.state_code == 0)
+        skills = SkillCategory.skills.and_(Skill.state_code == 0)
+    return list(await db.scalars(_list_query(query, SKILL_CATEGORY_KEYSET, (skills,), limit, after, fields)))
 
-def create_skill_category(db: Session, category_data: dict, user_id: UUID) -> SkillCategory:
+async def get_skill_category(db: AsyncSession, category_id: UUID, user_id: UUID) -> Optional[SkillCategory]:
+    """Get a skill category if it belongs to a specific user"""
+    return await db.scalar(select(SkillCategory).where(SkillCategory.id == category_id, SkillCategory.user_id == user_id))
+
+async def create_skill_category(db: AsyncSession, category_data: dict, user_id: UUID) -> SkillCategory:
     """Create a new skill category for a user"""
-    db_category = SkillCategory(**category_data, user_id=user_id)
+    db_category = SkillCategory(**category_data, user_id=user_id, skills=[])
     db.add(db_category)
-    db.commit()
-    db.refresh(db_category)
+    await db.commit()
+    await response_cache.invalidate_user(user_id)
     return db_category
 
 # =====================================================
 # Skill CRUD
 # =====================================================
-def get_skills(db: Session, category_id: UUID) -> List[Skill]:
+async def get_skills(db: AsyncSession, category_id: UUID) -> List[Skill]:
     """Get all skills for a category"""
-    return db.query(Skill).filter(Skill.category_id == category_id, Skill.state_code == 0).all()
+    return list(await db.scalars(select(Skill).where(Skill.category_id == category_id, Skill.state_code == 0)))
 
-def create_skill(db: Session, skill_data: dict) -> Skill:
-    """Create a new skill in a category"""
+async def create_skill(db: AsyncSession, skill_data: dict, user_id: UUID) -> Skill:
+    """Create a new skill in a category owned by a user"""
     # Note: Skill is linked to Category, which belongs to User
     db_skill = Skill(**skill_data)
     db.add(db_skill)
-    db.commit()
-    db.refresh(db_skill)
+    await db.commit()
+    await response_cache.invalidate_user(user_id)
     return db_skill
 
 # =====================================================
 # Other Skill CRUD
 # =====================================================
-def get_other_skills(db: Session, user_id: UUID) -> List[OtherSkill]:
-    """Get all other skills for a user"""
-    return db.query(OtherSkill).filter(OtherSkill.user_id == user_id, OtherSkill.state_code == 0).all()
+async def get_other_skills(
+    db: AsyncSession, user_id: UUID,
+    limit: Optional[int] = None, after: Optional[Sequence] = None, fields: Optional[Sequence[str]] = None,
+) -> List[OtherSkill]:
+    """Get the other skills of a user (a page of them when `limit` is given)"""
+    query = select(OtherSkill).where(OtherSkill.user_id == user_id, OtherSkill.state_code == 0)
+    return list(await db.scalars(_list_query(query, OTHER_SKILL_KEYSET, (), limit, after, fields)))
 
-def create_other_skill(db: Session, skill_data: dict, user_id: UUID) -> OtherSkill:
+async def create_other_skill(db: AsyncSession, skill_data: dict, user_id: UUID) -> OtherSkill:
     """Create a new other skill for a user"""
     db_skill = OtherSkill(**skill_data, user_id=user_id)
     db.add(db_skill)
-    db.commit()
-    db.refresh(db_skill)
+    await db.commit()
+    await response_cache.invalidate_user(user_id)
     return db_skill
 
 # =====================================================
 # Experience CRUD
 # =====================================================
-def get_experiences(db: Session, user_id: UUID) -> List[Experience]:
-    """Get all experiences for a user"""
-    return db.query(Experience).filter(Experience.user_id == user_id, Experience.state_code == 0).order_by(Experience.created_on.desc()).all()
+async def get_experiences(
+    db: AsyncSession, user_id: UUID,
+    limit: Optional[int] = None, after: Optional[Sequence] = None, fields: Optional[Sequence[str]] = None,
+) -> List[Experience]:
+    """Get the experiences of a user, newest first (a page of them when `limit` is given)"""
+    query = select(Experience).where(Experience.user_id == user_id, Experience.state_code == 0)
+    return list(await db.scalars(_list_query(query, EXPERIENCE_KEYSET, (Experience.duties, Experience.domains), limit, after, fields)))
 
-def create_experience(db: Session, experience_data: dict, user_id: UUID) -> Experience:
+async def create_experience(db: AsyncSession, experience_data: dict, user_id: UUID) -> Experience:
     """Create a new experience for a user"""
     duties = experience_data.pop('duties', [])
     domains = experience_data.pop('domains', [])
-    
-    db_experience = Experience(**experience_data, user_id=user_id)
+
+    db_experience = Experience(
+        **experience_data,
+        user_id=user_id,
+        duties=[ExperienceDuty(description=duty_desc) for duty_desc in duties],
+        domains=[ExperienceDomain(name=domain_name) for domain_name in domains],
+    )
     db.add(db_experience)
-    db.commit()
-    db.refresh(db_experience)
-    
-    for duty_desc in duties:
-        db.add(ExperienceDuty(description=duty_desc, experience_id=db_experience.id))
-    
-    for domain_name in domains:
-        db.add(ExperienceDomain(name=domain_name, experience_id=db_experience.id))
-    
-    db.commit()
-    db.refresh(db_experience)
+    await db.commit()
+    await response_cache.invalidate_user(user_id)
     return db_experience
 
 # =====================================================
 # Education CRUD
 # =====================================================
-def get_educations(db: Session, user_id: UUID) -> List[Education]:
-    """Get all educations for a user"""
-    return db.query(Education).filter(Education.user_id == user_id, Education.state_code == 0).all()
+async def get_educations(
+    db: AsyncSession, user_id: UUID,
+    limit: Optional[int] = None, after: Optional[Sequence] = None, fields: Optional[Sequence[str]] = None,
+) -> List[Education]:
+    """Get the educations of a user (a page of them when `limit` is given)"""
+    query = select(Education).where(Education.user_id == user_id, Education.state_code == 0)
+    return list(await db.scalars(_list_query(query, EDUCATION_KEYSET, (), limit, after, fields)))
 
-def create_education(db: Session, education_data: dict, user_id: UUID) -> Education:
+async def create_education(db: AsyncSession, education_data: dict, user_id: UUID) -> Education:
     """Create a new education for a user"""
     db_education = Education(**education_data, user_id=user_id)
     db.add(db_education)
-    db.commit()
-    db.refresh(db_education)
+    await db.commit()
+    await response_cache.invalidate_user(user_id)
     return db_education
 
+# =====================================================
+# Portfolio (aggregated read)
+# =====================================================
+async def get_portfolio(db: AsyncSession, user_id: UUID) -> dict:
+    """Get the whole active portfolio for a user.
+
+    Child collections are loaded with selectin loading, so the query count stays
+    fixed (8) no matter how many categories or experiences the user has.
+    """
+    return {
+        "profile": await get_profile(db, user_id),
+        "skill_categories": await get_skill_categories(db, user_id),
+        "other_skills": await get_other_skills(db, user_id),
+        "experiences": await get_experiences(db, user_id),
+        "educations": await get_educations(db, user_id),
+    }
+
+# =====================================================
+# Portfolio version (HTTP cache validators)
+# =====================================================
+# Tables whose rows make up each section of the portfolio
+PORTFOLIO_SECTIONS = {
+    "profile": (Profile,),
+    "skill_categories": (SkillCategory, Skill),
+    "other_skills": (OtherSkill,),
+    "experiences": (Experience, ExperienceDuty, ExperienceDomain),
+    "educations": (Education,),
+}
+
+def _version_query(model, user_id: UUID):
+    query = select(func.max(model.modified_on), func.count())
+    if model is Skill:
+        query = query.join(SkillCategory, Skill.category_id == SkillCategory.id)
+        owner = SkillCategory.user_id
+    elif model in (ExperienceDuty, ExperienceDomain):
+        query = query.join(Experience, model.experience_id == Experience.id)
+        owner = Experience.user_id
+    else:
+        owner = model.user_id
+    return query.where(owner == user_id)
+
+async def get_portfolio_version(db: AsyncSession, user_id: UUID, sections: List[str]) -> Tuple[Optional[datetime], int]:
+    """Latest modified_on and row count over the given sections, in one query.
+
+    Updates (including soft deletes) move modified_on forward and hard deletes
+    change the count, so the pair changes whenever the serialized data does.
+    """
+    models = [model for section in sections for model in PORTFOLIO_SECTIONS[section]]
+    rows = (await db.execute(union_all(*(_version_query(model, user_id) for model in models)))).all()
+    timestamps = [row[0] for row in rows if row[0] is not None]
+    return (max(timestamps) if timestamps else None), sum(row[1] for row in rows)
+
 # =====================================================
 # CV Replacement
 # =====================================================
-def bulk_replace_cv_data(db: Session, extraction: dict, user_id: UUID):
-    """Replace all data for a specific user"""
-    
-    # 1. Profile
-    if extraction.get('profile'):
-        existing = get_profile(db, user_id)
-        if existing:
-            for key, val in extraction['profile'].items():
-                if val is not None: setattr(existing, key, val)
-        else:
-            create_profile(db, extraction['profile'], user_id)
-
-    # 2. Experiences
-    db.query(Experience).filter(Experience.user_id == user_id, Experience.state_code == 0).update(
-        {Experience.state_code: 1, Experience.status_code: 2}, synchronize_session=False
-    )
-    for exp_data in extraction.get('experiences', []):
-        create_experience(db, exp_data, user_id)
+async def bulk_replace_cv_data(db: AsyncSession, extraction: dict, user_id: UUID):
+    """Replace all data for a specific user in a single transaction.
 
-    # 3. Educations
-    db.query(Education).filter(Education.user_id == user_id, Education.state_code == 0).update(
-        {Education.state_code: 1, Education.status_code: 2}, synchronize_session=False
-    )
-    for edu_data in extraction.get('educations', []):
-        create_education(db, edu_data, user_id)
-
-    # 4. Skills
-    # Deactivate all skills belonging to any category of this user
-    # Note: We use a subquery to avoid direct join in update() which is not always supported
-    category_ids_subquery = db.query(SkillCategory.id).filter(SkillCategory.user_id == user_id).subquery()
-    db.query(Skill).filter(Skill.category_id.in_(category_ids_subquery)).update(
-        {Skill.state_code: 1}, synchronize_session=False
+    Rows are built in memory with client-generated ids and written with one
+    multi-row INSERT per table, so the number of statements stays the same no
+    matter how many experiences or skills the CV contains.
+    """
+    # created_on keeps the extraction order (experiences are listed by created_on)
+    now = datetime.utcnow()
+    sequence = itertools.count()
+
+    def audit_fields() -> dict:
+        created_on = now + timedelta(microseconds=next(sequence))
+        return {"id": uuid.uuid4(), "created_on": created_on, "modified_on": created_on}
+
+    try:
+        # 1. Profile
+        if extraction.get('profile'):
+            existing = await get_profile(db, user_id)
+            if existing:
+                for key, val in extraction['profile'].items():
+                    if val is not None: setattr(existing, key, val)
+            else:
+                db.add(Profile(**extraction['profile'], user_id=user_id))
+
+        # 2. Deactivate the current rows. Rows already inactive are left alone: modified_on
+        # is when they were deactivated, which compaction measures the retention from.
+        await db.execute(
+            update(Experience).where(Experience.user_id == user_id, Experience.state_code == 0)
+            .values(state_code=1, status_code=2).execution_options(synchronize_session=False)
+        )
+        await db.execute(
+            update(Education).where(Education.user_id == user_id, Education.state_code == 0)
+            .values(state_code=1, status_code=2).execution_options(synchronize_session=False)
+        )
+        # Deactivate all skills belonging to any category of this user
+        # Note: We use a subquery to avoid direct join in update() which is not always supported
+        category_ids_subquery = select(SkillCategory.id).where(SkillCategory.user_id == user_id).scalar_subquery()
+        await db.execute(
+            update(Skill).where(Skill.category_id.in_(category_ids_subquery), Skill.state_code == 0)
+            .values(state_code=1).execution_options(synchronize_session=False)
+        )
+        await db.execute(
+            update(SkillCategory).where(SkillCategory.user_id == user_id, SkillCategory.state_code == 0)
+            .values(state_code=1).execution_options(synchronize_session=False)
+        )
+        await db.execute(
+            update(OtherSkill).where(OtherSkill.user_id == user_id, OtherSkill.state_code == 0)
+            .values(state_code=1).execution_options(synchronize_session=False)
+        )
+
+        # 3. Build the new rows
+        experiences, duties, domains = [], [], []
+        for exp_data in extraction.get('experiences', []):
+            experience = {k: v for k, v in exp_data.items() if k not in ('duties', 'domains')}
+            experience.update(audit_fields(), user_id=user_id)
+            experiences.append(experience)
+            duties += [{**audit_fields(), "description": d, "experience_id": experience["id"]} for d in exp_data.get('duties', [])]
+            domains += [{**audit_fields(), "name": d, "experience_id": experience["id"]} for d in exp_data.get('domains', [])]
+
+        educations = [{**edu_data, **audit_fields(), "user_id": user_id} for edu_data in extraction.get('educations', [])]
+
+        categories, skills = [], []
+        for i, cat in enumerate(extraction.get('skill_categories', [])):
+            category = {**audit_fields(), "name": cat['category_name'], "display_order": i, "user_id": user_id}
+            categories.append(category)
+            skills += [{**audit_fields(), "name": s, "category_id": category["id"]} for s in cat['skills']]
+
+        other_skills = [{**audit_fields(), "name": s_name, "user_id": user_id} for s_name in extraction.get('other_skills', [])]
+
+        # 4. Bulk insert, parents before children
+        for model, rows in (
+            (Experience, experiences), (ExperienceDuty, duties), (ExperienceDomain, domains),
+            (Education, educations), (SkillCategory, categories), (Skill, skills),
+            (OtherSkill, other_skills),
+        ):
+            if rows:
+                await db.execute(insert(model), rows)
+
+        await db.commit()
+    except Exception:
+        await db.rollback()
+        raise
+
+    await response_cache.invalidate_user(user_id)
+    return True
+
+# =====================================================
+# CV Job CRUD
+# =====================================================
+async def create_cv_job(db: AsyncSession, pdf_content: bytes, file_name: str, mode: str, user_id: UUID) -> CVJob:
+    """Persist a queued CV processing job"""
+    db_job = CVJob(pdf_content=pdf_content, file_name=file_name, mode=mode, status="queued", user_id=user_id)
+    db.add(db_job)
+    await db.commit()
+    return db_job
+
+async def get_cv_job(db: AsyncSession, job_id: UUID, user_id: UUID) -> Optional[CVJob]:
+    """Get a CV job if it belongs to a specific user (without the PDF, which status polls never need)"""
+    return await db.scalar(
+        select(CVJob).options(defer(CVJob.pdf_content)).where(CVJob.id == job_id, CVJob.user_id == user_id)
     )
-    
-    # Deactivate all skill categories of this user
-    db.query(SkillCategory).filter(SkillCategory.user_id == user_id).update(
-        {SkillCategory.state_code: 1}, synchronize_session=False
+
+async def create_cv_batch(db: AsyncSession, files: List[Tuple[str, bytes]], mode: str, user_id: UUID) -> List[CVJob]:
+    """Persist one queued job per (file_name, pdf_content) under a shared batch id"""
+    batch_id = uuid.uuid4()
+    now = datetime.utcnow()
+    # Distinct timestamps keep the upload order when the batch is listed
+    db_jobs = [
+        CVJob(
+            pdf_content=content, file_name=file_name, mode=mode, status="queued", user_id=user_id,
+            batch_id=batch_id, created_on=now + timedelta(microseconds=i)
+        )
+        for i, (file_name, content) in enumerate(files)
+    ]
+    db.add_all(db_jobs)
+    await db.commit()
+    return db_jobs
+
+async def get_cv_batch(db: AsyncSession, batch_id: UUID, user_id: UUID) -> List[CVJob]:
+    """Get the jobs of a batch if it belongs to a specific user"""
+    result = await db.scalars(
+        select(CVJob).options(defer(CVJob.pdf_content))
+        .where(CVJob.batch_id == batch_id, CVJob.user_id == user_id).order_by(CVJob.created_on)
     )
-    for i, cat in enumerate(extraction.get('skill_categories', [])):
-        db_cat = create_skill_category(db, {"name": cat['category_name'], "display_order": i}, user_id)
-        for s in cat['skills']:
-            create_skill(db, {"name": s, "category_id": db_cat.id})
+    return result.all()
 
-    # 5. Other Skills
-    db.query(OtherSkill).filter(OtherSkill.user_id == user_id).update({OtherSkill.state_code: 1}, synchronize_session=False)
-    for s_name in extraction.get('other_skills', []):
-        create_other_skill(db, {"name": s_name}, user_id)
+# =====================================================
+# CV Extraction Cache CRUD
+# =====================================================
+async def get_cv_extraction(db: AsyncSession, content_hash: str, extractor_version: str) -> Optional[CVExtraction]:
+    """Get a cached extraction result and record the hit"""
+    db_extraction = await db.get(CVExtraction, (content_hash, extractor_version))
+    if db_extraction:
+        db_extraction.hit_count += 1
+        db_extraction.last_used_on = datetime.utcnow()
+        await db.commit()
+    return db_extraction
 
-    db.commit()
-    return True
+async def save_cv_extraction(db: AsyncSession, content_hash: str, extractor_version: str, result: dict, size_bytes: int) -> CVExtraction:
+    """Store (or overwrite) a cached extraction result"""
+    db_extraction = await db.merge(CVExtraction(
+        content_hash=content_hash, extractor_version=extractor_version,
+        result=result, size_bytes=size_bytes, hit_count=0, last_used_on=datetime.utcnow()
+    ))
+    await db.commit()
+    return db_extraction
+
+async def evict_cv_extractions(db: AsyncSession, unused_since: datetime, max_bytes: int) -> int:
+    """Delete entries unused since a date, and the least recently used ones beyond max_bytes, in one statement"""
+    key = (CVExtraction.content_hash, CVExtraction.extractor_version)
+    # Bytes used by each entry and every more recently used one
+    window = select(*key, func.sum(CVExtraction.size_bytes).over(
+        order_by=(CVExtraction.last_used_on.desc(), *key), rows=(None, 0)
+    ).label("running_bytes")).subquery()
+    over_budget = select(window.c.content_hash, window.c.extractor_version).where(window.c.running_bytes > max_bytes)
+
+    result = await db.execute(
+        delete(CVExtraction)
+        .where(or_(CVExtraction.last_used_on < unused_since, tuple_(*key).in_(over_budget)))
+        .execution_options(synchronize_session=False)
+    )
+    await db.commit()
+    return result.rowcount
 
 # ... Add missing update/delete functions with user_id check ...
-def update_experience(db: Session, experience_id: UUID, experience_data: dict, user_id: UUID) -> Optional[Experience]:
-    db_exp = db.query(Experience).filter(Experience.id == experience_id, Experience.user_id == user_id).first()
+async def update_experience(db: AsyncSession, experience_id: UUID, experience_data: dict, user_id: UUID) -> Optional[Experience]:
+    db_exp = await db.scalar(
+        select(Experience).options(
+            selectinload(Experience.duties), selectinload(Experience.domains)
+        ).where(Experience.id == experience_id, Experience.user_id == user_id)
+    )
     if db_exp:
         for key, val in experience_data.items():
             if key not in ['duties', 'domains']: setattr(db_exp, key, val)
-        
+
+        # Replacing the collections lets the delete-orphan cascade remove the old rows
         if 'duties' in experience_data:
-            db.query(ExperienceDuty).filter(ExperienceDuty.experience_id == experience_id).delete()
-            for d in experience_data['duties']: db.add(ExperienceDuty(description=d, experience_id=experience_id))
-            
+            db_exp.duties = [ExperienceDuty(description=d) for d in experience_data['duties']]
+
         if 'domains' in experience_data:
-            db.query(ExperienceDomain).filter(ExperienceDomain.experience_id == experience_id).delete()
-            for d in experience_data['domains']: db.add(ExperienceDomain(name=d, experience_id=experience_id))
-        
-        db.commit()
-        db.refresh(db_exp)
+            db_exp.domains = [ExperienceDomain(name=d) for d in experience_data['domains']]
+
+        await db.commit()
+        await response_cache.invalidate_user(user_id)
     return db_exp
 
-def delete_experience(db: Session, experience_id: UUID, user_id: UUID) -> bool:
-    db_exp = db.query(Experience).filter(Experience.id == experience_id, Experience.user_id == user_id).first()
+async def delete_experience(db: AsyncSession, experience_id: UUID, user_id: UUID) -> bool:
+    db_exp = await db.scalar(select(Experience).where(Experience.id == experience_id, Experience.user_id == user_id))
     if db_exp:
         db_exp.state_code = 1
-        db.commit()
+        await db.commit()
+        await response_cache.invalidate_user(user_id)
         return True
     return False
 
-def update_education(db: Session, education_id: UUID, education_data: dict, user_id: UUID) -> Optional[Education]:
-    db_edu = db.query(Education).filter(Education.id == education_id, Education.user_id == user_id).first()
+async def update_education(db: AsyncSession, education_id: UUID, education_data: dict, user_id: UUID) -> Optional[Education]:
+    db_edu = await db.scalar(select(Education).where(Education.id == education_id, Education.user_id == user_id))
     if db_edu:
         for key, val in education_data.items(): setattr(db_edu, key, val)
-        db.commit()
-        db.refresh(db_edu)
+        await db.commit()
+        await response_cache.invalidate_user(user_id)
     return db_edu
 
-def delete_education(db: Session, education_id: UUID, user_id: UUID) -> bool:
-    db_edu = db.query(Education).filter(Education.id == education_id, Education.user_id == user_id).first()
+async def delete_education(db: AsyncSession, education_id: UUID, user_id: UUID) -> bool:
+    db_edu = await db.scalar(select(Education).where(Education.id == education_id, Education.user_id == user_id))
     if db_edu:
         db_edu.state_code = 1
-        db.commit()
+        await db.commit()
+        await response_cache.invalidate_user(user_id)
         return True
     return False
 
-def update_other_skill(db: Session, skill_id: UUID, skill_data: dict, user_id: UUID) -> Optional[OtherSkill]:
-    db_skill = db.query(OtherSkill).filter(OtherSkill.id == skill_id, OtherSkill.user_id == user_id).first()
+async def update_other_skill(db: AsyncSession, skill_id: UUID, skill_data: dict, user_id: UUID) -> Optional[OtherSkill]:
+    db_skill = await db.scalar(select(OtherSkill).where(OtherSkill.id == skill_id, OtherSkill.user_id == user_id))
     if db_skill:
         for key, val in skill_data.items(): setattr(db_skill, key, val)
-        db.commit()
-        db.refresh(db_skill)
+        await db.commit()
+        await response_cache.invalidate_user(user_id)
     return db_skill
 
-def delete_other_skill(db: Session, skill_id: UUID, user_id: UUID) -> bool:
-    db_skill = db.query(OtherSkill).filter(OtherSkill.id == skill_id, OtherSkill.user_id == user_id).first()
+async def delete_other_skill(db: AsyncSession, skill_id: UUID, user_id: UUID) -> bool:
+    db_skill = await db.scalar(select(OtherSkill).where(OtherSkill.id == skill_id, OtherSkill.user_id == user_id))
     if db_skill:
         db_skill.state_code = 1
-        db.commit()
+        await db.commit()
+        await response_cache.invalidate_user(user_id)
         return True
     return False
 
-def delete_skill_category(db: Session, category_id: UUID, user_id: UUID) -> bool:
-    db_cat = db.query(SkillCategory).filter(SkillCategory.id == category_id, SkillCategory.user_id == user_id).first()
+async def delete_skill_category(db: AsyncSession, category_id: UUID, user_id: UUID) -> bool:
+    db_cat = await get_skill_category(db, category_id, user_id)
     if db_cat:
         db_cat.state_code = 1
-        db.commit()
+        await db.commit()
+        await response_cache.invalidate_user(user_id)
         return True
     return False
 
-def delete_skill(db: Session, skill_id: UUID, user_id: UUID) -> bool:
+async def delete_skill(db: AsyncSession, skill_id: UUID, user_id: UUID) -> bool:
     # Check if skill belongs to a category owned by user
-    db_skill = db.query(Skill).join(SkillCategory).filter(Skill.id == skill_id, SkillCategory.user_id == user_id).first()
+    db_skill = await db.scalar(select(Skill).join(SkillCategory).where(Skill.id == skill_id, SkillCategory.user_id == user_id))
     if db_skill:
         db_skill.state_code = 1
-        db.commit()
+        await db.commit()
+        await response_cache.invalidate_user(user_id)
         return True
     return False
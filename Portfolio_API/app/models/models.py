@@ -1,6 +1,6 @@
 import uuid
 from datetime import datetime
-from sqlalchemy import Column, String, Text, ForeignKey, Integer, DateTime
+from sqlalchemy import Column, String, Text, ForeignKey, Integer, DateTime, LargeBinary, JSON, Index
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from app.core.database import Base
@@ -31,7 +31,7 @@ class Profile(Base, DataverseMixin):
     __tablename__ = "profiles"
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=True) # Initially nullable for migration
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=True, index=True) # Initially nullable for migration
     name = Column(String(255), nullable=False)
     role = Column(String(255))
     bio = Column(Text)
@@ -49,7 +49,7 @@ class SkillCategory(Base, DataverseMixin):
     __tablename__ = "skill_categories"
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=True)
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=True, index=True)
     name = Column(String(100), nullable=False) # Removed unique=True because multiple users can have a category with same name
     display_order = Column(Integer, default=0)
 
@@ -61,7 +61,7 @@ class Skill(Base, DataverseMixin):
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     name = Column(String(100), nullable=False)
-    category_id = Column(UUID(as_uuid=True), ForeignKey("skill_categories.id"))
+    category_id = Column(UUID(as_uuid=True), ForeignKey("skill_categories.id"), index=True)
     
     category = relationship("SkillCategory", back_populates="skills")
 
@@ -69,7 +69,7 @@ class OtherSkill(Base, DataverseMixin):
     __tablename__ = "other_skills"
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=True)
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=True, index=True)
     name = Column(String(255), nullable=False)
 
     user = relationship("User", back_populates="other_skills")
@@ -78,7 +78,7 @@ class Experience(Base, DataverseMixin):
     __tablename__ = "experiences"
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=True)
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=True, index=True)
     company_name = Column(String(255), nullable=False)
     role = Column(String(255), nullable=False)
     period_display = Column(String(100))
@@ -93,7 +93,7 @@ class ExperienceDuty(Base, DataverseMixin):
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     description = Column(Text, nullable=False)
-    experience_id = Column(UUID(as_uuid=True), ForeignKey("experiences.id"))
+    experience_id = Column(UUID(as_uuid=True), ForeignKey("experiences.id"), index=True)
 
     experience = relationship("Experience", back_populates="duties")
 
@@ -102,7 +102,7 @@ class ExperienceDomain(Base, DataverseMixin):
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     name = Column(String(255), nullable=False)
-    experience_id = Column(UUID(as_uuid=True), ForeignKey("experiences.id"))
+    experience_id = Column(UUID(as_uuid=True), ForeignKey("experiences.id"), index=True)
 
     experience = relationship("Experience", back_populates="domains")
 
@@ -110,10 +110,78 @@ class Education(Base, DataverseMixin):
     __tablename__ = "educations"
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=True)
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=True, index=True)
     school = Column(String(255), nullable=False)
     degree = Column(String(200))
     major = Column(String(200))
     education_year = Column(String(50))
 
     user = relationship("User", back_populates="education")
+
+class CVJob(Base, DataverseMixin):
+    __tablename__ = "cv_jobs"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False, index=True)
+    batch_id = Column(UUID(as_uuid=True), index=True)  # Set for jobs uploaded together through /cv/batches
+    mode = Column(String(20), nullable=False)  # preview | replace
+    status = Column(String(20), nullable=False, default="queued")  # queued | processing | completed | failed
+    file_name = Column(String(255))
+    pdf_content = Column(LargeBinary)  # Kept until the job finishes so it can be resumed after a restart
+    result = Column(JSON)
+    error = Column(Text)
+    started_on = Column(DateTime(timezone=True))
+    finished_on = Column(DateTime(timezone=True))
+
+class CVExtraction(Base, DataverseMixin):
+    """LLM extraction results keyed by the PDF content hash and the extractor version"""
+    __tablename__ = "cv_extractions"
+
+    content_hash = Column(String(64), primary_key=True)  # SHA-256 of the PDF bytes
+    extractor_version = Column(String(64), primary_key=True)  # SHA-256 of model + prompt + schema
+    result = Column(JSON, nullable=False)
+    size_bytes = Column(Integer, nullable=False)
+    hit_count = Column(Integer, default=0, nullable=False)
+    last_used_on = Column(DateTime(timezone=True), default=datetime.utcnow, nullable=False, index=True)
+
+class ArchivedRow(Base):
+    """Soft-deleted portfolio rows moved out of their table by the compaction job"""
+    __tablename__ = "archived_rows"
+
+    table_name = Column(String(64), primary_key=True)
+    id = Column(UUID(as_uuid=True), primary_key=True)
+    user_id = Column(UUID(as_uuid=True), index=True)  # None for child rows (duties, domains, skills)
+    data = Column(JSON, nullable=False)
+    archived_on = Column(DateTime(timezone=True), default=datetime.utcnow, nullable=False)
+
+# =====================================================
+# Query indexes (created by migrations/0003_query_indexes.py)
+# =====================================================
+def _partial_index(name: str, *columns, where) -> Index:
+    return Index(name, *columns, postgresql_where=where, sqlite_where=where)
+
+# Active rows read by the portfolio endpoints, in the order they are returned
+# (the keyset of the paginated lists, migrations/0005_keyset_indexes.py)
+_partial_index("ix_profiles_user_active", Profile.user_id, where=Profile.state_code == 0)
+_partial_index(
+    "ix_skill_categories_user_active_keyset", SkillCategory.user_id, SkillCategory.display_order, SkillCategory.id,
+    where=SkillCategory.state_code == 0,
+)
+_partial_index(
+    "ix_other_skills_user_active_keyset", OtherSkill.user_id, OtherSkill.created_on, OtherSkill.id,
+    where=OtherSkill.state_code == 0,
+)
+_partial_index(
+    "ix_experiences_user_active_keyset", Experience.user_id, Experience.created_on.desc(), Experience.id.desc(),
+    where=Experience.state_code == 0,
+)
+_partial_index(
+    "ix_educations_user_active_keyset", Education.user_id, Education.created_on, Education.id,
+    where=Education.state_code == 0,
+)
+# Jobs the queue picks up again after a restart
+_partial_index("ix_cv_jobs_pending", CVJob.status, CVJob.created_on, where=CVJob.status.in_(["queued", "processing"]))
+
+# Soft-deleted rows waiting for compaction (created by migrations/0004_compaction.py)
+for _model in (Experience, ExperienceDuty, ExperienceDomain, Education, SkillCategory, Skill, OtherSkill):
+    _partial_index(f"ix_{_model.__tablename__}_inactive", _model.modified_on, where=_model.state_code != 0)
@@ -187,6 +187,16 @@ class Profile(ProfileBase):
     created_on: datetime
     modified_on: datetime
 
+# =====================================================
+# Portfolio Schemas
+# =====================================================
+class Portfolio(BaseSchema):
+    profile: Optional[Profile] = None
+    skill_categories: List[SkillCategory] = []
+    other_skills: List[OtherSkill] = []
+    experiences: List[Experience] = []
+    educations: List[Education] = []
+
 # =====================================================
 # CV Extraction Schemas
 # =====================================================
@@ -201,6 +211,29 @@ class CVExtractionResponse(BaseSchema):
     skill_categories: List[SkillCategoryExtraction] = []
     other_skills: List[str] = []
 
+# =====================================================
+# CV Job Schemas
+# =====================================================
+class CVJob(BaseSchema):
+    id: UUID
+    batch_id: Optional[UUID] = None
+    mode: str
+    status: str
+    file_name: Optional[str] = None
+    result: Optional[CVExtractionResponse] = None
+    error: Optional[str] = None
+    created_on: datetime
+    started_on: Optional[datetime] = None
+    finished_on: Optional[datetime] = None
+
+class CVBatch(BaseSchema):
+    id: UUID
+    status: str  # processing | completed
+    total: int
+    completed: int
+    failed: int
+    jobs: List[CVJob] = []
+
 # =====================================================
 # Response Schemas
 # =====================================================
@@ -1,32 +1,60 @@
 import os
-from google.oauth2 import id_token
-from google.auth.transport import requests
-from sqlalchemy.orm import Session
+from typing import Optional
+import httpx
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.models.models import User
 from app.core import security
+from app.core.cache import TTLCache
+from app.core.config import settings
 
 GOOGLE_CLIENT_ID = os.getenv("GOOGLE_CLIENT_ID")
 
-import requests as py_requests
+# Shared client so logins reuse keep-alive connections to Google
+_http_client: Optional[httpx.AsyncClient] = None
+
+# Access token -> userinfo, so a burst of logins with the same token costs one Google call
+google_token_cache = TTLCache(maxsize=settings.GOOGLE_TOKEN_CACHE_MAX_SIZE, ttl=settings.GOOGLE_TOKEN_CACHE_TTL)
+
+def get_http_client() -> httpx.AsyncClient:
+    global _http_client
+    if _http_client is None or _http_client.is_closed:
+        _http_client = httpx.AsyncClient(
+            timeout=httpx.Timeout(settings.GOOGLE_HTTP_TIMEOUT, connect=settings.GOOGLE_HTTP_CONNECT_TIMEOUT),
+            limits=httpx.Limits(max_connections=settings.GOOGLE_HTTP_MAX_CONNECTIONS),
+        )
+    return _http_client
+
+async def close_http_client():
+    global _http_client
+    if _http_client is not None:
+        await _http_client.aclose()
+        _http_client = None
+
+async def verify_google_token(token: str):
+    cached = google_token_cache.get(token)
+    if cached is not None:
+        return cached
 
-def verify_google_token(token: str):
     try:
         # If it's an access_token (from useGoogleLogin), we fetch user info from Google's API
-        response = py_requests.get(
-            "https://www.googleapis.com/oauth2/v3/userinfo",
+        response = await get_http_client().get(
+            settings.GOOGLE_USERINFO_URL,
             headers={"Authorization": f"Bearer {token}"}
         )
-        
+
         if response.status_code != 200:
             return None
-            
-        return response.json()
+
+        google_info = response.json()
+        google_token_cache.set(token, google_info)
+        return google_info
     except Exception as e:
         print(f"Token verification error: {e}")
         return None
 
-def authenticate_google_user(db: Session, token: str):
-    google_info = verify_google_token(token)
+async def authenticate_google_user(db: AsyncSession, token: str):
+    google_info = await verify_google_token(token)
     if not google_info:
         return None
     
@@ -36,7 +64,7 @@ def authenticate_google_user(db: Session, token: str):
     picture = google_info.get("picture")
     
     # Check if user exists
-    user = db.query(User).filter(User.google_id == google_id).first()
+    user = await db.scalar(select(User).where(User.google_id == google_id))
     
     if not user:
         # Create user if doesn't exist
@@ -47,8 +75,7 @@ def authenticate_google_user(db: Session, token: str):
             picture_url=picture
         )
         db.add(user)
-        db.commit()
-        db.refresh(user)
+        await db.commit()
         
     # Generate access token
     access_token = security.create_access_token(user.id)
@@ -0,0 +1,211 @@
+"""
+Compaction of soft-deleted portfolio rows.
+
+A CV replace marks all the previous experiences, educations, skill categories,
+skills and other skills of the user inactive (state_code = 1) and inserts new
+rows, so inactive rows pile up in every table the portfolio reads. Rows that
+have been inactive for longer than COMPACTION_RETENTION_DAYS are deleted (and
+copied to archived_rows first when COMPACTION_ARCHIVE is set) in batches of
+COMPACTION_BATCH_SIZE, each in its own short transaction. The duties, domains
+and skills of a removed experience or category go with it, whatever their own
+state.
+
+Batches only touch rows nobody reads anymore and delete them by primary key,
+so overlapping runs are harmless; still, enable COMPACTION_INTERVAL on a single
+worker, or run `python compact_db.py` from a scheduler.
+"""
+import asyncio
+import json
+import time
+from datetime import datetime, timedelta
+from typing import Dict, Optional
+from sqlalchemy import delete, func, insert, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.models.models import (
+    ArchivedRow, Education, Experience, ExperienceDomain, ExperienceDuty, OtherSkill, Skill, SkillCategory,
+)
+
+# Parents first: their children are removed with them, then the remaining inactive children on their own
+TARGETS = [
+    (Experience, ((ExperienceDuty, ExperienceDuty.experience_id), (ExperienceDomain, ExperienceDomain.experience_id))),
+    (SkillCategory, ((Skill, Skill.category_id),)),
+    (Education, ()),
+    (OtherSkill, ()),
+    (ExperienceDuty, ()),
+    (ExperienceDomain, ()),
+    (Skill, ()),
+]
+COMPACTED_TABLES = [model.__tablename__ for model, _ in TARGETS]
+
+def _jsonable(row) -> dict:
+    return json.loads(json.dumps(dict(row._mapping), default=str))
+
+class CompactionService:
+    """Runs compaction passes and keeps the metrics reported by /health/compaction"""
+
+    def __init__(self):
+        self._task: Optional[asyncio.Task] = None
+        self.runs = 0
+        self.failed_runs = 0
+        self.batches = 0
+        self.rows_reclaimed: Dict[str, int] = {table: 0 for table in COMPACTED_TABLES}
+        self.rows_archived = 0
+        self.last_run_on: Optional[datetime] = None
+        self.last_run_seconds = 0.0
+        self.last_run_rows = 0
+        self.last_tables: Optional[Dict[str, dict]] = None  # table_stats() at the end of the last run
+
+    async def _remove(self, db: AsyncSession, model, condition, archive: bool) -> int:
+        if archive:
+            rows = (await db.execute(select(model.__table__).where(condition))).all()
+            if rows:
+                await db.execute(insert(ArchivedRow), [
+                    {
+                        "table_name": model.__tablename__,
+                        "id": row.id,
+                        "user_id": getattr(row, "user_id", None),
+                        "data": _jsonable(row),
+                    }
+                    for row in rows
+                ])
+                self.rows_archived += len(rows)
+        result = await db.execute(delete(model).where(condition).execution_options(synchronize_session=False))
+        return result.rowcount
+
+    async def _compact_batch(self, model, children, cutoff: datetime, batch_size: int, archive: bool) -> Dict[str, int]:
+        """Remove up to `batch_size` inactive rows of `model` and their children, in one transaction"""
+        async with AsyncSessionLocal() as db:
+            ids = list(await db.scalars(
+                select(model.id).where(model.state_code != 0, model.modified_on < cutoff).limit(batch_size)
+            ))
+            if not ids:
+                return {}
+            removed = {}
+            for child, foreign_key in children:
+                removed[child.__tablename__] = await self._remove(db, child, foreign_key.in_(ids), archive)
+            removed[model.__tablename__] = await self._remove(db, model, model.id.in_(ids), archive)
+            await db.commit()
+        return removed
+
+    async def run(
+        self,
+        retention_days: Optional[int] = None,
+        batch_size: Optional[int] = None,
+        archive: Optional[bool] = None,
+        max_batches: Optional[int] = None,
+    ) -> Dict[str, int]:
+        """One compaction pass; returns the rows removed per table"""
+        retention_days = settings.COMPACTION_RETENTION_DAYS if retention_days is None else retention_days
+        batch_size = batch_size or settings.COMPACTION_BATCH_SIZE
+        archive = settings.COMPACTION_ARCHIVE if archive is None else archive
+        cutoff = datetime.utcnow() - timedelta(days=retention_days)
+
+        start = time.perf_counter()
+        removed = {table: 0 for table in COMPACTED_TABLES}
+        batches = 0
+        try:
+            for model, children in TARGETS:
+                while max_batches is None or batches < max_batches:
+                    batch = await self._compact_batch(model, children, cutoff, batch_size, archive)
+                    if not batch:
+                        break
+                    batches += 1
+                    for table, count in batch.items():
+                        removed[table] += count
+                        self.rows_reclaimed[table] += count
+                    await asyncio.sleep(settings.COMPACTION_BATCH_PAUSE)
+            # Counted once per run, so /health/compaction never queries the tables itself
+            self.last_tables = await self.table_stats(retention_days)
+        except Exception:
+            self.failed_runs += 1
+            raise
+        finally:
+            self.runs += 1
+            self.batches += batches
+            self.last_run_on = datetime.utcnow()
+            self.last_run_seconds = time.perf_counter() - start
+            self.last_run_rows = sum(removed.values())
+        return removed
+
+    # =====================================================
+    # Bloat metrics
+    # =====================================================
+    async def table_stats(self, retention_days: Optional[int] = None) -> Dict[str, dict]:
+        """Inactive and reclaimable rows per table; dead tuples and size on PostgreSQL"""
+        retention_days = settings.COMPACTION_RETENTION_DAYS if retention_days is None else retention_days
+        cutoff = datetime.utcnow() - timedelta(days=retention_days)
+        tables = {}
+        async with AsyncSessionLocal() as db:
+            for model, _ in TARGETS:
+                inactive, reclaimable = (await db.execute(
+                    select(func.count(), func.count().filter(model.modified_on < cutoff)).where(model.state_code != 0)
+                )).one()
+                tables[model.__tablename__] = {"inactive_rows": inactive, "reclaimable_rows": reclaimable}
+
+            if db.bind.dialect.name == "postgresql":
+                # Deleted rows stay as dead tuples until (auto)vacuum; live/dead counts are estimates
+                rows = await db.execute(text(
+                    "SELECT relname, n_live_tup, n_dead_tup, pg_total_relation_size(relid) AS total_bytes, "
+                    "last_autovacuum, last_vacuum FROM pg_stat_user_tables WHERE relname = ANY(:tables)"
+                ), {"tables": COMPACTED_TABLES})
+                for row in rows:
+                    tables[row.relname].update(
+                        live_tuples=row.n_live_tup,
+                        dead_tuples=row.n_dead_tup,
+                        dead_ratio=round(row.n_dead_tup / (row.n_live_tup + row.n_dead_tup), 3)
+                        if row.n_live_tup + row.n_dead_tup else 0.0,
+                        total_bytes=row.total_bytes,
+                        last_vacuum=row.last_vacuum or row.last_autovacuum,
+                    )
+        return tables
+
+    async def vacuum(self):
+        """VACUUM (ANALYZE) the compacted tables on PostgreSQL, so the space of deleted rows is reused"""
+        async with AsyncSessionLocal() as db:
+            connection = await db.connection(execution_options={"isolation_level": "AUTOCOMMIT"})
+            if connection.dialect.name != "postgresql":
+                return
+            for table in COMPACTED_TABLES:
+                await connection.exec_driver_sql(f"VACUUM (ANALYZE) {table}")
+
+    # =====================================================
+    # In-process schedule
+    # =====================================================
+    async def _loop(self, interval: int):
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                removed = await self.run()
+                print(f"Compaction reclaimed {sum(removed.values())} rows: {removed}")
+            except Exception as e:
+                print(f"Compaction failed: {e}")
+
+    def start(self):
+        if settings.COMPACTION_INTERVAL > 0 and self._task is None:
+            self._task = asyncio.create_task(self._loop(settings.COMPACTION_INTERVAL))
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    def stats(self) -> dict:
+        return {
+            "interval_seconds": settings.COMPACTION_INTERVAL,
+            "retention_days": settings.COMPACTION_RETENTION_DAYS,
+            "archive": settings.COMPACTION_ARCHIVE,
+            "runs": self.runs,
+            "failed_runs": self.failed_runs,
+            "batches": self.batches,
+            "rows_reclaimed": self.rows_reclaimed,
+            "rows_archived": self.rows_archived,
+            "last_run_on": self.last_run_on,
+            "last_run_seconds": self.last_run_seconds,
+            "last_run_rows": self.last_run_rows,
+            "tables": self.last_tables,
+        }
+
+compaction_service = CompactionService()
@@ -0,0 +1,114 @@
+import asyncio
+import hashlib
+import json
+from contextlib import aclosing, asynccontextmanager
+from datetime import datetime, timedelta
+from typing import Any, AsyncIterator, Dict, Optional, Tuple
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.crud import crud
+from app.schemas.schemas import CVExtractionResponse
+from app.services.llm_service import get_llm_service, stream_from_task
+from app.services.pdf_service import PDFSource
+
+class CVExtractionCache:
+    """Reuses LLM extraction results for identical PDFs.
+
+    Results are stored in the cv_extractions table under the SHA-256 of the PDF
+    bytes and the extractor version, so a preview followed by a replace of the
+    same file (or a retry) costs a single LLM call, even across restarts.
+    """
+
+    def __init__(self, enabled: bool):
+        self.enabled = enabled
+        self._locks: Dict[str, asyncio.Lock] = {}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @asynccontextmanager
+    async def _single_flight(self, content_hash: str):
+        # Concurrent uploads of the same file wait for the first extraction instead of repeating it
+        lock = self._locks.setdefault(content_hash, asyncio.Lock())
+        try:
+            async with lock:
+                yield
+        finally:
+            if not lock.locked() and self._locks.get(content_hash) is lock:
+                del self._locks[content_hash]
+
+    # Each lookup/store uses its own short session: no connection is held during the LLM call,
+    # and cache writes stay out of the caller's transaction
+    async def _lookup(self, content_hash: str) -> Optional[CVExtractionResponse]:
+        async with AsyncSessionLocal() as db:
+            cached = await crud.get_cv_extraction(db, content_hash, get_llm_service().version)
+        if cached:
+            self.hits += 1
+            return CVExtractionResponse.model_validate(cached.result)
+        self.misses += 1
+        return None
+
+    async def _store(self, content_hash: str, extracted_data: CVExtractionResponse):
+        result = extracted_data.model_dump(mode="json")
+        async with AsyncSessionLocal() as db:
+            size_bytes = len(json.dumps(result, ensure_ascii=False).encode())
+            await crud.save_cv_extraction(db, content_hash, get_llm_service().version, result, size_bytes)
+            self.evictions += await crud.evict_cv_extractions(
+                db,
+                unused_since=datetime.utcnow() - timedelta(seconds=settings.CV_EXTRACTION_CACHE_TTL),
+                max_bytes=settings.CV_EXTRACTION_CACHE_MAX_BYTES,
+            )
+
+    async def parse_cv(self, pdf_content: PDFSource, content_hash: Optional[str] = None) -> CVExtractionResponse:
+        """`content_hash` (the SHA-256 of the PDF) is required when passing the path of a spooled upload"""
+        if not self.enabled:
+            return await get_llm_service().parse_cv(pdf_content)
+
+        content_hash = content_hash or hashlib.sha256(pdf_content).hexdigest()
+        async with self._single_flight(content_hash):
+            cached = await self._lookup(content_hash)
+            if cached:
+                return cached
+            extracted_data = await get_llm_service().parse_cv(pdf_content)
+            await self._store(content_hash, extracted_data)
+            return extracted_data
+
+    async def stream_cv(self, pdf_content: PDFSource, content_hash: Optional[str] = None) -> AsyncIterator[Tuple[str, Any]]:
+        """Same events as llm_service.stream_cv; a cache hit yields every section at once"""
+        if not self.enabled:
+            async with aclosing(get_llm_service().stream_cv(pdf_content)) as events:
+                async for event in events:
+                    yield event
+            return
+
+        content_hash = content_hash or hashlib.sha256(pdf_content).hexdigest()
+
+        # The single-flight lock is held by a producer task, not across the yields to the client
+        async def produce(emit):
+            async with self._single_flight(content_hash):
+                cached = await self._lookup(content_hash)
+                if cached:
+                    emit("progress", {"stage": "cache_hit"})
+                    for name, data in cached.model_dump(mode="json").items():
+                        emit("section", {"name": name, "data": data})
+                    emit("result", cached)
+                    return
+
+                async for event, data in get_llm_service().stream_cv(pdf_content):
+                    if event == "result":
+                        await self._store(content_hash, data)
+                    emit(event, data)
+
+        async with aclosing(stream_from_task(produce)) as events:
+            async for event in events:
+                yield event
+
+    def stats(self) -> dict:
+        return {
+            "enabled": self.enabled,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+cv_extraction_cache = CVExtractionCache(enabled=settings.CV_EXTRACTION_CACHE_ENABLED)
@@ -0,0 +1,213 @@
+import asyncio
+import time
+from datetime import datetime, timedelta
+from typing import List
+from uuid import UUID
+from sqlalchemy import select, update
+from app.core.config import settings
+from app.core.metrics import observe_stage
+from app.core.database import AsyncSessionLocal
+from app.crud import crud
+from app.models.models import CVJob
+from app.services.cv_extraction_service import cv_extraction_cache
+
+class CVJobQueue:
+    """Bounded pool of asyncio workers processing persisted CV jobs.
+
+    Jobs live in the cv_jobs table; the in-memory queue only holds the ids of
+    the next ones. Jobs a worker was processing when the process stops are put
+    back to "queued" by stop(), jobs left "processing" by a process that died
+    are requeued by a periodic sweep, and idle workers refill the queue from
+    the table, so queued rows beyond the queue capacity are not left behind.
+    """
+
+    def __init__(self, workers: int, max_queue_size: int):
+        self.workers = workers
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=max_queue_size)
+        self._tasks: List[asyncio.Task] = []
+        self._enqueued_at = {}  # ids waiting in the in-memory queue
+        self._claimed = set()  # ids being processed by this process
+        self._refill_lock = asyncio.Lock()
+        self.in_progress = 0
+        self.started = 0
+        self.completed = 0
+        self.failed = 0
+        self.requeued = 0
+        self.total_wait_seconds = 0.0
+        self.total_processing_seconds = 0.0
+        self.max_processing_seconds = 0.0
+
+    async def start(self):
+        await self._requeue_stale()
+        await self._refill()
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+        self._tasks.append(asyncio.create_task(self._sweep()))
+
+    async def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        if self._claimed:
+            # Interrupted jobs start over on the next process instead of waiting to become stale
+            async with AsyncSessionLocal() as db:
+                await db.execute(
+                    update(CVJob).where(CVJob.id.in_(self._claimed), CVJob.status == "processing")
+                    .values(status="queued", started_on=None)
+                )
+                await db.commit()
+            self.requeued += len(self._claimed)
+            self._claimed.clear()
+
+    def is_full(self) -> bool:
+        return self.queue.full()
+
+    def has_room(self, count: int) -> bool:
+        return self.queue.maxsize - self.queue.qsize() >= count
+
+    def enqueue(self, job_id: UUID):
+        """Raises asyncio.QueueFull; the job then stays queued in cv_jobs until a refill picks it up"""
+        self.queue.put_nowait(job_id)
+        self._enqueued_at[job_id] = time.perf_counter()
+
+    async def _requeue_stale(self):
+        # Jobs left "processing" by a process that died are queued again
+        stale_before = datetime.utcnow() - timedelta(seconds=settings.CV_JOB_STALE_AFTER)
+        async with AsyncSessionLocal() as db:
+            result = await db.execute(
+                update(CVJob).where(CVJob.status == "processing", CVJob.started_on < stale_before)
+                .values(status="queued", started_on=None)
+            )
+            await db.commit()
+        self.requeued += result.rowcount
+
+    async def _refill(self):
+        """Queue the oldest "queued" jobs of the table that are not in memory yet, up to the free capacity"""
+        async with self._refill_lock:
+            room = self.queue.maxsize - self.queue.qsize()
+            if room <= 0:
+                return
+            query = select(CVJob.id).where(CVJob.status == "queued")
+            known = set(self._enqueued_at) | self._claimed
+            if known:
+                query = query.where(CVJob.id.not_in(known))
+            async with AsyncSessionLocal() as db:
+                pending = (await db.scalars(query.order_by(CVJob.created_on).limit(room))).all()
+            for job_id in pending:
+                try:
+                    self.enqueue(job_id)
+                except asyncio.QueueFull:
+                    break
+
+    async def _sweep(self):
+        while True:
+            await asyncio.sleep(settings.CV_JOB_SWEEP_INTERVAL)
+            try:
+                await self._requeue_stale()
+                await self._refill()
+            except Exception as e:
+                print(f"CV job sweep failed: {e}")
+
+    async def _worker(self):
+        while True:
+            if self.queue.empty():
+                try:
+                    await self._refill()
+                except Exception as e:
+                    print(f"CV job refill failed: {e}")
+            job_id = await self.queue.get()
+            wait = time.perf_counter() - self._enqueued_at.pop(job_id, time.perf_counter())
+            self.total_wait_seconds += wait
+            observe_stage("cv_job_queue", wait)
+            self.started += 1
+            self.in_progress += 1
+            start = time.perf_counter()
+            try:
+                await self._process(job_id)
+            except Exception as e:
+                print(f"CV job {job_id} crashed: {e}")
+            finally:
+                elapsed = time.perf_counter() - start
+                self.in_progress -= 1
+                self.total_processing_seconds += elapsed
+                self.max_processing_seconds = max(self.max_processing_seconds, elapsed)
+                observe_stage("cv_job", elapsed)
+                self.queue.task_done()
+
+    async def _process(self, job_id: UUID):
+        async with AsyncSessionLocal() as db:
+            # Claim the job atomically; another process may have picked it up already
+            claimed = await db.execute(
+                update(CVJob).where(CVJob.id == job_id, CVJob.status == "queued")
+                .values(status="processing", started_on=datetime.utcnow())
+            )
+            await db.commit()
+            if claimed.rowcount != 1:
+                return
+
+            self._claimed.add(job_id)
+            cancelled = False
+            try:
+                await self._run(db, job_id)
+            except asyncio.CancelledError:
+                cancelled = True
+                raise
+            except Exception as e:
+                # _run records extraction errors itself; this is its own commit or connection failing
+                await self._mark_failed(job_id, e)
+                raise
+            finally:
+                # Still claimed if the worker is cancelled, so stop() can put the job back
+                if not cancelled:
+                    self._claimed.discard(job_id)
+
+    async def _mark_failed(self, job_id: UUID, error: Exception):
+        try:
+            async with AsyncSessionLocal() as db:
+                await db.execute(
+                    update(CVJob).where(CVJob.id == job_id, CVJob.status == "processing")
+                    .values(status="failed", error=str(error), pdf_content=None, finished_on=datetime.utcnow())
+                )
+                await db.commit()
+            self.failed += 1
+        except Exception as e:
+            # Left "processing"; the sweep requeues it once it is stale
+            print(f"CV job {job_id} could not be marked failed: {e}")
+
+    async def _run(self, db, job_id: UUID):
+        job = await db.get(CVJob, job_id)
+        try:
+            extracted_data = await cv_extraction_cache.parse_cv(job.pdf_content)
+            if job.mode == "replace":
+                await crud.bulk_replace_cv_data(db, extracted_data.model_dump(), job.user_id)
+            job.result = extracted_data.model_dump(mode="json")
+            job.status = "completed"
+        except Exception as e:
+            await db.rollback()
+            job = await db.get(CVJob, job_id)
+            job.error = str(e)
+            job.status = "failed"
+        job.pdf_content = None
+        job.finished_on = datetime.utcnow()
+        status = job.status
+        await db.commit()
+        if status == "completed":
+            self.completed += 1
+        else:
+            self.failed += 1
+
+    def stats(self) -> dict:
+        finished = self.completed + self.failed
+        return {
+            "workers": self.workers,
+            "queue_depth": self.queue.qsize(),
+            "in_progress": self.in_progress,
+            "completed": self.completed,
+            "failed": self.failed,
+            "requeued": self.requeued,
+            "avg_wait_seconds": self.total_wait_seconds / self.started if self.started else 0.0,
+            "avg_processing_seconds": self.total_processing_seconds / finished if finished else 0.0,
+            "max_processing_seconds": self.max_processing_seconds,
+        }
+
+cv_job_queue = CVJobQueue(workers=settings.CV_JOB_WORKERS, max_queue_size=settings.CV_JOB_QUEUE_SIZE)
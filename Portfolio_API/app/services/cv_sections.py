@@ -0,0 +1,87 @@
+import re
+import unicodedata
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+# Headings recognised for each part of CVExtractionResponse (compared after normalize_heading)
+SECTION_HEADINGS: Dict[str, List[str]] = {
+    "experiences": [
+        "experience", "experiences", "work experience", "professional experience", "employment",
+        "employment history", "work history", "career history", "kinh nghiem", "kinh nghiem lam viec",
+    ],
+    "educations": [
+        "education", "academic background", "education and training", "qualifications",
+        "hoc van", "trinh do hoc van",
+    ],
+    "skills": [
+        "skills", "technical skills", "skills and abilities", "core competencies", "competencies",
+        "technologies", "tech stack", "ky nang",
+    ],
+}
+
+# Headings of sections that are not split out; their text goes back to the general part
+OTHER_HEADINGS = {
+    "summary", "profile", "about", "about me", "objective", "career objective", "contact",
+    "personal information", "projects", "personal projects", "certifications", "certificates",
+    "awards", "achievements", "languages", "interests", "hobbies", "activities", "publications",
+    "references", "volunteering", "top skills", "muc tieu", "gioi thieu", "du an", "chung chi", "thong tin ca nhan",
+}
+
+# CVExtractionResponse fields each section is extracted into
+SECTION_FIELDS: Dict[str, Tuple[str, ...]] = {
+    "experiences": ("experiences",),
+    "educations": ("educations",),
+    "skills": ("skill_categories", "other_skills"),
+}
+
+_HEADING_LOOKUP = {heading: name for name, headings in SECTION_HEADINGS.items() for heading in headings}
+_NON_LETTERS = re.compile(r"[^a-z ]+")
+
+@dataclass
+class CVSection:
+    name: str
+    fields: Tuple[str, ...]
+    text: str
+
+def normalize_heading(line: str) -> str:
+    """Lower-case, accent-free, punctuation-free form of a line"""
+    ascii_line = unicodedata.normalize("NFKD", line.replace("đ", "d").replace("Đ", "D"))
+    ascii_line = ascii_line.encode("ascii", "ignore").decode().lower().replace("&", " and ")
+    return " ".join(_NON_LETTERS.sub(" ", ascii_line).split())
+
+def is_heading(line: str) -> bool:
+    heading = normalize_heading(line)
+    return heading in _HEADING_LOOKUP or heading in OTHER_HEADINGS
+
+def split_cv_sections(text: str, min_chars: int) -> Optional[List[CVSection]]:
+    """Split CV text into the sections that can be extracted independently.
+
+    Returns None when the document is short or its layout is not recognised,
+    in which case it should be extracted in one pass. Otherwise the last
+    section, "general", holds the header and unrecognised sections and is
+    extracted into the profile plus any field whose section was not found.
+    """
+    if len(text) < min_chars:
+        return None
+
+    parts: Dict[str, List[str]] = {"general": []}
+    current = "general"
+    for line in text.split("\n"):
+        heading = normalize_heading(line) if len(line) <= 40 else ""
+        if heading in _HEADING_LOOKUP:
+            current = _HEADING_LOOKUP[heading]
+            parts.setdefault(current, [])
+            continue
+        if heading in OTHER_HEADINGS:
+            current = "general"
+        parts[current].append(line)
+
+    found = [name for name in SECTION_FIELDS if "\n".join(parts.get(name, [])).strip()]
+    if "experiences" not in found or len(found) < 2:
+        return None
+
+    sections = [CVSection(name, SECTION_FIELDS[name], "\n".join(parts[name]).strip()) for name in found]
+    missing = tuple(field for name in SECTION_FIELDS if name not in found for field in SECTION_FIELDS[name])
+    general_text = "\n".join(parts["general"]).strip() or text[:2000]
+    sections.append(CVSection("general", ("profile",) + missing, general_text))
+    return sections
@@ -1,53 +1,392 @@
 import os
-from typing import List, Optional
-from pydantic import BaseModel
-from langchain_google_genai import ChatGoogleGenerativeAI
-from langchain_core.prompts import ChatPromptTemplate
-from langchain_core.output_parsers import PydanticOutputParser
-from app.schemas.schemas import CVExtractionResponse, ProfileCreate, ExperienceCreate, EducationCreate
-import pypdf
-import io
-import base64
+import asyncio
+import hashlib
+import json
+import random
+import time
+from contextlib import aclosing, asynccontextmanager
+from typing import Any, AsyncIterator, Awaitable, Callable, List, Optional, Tuple
+from pydantic import TypeAdapter, create_model
+from app.core.config import settings
+from app.core.metrics import observe_stage
+from app.schemas.schemas import CVExtractionResponse
+from app.services.pdf_service import pdf_extractor, PDFSource, TEXT_FORMAT_VERSION
+from app.services import rule_parser
+from app.services.cv_sections import CVSection, split_cv_sections
+from app.services.stream_parser import JSONSectionStream
 from dotenv import load_dotenv
 load_dotenv()
 
+MODEL_NAME = "gemini-2.5-flash"
+CV_PROMPT_TEMPLATE = (
+    "Extract professional information from the following CV text.\n"
+    "{format_instructions}\n"
+    "CV Text:\n{cv_text}"
+)
+# Used for each part of a long CV when it is extracted section by section
+CV_SECTION_PROMPT_TEMPLATE = (
+    "Extract the {section} from the following part of a CV.\n"
+    "{format_instructions}\n"
+    "CV Section:\n{cv_text}"
+)
+
+RATE_LIMIT_ERRORS = ("ResourceExhausted", "TooManyRequests")  # google-api-core names for HTTP 429
+
+def is_rate_limit_error(error: BaseException) -> bool:
+    """HTTP 429 from the Gemini clients, also when langchain wraps it in its own error.
+
+    Only exception types and status attributes are looked at: messages can echo
+    model output (a phone number, a year) and must not make an error retryable.
+    """
+    seen = set()
+    while error is not None and id(error) not in seen:
+        seen.add(id(error))
+        if type(error).__name__ in RATE_LIMIT_ERRORS:
+            return True
+        # google-genai APIError has code/status, httpx errors carry the response
+        if getattr(error, "code", None) == 429 or getattr(error, "status_code", None) == 429:
+            return True
+        if getattr(error, "status", None) in (429, "RESOURCE_EXHAUSTED"):
+            return True
+        if getattr(getattr(error, "response", None), "status_code", None) == 429:
+            return True
+        error = error.__cause__ or error.__context__
+    return False
+
+class LLMQueueTimeoutError(Exception):
+    pass
+
+# Validators for the top-level sections of CVExtractionResponse, used on partial output
+SECTION_ADAPTERS = {
+    name: TypeAdapter(field.annotation) for name, field in CVExtractionResponse.model_fields.items()
+}
+
+def _section_data(name: str, value) -> Optional[Any]:
+    """Validated JSON form of one CVExtractionResponse section, or None if it is not valid"""
+    adapter = SECTION_ADAPTERS.get(name)
+    if adapter is None:
+        return None
+    try:
+        return adapter.dump_python(adapter.validate_python(value), mode="json")
+    except ValueError:
+        return None
+
+def _chunk_text(chunk) -> str:
+    # Gemini may return the content of a chunk as a list of parts
+    content = chunk.content
+    if isinstance(content, list):
+        return "".join(part if isinstance(part, str) else part.get("text", "") for part in content)
+    return content
+
+_END = object()
+
+async def stream_from_task(produce: Callable[[Callable[[str, Any], None]], Awaitable[None]]) -> AsyncIterator[Tuple[str, Any]]:
+    """Run `produce(emit)` in its own task and yield the (event, data) pairs it emits.
+
+    The producer never waits for the consumer (the queue is unbounded), so the
+    locks, LLM slots and timeouts it holds are not stretched by a slow client,
+    and its errors are raised here as they are. Closing the iterator cancels it.
+    """
+    queue: asyncio.Queue = asyncio.Queue()
+
+    async def run():
+        try:
+            await produce(lambda event, data: queue.put_nowait((event, data)))
+            queue.put_nowait((_END, None))
+        except Exception as e:
+            queue.put_nowait((_END, e))
+
+    task = asyncio.create_task(run())
+    try:
+        while True:
+            event, data = await queue.get()
+            if event is _END:
+                if data is not None:
+                    raise data
+                return
+            yield event, data
+    finally:
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+
 class LLMService:
     def __init__(self):
         self.api_key = os.getenv("GOOGLE_API_KEY")
         if not self.api_key:
             raise ValueError("Cần cấu hình GOOGLE_API_KEY trong file .env")
-        
+
+        # Imported here: langchain is slow to import and only needed once a CV is processed
+        from langchain_google_genai import ChatGoogleGenerativeAI
+        from langchain_core.prompts import ChatPromptTemplate
+        from langchain_core.output_parsers import PydanticOutputParser
+
         self.llm = ChatGoogleGenerativeAI(
-            model="gemini-2.5-flash", # Đổi lại model chính xác (thường là 1.5-flash hoặc 2.0-flash-exp)
+            model=MODEL_NAME, # Đổi lại model chính xác (thường là 1.5-flash hoặc 2.0-flash-exp)
             google_api_key=self.api_key,
-            temperature=0
+            temperature=0,
+            max_retries=0  # retries are handled below, with the concurrency slot accounted for
         )
 
-    def extract_text_from_pdf(self, pdf_stream: io.BytesIO) -> str:
-        pdf_reader = pypdf.PdfReader(pdf_stream)
-        text = ""
-        for page in pdf_reader.pages:
-            text += page.extract_text() + "\n"
-        return text
-
-    async def parse_cv(self, pdf_content: bytes) -> CVExtractionResponse:
-        text = self.extract_text_from_pdf(io.BytesIO(pdf_content))
-        
-        parser = PydanticOutputParser(pydantic_object=CVExtractionResponse)
-        
-        prompt = ChatPromptTemplate.from_template(
-            "Extract professional information from the following CV text.\n"
-            "{format_instructions}\n"
-            "CV Text:\n{cv_text}"
+        # Built once: the parser, its format instructions and the composed chain never change
+        self.parser = PydanticOutputParser(pydantic_object=CVExtractionResponse)
+        self.prompt = ChatPromptTemplate.from_template(CV_PROMPT_TEMPLATE).partial(
+            format_instructions=self.parser.get_format_instructions()
         )
-        
-        chain = prompt | self.llm | parser
-        
-        result = await chain.ainvoke({
-            "cv_text": text,
-            "format_instructions": parser.get_format_instructions()
-        })
-        
-        return result
-
-llm_service = LLMService()
+        self.chain = self.prompt | self.llm | self.parser
+        self.stream_chain = self.prompt | self.llm  # raw tokens, parsed incrementally by stream_cv
+        self.section_chains = {}  # fields -> chain, see _section_chain
+        # Identifies everything that shapes the extraction output; cached results
+        # produced by another model, prompt, schema or PDF text format are never reused
+        self.version = hashlib.sha256(json.dumps(
+            [MODEL_NAME, CV_PROMPT_TEMPLATE, CVExtractionResponse.model_json_schema(),
+             TEXT_FORMAT_VERSION, pdf_extractor.max_pages, CV_SECTION_PROMPT_TEMPLATE,
+             settings.LLM_SECTION_SPLIT_ENABLED and settings.LLM_SECTION_SPLIT_MIN_CHARS,
+             settings.CV_RULES_ENABLED and [rule_parser.RULES_VERSION, settings.CV_RULES_MIN_CONFIDENCE]], sort_keys=True
+        ).encode()).hexdigest()
+
+        # Caps concurrent Gemini requests per process; callers beyond it wait in line
+        self.semaphore = asyncio.Semaphore(settings.LLM_MAX_CONCURRENCY)
+        self.waiting = 0
+        self.in_flight = 0
+        self.acquired = 0
+        self.calls = 0
+        self.failed = 0
+        self.retries = 0
+        self.queue_timeouts = 0
+        self.request_timeouts = 0
+        self.total_queue_wait_seconds = 0.0
+        self.max_queue_wait_seconds = 0.0
+        self.total_model_seconds = 0.0
+        self.max_model_seconds = 0.0
+        self.rule_sections = 0
+        self.rule_only_documents = 0
+
+    def _split(self, text: str) -> Optional[List[CVSection]]:
+        if not settings.LLM_SECTION_SPLIT_ENABLED:
+            return None
+        return split_cv_sections(text, settings.LLM_SECTION_SPLIT_MIN_CHARS)
+
+    def _section_chain(self, fields: Tuple[str, ...]):
+        """Chain extracting only `fields` of CVExtractionResponse, built once per combination"""
+        chain = self.section_chains.get(fields)
+        if chain is None:
+            from langchain_core.prompts import ChatPromptTemplate
+            from langchain_core.output_parsers import PydanticOutputParser
+
+            model = create_model(
+                "CVSectionExtraction",
+                **{name: (CVExtractionResponse.model_fields[name].annotation, CVExtractionResponse.model_fields[name].default)
+                   for name in fields}
+            )
+            parser = PydanticOutputParser(pydantic_object=model)
+            prompt = ChatPromptTemplate.from_template(CV_SECTION_PROMPT_TEMPLATE).partial(
+                section=", ".join(name.replace("_", " ") for name in fields),
+                format_instructions=parser.get_format_instructions()
+            )
+            chain = self.section_chains[fields] = prompt | self.llm | parser
+        return chain
+
+    async def _extract_section(self, section: CVSection) -> dict:
+        result = await self.invoke({"cv_text": section.text}, chain=self._section_chain(section.fields))
+        return result.model_dump(mode="json")
+
+    def _plan(self, text: str) -> Tuple[List[dict], Optional[List[CVSection]], dict]:
+        """Share the work between the rule-based parser and the LLM.
+
+        Returns the parts parsed by rules, the sections left for the LLM (None
+        means the whole document in one request) and the rule confidence per section.
+        """
+        if settings.CV_RULES_ENABLED:
+            sections = split_cv_sections(text, 0)
+            if sections:
+                parsed = rule_parser.parse_sections(sections)
+                accepted = [data for _, data, score in parsed if score >= settings.CV_RULES_MIN_CONFIDENCE]
+                if accepted:
+                    remaining = [section for section, _, score in parsed if score < settings.CV_RULES_MIN_CONFIDENCE]
+                    self.rule_sections += len(accepted)
+                    self.rule_only_documents += not remaining
+                    return accepted, remaining, {section.name: round(score, 2) for section, _, score in parsed}
+        return [], self._split(text), {}
+
+    async def parse_cv(self, pdf_content: PDFSource) -> CVExtractionResponse:
+        text, _ = await pdf_extractor.extract(pdf_content)
+        rule_parts, sections, _ = self._plan(text)
+        if sections is None:
+            return await self.invoke({"cv_text": text})
+
+        # Map: each section with its own smaller prompt, in parallel; reduce: each field comes from one section
+        tasks = [asyncio.create_task(self._extract_section(section)) for section in sections]
+        try:
+            parts = rule_parts + list(await asyncio.gather(*tasks))
+        finally:
+            # A failed section (or a cancelled request) must not leave the others holding LLM slots
+            for task in tasks:
+                task.cancel()
+        return CVExtractionResponse(**{name: value for part in parts for name, value in part.items()})
+
+    @asynccontextmanager
+    async def _slot(self):
+        """Wait (up to LLM_QUEUE_TIMEOUT) for one of the LLM_MAX_CONCURRENCY slots"""
+        queued_at = time.perf_counter()
+        self.waiting += 1
+        try:
+            await asyncio.wait_for(self.semaphore.acquire(), timeout=settings.LLM_QUEUE_TIMEOUT)
+        except asyncio.TimeoutError:
+            self.queue_timeouts += 1
+            raise LLMQueueTimeoutError(f"No LLM slot became free within {settings.LLM_QUEUE_TIMEOUT}s")
+        finally:
+            self.waiting -= 1
+        wait = time.perf_counter() - queued_at
+        observe_stage("llm_queue", wait)
+        self.acquired += 1
+        self.total_queue_wait_seconds += wait
+        self.max_queue_wait_seconds = max(self.max_queue_wait_seconds, wait)
+
+        self.in_flight += 1
+        try:
+            yield
+        finally:
+            self.in_flight -= 1
+            self.semaphore.release()
+
+    def _record_model_time(self, elapsed: float):
+        self.calls += 1
+        self.total_model_seconds += elapsed
+        self.max_model_seconds = max(self.max_model_seconds, elapsed)
+        observe_stage("llm_model", elapsed)
+
+    async def _backoff(self, attempt: int):
+        self.retries += 1
+        delay = min(settings.LLM_RETRY_MAX_DELAY, settings.LLM_RETRY_BASE_DELAY * 2 ** attempt)
+        await asyncio.sleep(delay * random.uniform(0.5, 1.0))
+
+    async def invoke(self, inputs: dict, chain=None):
+        """Run the chain (the whole-CV chain by default) within the concurrency limit,
+        retrying rate-limited calls with backoff"""
+        chain = chain or self.chain
+        # The slot is kept during backoff so a rate-limited worker does not let others pile on
+        async with self._slot():
+            for attempt in range(settings.LLM_MAX_RETRIES + 1):
+                start = time.perf_counter()
+                try:
+                    return await asyncio.wait_for(chain.ainvoke(inputs), timeout=settings.LLM_REQUEST_TIMEOUT)
+                except asyncio.TimeoutError:
+                    self.request_timeouts += 1
+                    self.failed += 1
+                    raise TimeoutError(f"LLM request took longer than {settings.LLM_REQUEST_TIMEOUT}s")
+                except Exception as e:
+                    if attempt == settings.LLM_MAX_RETRIES or not is_rate_limit_error(e):
+                        self.failed += 1
+                        raise
+                finally:
+                    self._record_model_time(time.perf_counter() - start)
+                await self._backoff(attempt)
+
+    async def stream_cv(self, pdf_content: PDFSource) -> AsyncIterator[Tuple[str, Any]]:
+        """Extract a CV while streaming ("progress" | "section" | "result", data) events.
+
+        Sections are yielded as soon as the model has finished writing them;
+        the last event carries the complete, validated CVExtractionResponse.
+        """
+        text, pages = await pdf_extractor.extract(pdf_content)
+        yield "progress", {"stage": "text_extracted", "pages": pages, "characters": len(text)}
+
+        rule_parts, sections, confidence = self._plan(text)
+        merged = {}
+        if rule_parts:
+            yield "progress", {"stage": "rules_applied", "confidence": confidence}
+            for part in rule_parts:
+                merged.update(part)
+                for name, value in part.items():
+                    yield "section", {"name": name, "data": _section_data(name, value)}
+
+        if sections is not None:
+            if not sections:
+                yield "result", CVExtractionResponse(**merged)
+                return
+            # Sections are extracted in parallel and reported in the order they finish
+            yield "progress", {"stage": "model_started", "sections": [section.name for section in sections]}
+            tasks = [asyncio.create_task(self._extract_section(section)) for section in sections]
+            try:
+                for next_part in asyncio.as_completed(tasks):
+                    part = await next_part
+                    merged.update(part)
+                    for name, data in part.items():
+                        yield "section", {"name": name, "data": data}
+            finally:
+                for task in tasks:
+                    task.cancel()
+            yield "result", CVExtractionResponse(**merged)
+            return
+
+        async with aclosing(stream_from_task(lambda emit: self._stream_model(text, emit))) as events:
+            async for event in events:
+                yield event
+
+    async def _stream_model(self, text: str, emit: Callable[[str, Any], None]):
+        """The single-request model stream; runs in its own task (stream_from_task), so the
+        slot and LLM_REQUEST_TIMEOUT only cover the model, never the client reading the events"""
+        async with self._slot():
+            for attempt in range(settings.LLM_MAX_RETRIES + 1):
+                emit("progress", {"stage": "model_started", "attempt": attempt + 1})
+                output = ""
+                sections = JSONSectionStream()
+                start = time.perf_counter()
+                try:
+                    async with asyncio.timeout(settings.LLM_REQUEST_TIMEOUT):
+                        async for chunk in self.stream_chain.astream({"cv_text": text}):
+                            piece = _chunk_text(chunk)
+                            output += piece
+                            for name, value in sections.feed(piece):
+                                data = _section_data(name, value)
+                                # Invalid sections are reported by the final parse
+                                if data is not None:
+                                    emit("section", {"name": name, "data": data})
+                    break
+                except TimeoutError:
+                    self.request_timeouts += 1
+                    self.failed += 1
+                    raise TimeoutError(f"LLM request took longer than {settings.LLM_REQUEST_TIMEOUT}s")
+                except Exception as e:
+                    # Only a request that has not produced anything yet can be retried transparently
+                    if output or attempt == settings.LLM_MAX_RETRIES or not is_rate_limit_error(e):
+                        self.failed += 1
+                        raise
+                finally:
+                    self._record_model_time(time.perf_counter() - start)
+                await self._backoff(attempt)
+
+        emit("result", self.parser.parse(output))
+
+    def stats(self) -> dict:
+        return {
+            "max_concurrency": settings.LLM_MAX_CONCURRENCY,
+            "waiting": self.waiting,
+            "in_flight": self.in_flight,
+            "calls": self.calls,
+            "retries": self.retries,
+            "failed": self.failed,
+            "queue_timeouts": self.queue_timeouts,
+            "request_timeouts": self.request_timeouts,
+            "avg_queue_wait_seconds": self.total_queue_wait_seconds / self.acquired if self.acquired else 0.0,
+            "max_queue_wait_seconds": self.max_queue_wait_seconds,
+            "avg_model_seconds": self.total_model_seconds / self.calls if self.calls else 0.0,
+            "max_model_seconds": self.max_model_seconds,
+            "rule_sections": self.rule_sections,
+            "rule_only_documents": self.rule_only_documents,
+        }
+
+_llm_service: Optional[LLMService] = None
+
+def get_llm_service() -> LLMService:
+    """The shared LLMService, created on the first CV request rather than at import"""
+    global _llm_service
+    if _llm_service is None:
+        _llm_service = LLMService()
+    return _llm_service
+
+def get_llm_stats() -> dict:
+    """Stats of the shared LLMService, without creating it"""
+    if _llm_service is None:
+        return {"initialized": False}
+    return {"initialized": True, **_llm_service.stats()}
@@ -0,0 +1,173 @@
+import asyncio
+import io
+import mmap
+import re
+import signal
+import time
+from collections import Counter
+from contextlib import contextmanager
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Iterator, List, Optional, Tuple, Union
+from app.core.config import settings
+from app.core.metrics import observe_stage
+
+# Bump when the text produced for the same PDF changes, so cached LLM results are not reused
+TEXT_FORMAT_VERSION = 1
+
+# PDF bytes, or the path of a spooled upload (mapped by the worker instead of being sent to it)
+PDFSource = Union[bytes, str]
+
+_SPACES = re.compile(r"[ \t\r\f\v\u00a0\u2000-\u200b\u3000]+")
+_BLANK_LINES = re.compile(r"\n{3,}")
+_DIGITS = re.compile(r"\d+")
+
+class PDFTimeoutError(BaseException):
+    # BaseException so the broad `except Exception` blocks inside pypdf cannot swallow it
+    pass
+
+# =====================================================
+# Text extraction (runs inside the worker processes)
+# =====================================================
+def normalize_page(text: str) -> List[str]:
+    """Collapse runs of whitespace and drop empty lines"""
+    lines = (_SPACES.sub(" ", line).strip() for line in text.split("\n"))
+    return [line for line in lines if line]
+
+def _repeated_edge_lines(pages: List[List[str]]) -> set:
+    # A first/last line repeated on most pages (ignoring page numbers) is a header or footer
+    if len(pages) < 3:
+        return set()
+    edges = Counter()
+    for lines in pages:
+        for line in {lines[0], lines[-1]} if lines else ():
+            edges[_DIGITS.sub("#", line)] += 1
+    return {line for line, count in edges.items() if count >= len(pages) * 0.6}
+
+def strip_headers_footers(pages: List[List[str]]) -> List[List[str]]:
+    repeated = _repeated_edge_lines(pages)
+    if not repeated:
+        return pages
+    stripped = []
+    for number, lines in enumerate(pages):
+        lines = list(lines)
+        # The first page keeps its header: on a CV it is usually the name and contact line
+        if number > 0 and lines and _DIGITS.sub("#", lines[0]) in repeated:
+            lines.pop(0)
+        if lines and _DIGITS.sub("#", lines[-1]) in repeated:
+            lines.pop()
+        stripped.append(lines)
+    return stripped
+
+def _raise_timeout(signum, frame):
+    raise PDFTimeoutError()
+
+@contextmanager
+def _open_pdf(source: PDFSource) -> Iterator:
+    if isinstance(source, bytes):
+        yield io.BytesIO(source)
+        return
+    with open(source, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        yield mapped
+
+def extract_text(source: PDFSource, max_pages: int, timeout: float) -> Tuple[str, int, float]:
+    """Extract normalized text from at most `max_pages` pages.
+
+    Returns the text, the number of pages read and the CPU seconds spent.
+    """
+    import pypdf  # only the worker processes need it
+
+    cpu_start = time.process_time()
+    # Hard per-document limit; worker processes run tasks on their main thread
+    use_alarm = hasattr(signal, "setitimer")
+    if use_alarm:
+        previous = signal.signal(signal.SIGALRM, _raise_timeout)
+        signal.setitimer(signal.ITIMER_REAL, timeout)
+    try:
+        with _open_pdf(source) as stream:
+            reader = pypdf.PdfReader(stream)
+            pages = []
+            for page in reader.pages[:max_pages]:
+                pages.append(normalize_page(page.extract_text() or ""))
+    finally:
+        if use_alarm:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+            signal.signal(signal.SIGALRM, previous)
+
+    text = "\n\n".join("\n".join(lines) for lines in strip_headers_footers(pages))
+    return _BLANK_LINES.sub("\n\n", text).strip(), len(pages), time.process_time() - cpu_start
+
+# =====================================================
+# Process pool
+# =====================================================
+class PDFExtractor:
+    """Runs pypdf in a process pool so parsing never blocks the event loop"""
+
+    def __init__(self, workers: int, max_pages: int, timeout: float):
+        self.workers = workers
+        self.max_pages = max_pages
+        self.timeout = timeout
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self.documents = 0
+        self.pages = 0
+        self.failed = 0
+        self.timeouts = 0
+        self.total_seconds = 0.0
+        self.total_cpu_seconds = 0.0
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        # Created on first use so importing the app does not spawn processes
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self.workers)
+        return self._pool
+
+    async def extract(self, pdf_content: PDFSource) -> Tuple[str, int]:
+        """Returns the normalized text and the number of pages read"""
+        start = time.perf_counter()
+        loop = asyncio.get_running_loop()
+        try:
+            # The outer timeout is a backstop for platforms without SIGALRM
+            text, pages, cpu_seconds = await asyncio.wait_for(
+                loop.run_in_executor(self._get_pool(), extract_text, pdf_content, self.max_pages, self.timeout),
+                timeout=self.timeout + 5,
+            )
+        except (PDFTimeoutError, asyncio.TimeoutError):
+            self.timeouts += 1
+            raise ValueError(f"PDF text extraction took longer than {self.timeout}s")
+        except BrokenProcessPool:
+            self._pool = None
+            self.failed += 1
+            raise ValueError("PDF text extraction worker crashed")
+        except Exception as e:
+            self.failed += 1
+            raise ValueError(f"Could not read PDF: {e}")
+
+        elapsed = time.perf_counter() - start
+        self.documents += 1
+        self.pages += pages
+        self.total_seconds += elapsed
+        observe_stage("pdf_extract", elapsed)
+        self.total_cpu_seconds += cpu_seconds
+        return text, pages
+
+    def shutdown(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+    def stats(self) -> dict:
+        return {
+            "workers": self.workers,
+            "documents": self.documents,
+            "pages": self.pages,
+            "failed": self.failed,
+            "timeouts": self.timeouts,
+            "pages_per_second": self.pages / self.total_seconds if self.total_seconds else 0.0,
+            "avg_cpu_seconds_per_document": self.total_cpu_seconds / self.documents if self.documents else 0.0,
+        }
+
+pdf_extractor = PDFExtractor(
+    workers=settings.PDF_WORKERS,
+    max_pages=settings.PDF_MAX_PAGES,
+    timeout=settings.PDF_EXTRACT_TIMEOUT,
+)
@@ -0,0 +1,262 @@
+"""
+Deterministic parser for common CV layouts (LinkedIn PDF export, one-line
+"Role | Company | Period" templates, "Category: a, b, c" skill lists).
+
+Works on the sections produced by cv_sections.split_cv_sections and returns,
+for each one, the CVExtractionResponse fields it covers and a confidence in
+[0, 1]. Sections below the configured threshold are left to the LLM.
+"""
+import re
+from typing import List, Tuple
+from app.services.cv_sections import CVSection, is_heading, normalize_heading
+
+# Bump when the parsing rules change, so cached results are not reused
+RULES_VERSION = 2
+
+_MONTH = r"(?:jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)[a-z]*\.?"
+_DATE = rf"(?:{_MONTH}\s+\d{{4}}|\d{{1,2}}/\d{{4}}|\d{{4}})"
+_END = rf"(?:{_DATE}|present|now|current|nay|hiện tại)"
+PERIOD = re.compile(rf"({_DATE})\s*(?:-|–|—|to|đến)\s*({_END})(?:\s*\([^)]*\))?", re.IGNORECASE)
+YEAR = re.compile(r"\b(?:19|20)\d{2}\b")
+EMAIL = re.compile(r"[\w.+-]+@[\w-]+(?:\.[\w-]+)+")
+PHONE = re.compile(r"\+?\d[\d .()-]{7,}\d")
+LINKEDIN = re.compile(r"(?:https?://)?(?:[\w]+\.)?linkedin\.com/in/[\w%-]+/?", re.IGNORECASE)
+GITHUB = re.compile(r"(?:https?://)?github\.com/[\w-]+/?", re.IGNORECASE)
+LOCATION = re.compile(r"^[A-ZÀ-Ỹ][\w .'-]+,\s*[A-ZÀ-Ỹ][\w .'-]+$")
+BULLET = re.compile(r"^[•·▪●◦*\-–]\s*")
+SEPARATORS = re.compile(r"\s+(?:\||—|–|-|@|at)\s+")
+
+ROLE_WORDS = {
+    "engineer", "developer", "manager", "intern", "lead", "architect", "analyst", "consultant",
+    "designer", "scientist", "director", "specialist", "officer", "administrator", "tester", "qa",
+    "devops", "cto", "ceo", "head", "programmer", "trainee", "chuyen vien", "ky su", "lap trinh vien",
+    "truong nhom", "thuc tap sinh", "giam doc", "nhan vien",
+}
+SCHOOL_WORDS = {"university", "college", "institute", "academy", "school", "dai hoc", "hoc vien", "cao dang", "truong"}
+DEGREE_WORDS = {
+    "bachelor", "master", "phd", "doctor", "bsc", "msc", "ba", "ma", "mba", "be", "engineer",
+    "associate", "diploma", "cu nhan", "ky su", "thac si", "tien si",
+}
+TECH_PREFIXES = ("tech stack:", "technologies:", "tech:", "stack:", "công nghệ:")
+DOMAIN_PREFIXES = ("domain:", "domains:", "lĩnh vực:")
+
+def _has_word(line: str, words: set) -> bool:
+    normalized = f" {normalize_heading(line)} "
+    return any(f" {word} " in normalized for word in words)
+
+def _strip_bullet(line: str) -> str:
+    return BULLET.sub("", line).strip()
+
+def _split_list(value: str) -> List[str]:
+    return [item.strip() for item in re.split(r"[,;]", value) if item.strip()]
+
+# =====================================================
+# Profile
+# =====================================================
+def parse_profile(text: str) -> Tuple[dict, float]:
+    lines = [line.strip() for line in text.split("\n") if line.strip()]
+    profile = {}
+    # The name is the first short, letters-only line; LinkedIn exports put a sidebar before it
+    for index, line in enumerate(lines[:10]):
+        words = line.split()
+        if 2 <= len(words) <= 5 and not is_heading(line) \
+                and all(word.replace("-", "").replace("'", "").isalpha() for word in words):
+            profile["name"] = line.title() if line.isupper() else line
+            following = lines[index + 1] if index + 1 < len(lines) else ""
+            if following and len(following) <= 60 and _has_word(following, ROLE_WORDS):
+                profile["role"] = following
+            break
+
+    if email := EMAIL.search(text):
+        profile["email"] = email.group(0)
+    if linkedin := LINKEDIN.search(text):
+        profile["linkedin_url"] = linkedin.group(0)
+    if github := GITHUB.search(text):
+        profile["github_url"] = github.group(0)
+    # Phone numbers are looked for outside the e-mail addresses, URLs and dates
+    for line in lines:
+        line = EMAIL.sub(" ", LINKEDIN.sub(" ", GITHUB.sub(" ", line)))
+        if not PERIOD.search(line) and (phone := PHONE.search(line)):
+            profile["phone"] = phone.group(0).strip()
+            break
+    for line in lines[:8]:
+        if LOCATION.match(line) and line != profile.get("name"):
+            profile["location"] = line
+            break
+
+    # The bio is the text under a summary/about heading
+    bio, in_summary = [], False
+    for line in lines:
+        heading = normalize_heading(line)
+        if heading in ("summary", "about", "about me", "profile", "objective", "gioi thieu", "muc tieu"):
+            in_summary = True
+            continue
+        if in_summary:
+            if len(line) <= 40 and line.isupper():
+                break
+            bio.append(line)
+    if bio:
+        profile["bio"] = " ".join(bio)
+
+    if "name" not in profile:
+        return {"profile": None}, 0.0
+    confidence = 0.5 + (0.3 if "email" in profile or "phone" in profile else 0.0) + (0.2 if "role" in profile else 0.0)
+    return {"profile": profile}, confidence
+
+# =====================================================
+# Experience
+# =====================================================
+def _is_header_line(line: str) -> bool:
+    return bool(line) and len(line) <= 80 and not BULLET.match(line) and not line.endswith(".")
+
+def _role_and_company(parts: List[str]) -> Tuple[str, str, float]:
+    """Assign header parts to role/company; the score reflects how sure the assignment is"""
+    parts = [part.strip(" |,()") for part in parts if part.strip(" |,()")]
+    if len(parts) < 2:
+        return (parts[0] if parts else ""), "", 0.0
+    role_parts = [part for part in parts if _has_word(part, ROLE_WORDS)]
+    if len(role_parts) == 1:
+        role = role_parts[0]
+        company = next(part for part in parts if part is not role)
+        return role, company, 0.5
+    # LinkedIn export order: company, then role
+    return parts[1], parts[0], 0.3
+
+def parse_experiences(text: str) -> Tuple[dict, float]:
+    lines = [line.strip() for line in text.split("\n") if line.strip()]
+    anchors = [index for index, line in enumerate(lines) if PERIOD.search(line)]
+    if not anchors:
+        return {"experiences": []}, 0.0
+
+    # Header lines of each entry: the period line itself or up to two lines before it
+    headers = []
+    for number, index in enumerate(anchors):
+        remainder = PERIOD.sub("", lines[index]).strip(" |,-–—()")
+        if remainder:
+            headers.append((index, index, SEPARATORS.split(remainder)))
+            continue
+        previous_end = anchors[number - 1] + 1 if number else 0
+        start = max(index - 1, previous_end)
+        if index - 2 >= previous_end and _is_header_line(lines[index - 2]) and _is_header_line(lines[index - 1]):
+            start = index - 2
+        headers.append((start, index, lines[start:index]))
+
+    experiences, scores = [], []
+    consumed = 0
+    for number, (start, index, parts) in enumerate(headers):
+        end = headers[number + 1][0] if number + 1 < len(headers) else len(lines)
+        role, company, header_score = _role_and_company(parts)
+        period = PERIOD.search(lines[index])
+        period_display = re.sub(r"\s*\([^)]*\)$", "", period.group(0)).strip()
+
+        body = lines[index + 1:end]
+        if body and len(body[0]) <= 40 and LOCATION.match(body[0]):
+            body = body[1:]  # LinkedIn puts the location under the period
+        duties, tech_stack, domains = [], "", []
+        for line in body:
+            lowered = line.lower()
+            if lowered.startswith(TECH_PREFIXES):
+                tech_stack = line.split(":", 1)[1].strip()
+            elif lowered.startswith(DOMAIN_PREFIXES):
+                domains = _split_list(line.split(":", 1)[1])
+            elif BULLET.match(line) or not duties:
+                duties.append(_strip_bullet(line))
+            else:
+                duties[-1] += " " + line  # wrapped line of the previous duty
+
+        experiences.append({
+            "company_name": company,
+            "role": role,
+            "period_display": period_display,
+            "tech_stack": tech_stack,
+            "duties": duties,
+            "domains": domains,
+        })
+        scores.append(0.5 + header_score if company and role else 0.2)
+        consumed += end - start
+
+    # Lines before the first entry mean the layout was not fully understood
+    coverage = consumed / len(lines)
+    return {"experiences": experiences}, min(scores) * coverage
+
+# =====================================================
+# Education
+# =====================================================
+def _parse_degree(line: str) -> Tuple[str, str]:
+    line = PERIOD.sub("", YEAR.sub("", line)).strip(" ·,()-–")
+    for splitter in (",", " in ", " - ", " chuyên ngành "):
+        if splitter in line:
+            degree, major = line.split(splitter, 1)
+            return degree.strip(" ·,"), major.strip(" ·,()-")
+    return line, ""
+
+def parse_educations(text: str) -> Tuple[dict, float]:
+    lines = [line.strip() for line in text.split("\n") if line.strip()]
+    anchors = [index for index, line in enumerate(lines) if _has_word(line, SCHOOL_WORDS) and not _has_word(line, DEGREE_WORDS)]
+    if not anchors:
+        return {"educations": []}, 0.0
+
+    educations, scores = [], []
+    for number, index in enumerate(anchors):
+        end = anchors[number + 1] if number + 1 < len(anchors) else len(lines)
+        entry = lines[index:end]
+        school = PERIOD.sub("", entry[0]).strip(" |,-–()")
+        degree, major, year = "", "", None
+        for line in entry:
+            if period := PERIOD.search(line):
+                year = re.sub(r"\s*\([^)]*\)$", "", period.group(0))
+            elif year is None and (single := YEAR.search(line)):
+                year = single.group(0)
+            if not degree and line is not entry[0] and _has_word(line, DEGREE_WORDS):
+                degree, major = _parse_degree(line)
+        educations.append({"school": school, "degree": degree, "major": major, "education_year": year})
+        scores.append(0.4 + (0.3 if degree else 0.0) + (0.2 if major else 0.0) + (0.1 if year else 0.0))
+
+    coverage = (len(lines) - anchors[0]) / len(lines)
+    return {"educations": educations}, min(scores) * coverage
+
+# =====================================================
+# Skills
+# =====================================================
+def _is_skill_list(items: List[str]) -> bool:
+    # "Git, Docker" rather than a sentence about soft skills
+    return bool(items) and all(len(item) <= 40 and len(item.split()) <= 4 and not item.endswith(".") for item in items)
+
+def parse_skills(text: str) -> Tuple[dict, float]:
+    lines = [_strip_bullet(line) for line in text.split("\n") if line.strip()]
+    categories, other_skills, understood = [], [], 0
+    for line in lines:
+        if ":" in line:
+            name, values = line.split(":", 1)
+            if name.strip() and _split_list(values):
+                categories.append({"category_name": name.strip(), "skills": _split_list(values)})
+                understood += 1
+                continue
+        # Lines outside a category are kept as other skills, as the LLM does
+        items = _split_list(line)
+        if _is_skill_list(items):
+            other_skills.extend(items)
+            understood += 1
+    if not categories:
+        return {"skill_categories": [], "other_skills": []}, 0.0
+    return {"skill_categories": categories, "other_skills": other_skills}, understood / len(lines)
+
+# =====================================================
+# Section dispatch
+# =====================================================
+SECTION_PARSERS = {
+    "experiences": parse_experiences,
+    "educations": parse_educations,
+    "skills": parse_skills,
+    "general": parse_profile,
+}
+
+def parse_section(section: CVSection) -> Tuple[dict, float]:
+    """Fields covered by the section and the confidence of the rule-based result"""
+    if section.name == "general" and section.fields != ("profile",):
+        # The general part also stands in for sections that were not found: leave it to the LLM
+        return {}, 0.0
+    return SECTION_PARSERS[section.name](section.text)
+
+def parse_sections(sections: List[CVSection]) -> List[Tuple[CVSection, dict, float]]:
+    return [(section, *parse_section(section)) for section in sections]
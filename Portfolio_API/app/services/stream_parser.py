@@ -0,0 +1,83 @@
+import json
+from typing import Any, List, Tuple
+
+class JSONSectionStream:
+    """Incrementally scans a streamed JSON object and returns each top-level
+    member as soon as its value is complete.
+
+    Text before the opening brace (such as a ```json fence) is skipped, so it
+    works directly on the model's token stream. Malformed output never raises:
+    the stream stops reporting sections (`failed` is set) and the caller's
+    parse of the complete output reports the error.
+    """
+
+    def __init__(self):
+        self.buffer = ""
+        self.pos = 0
+        self.depth = 0
+        self.in_string = False
+        self.escaped = False
+        self.started = False
+        self.value_start = None  # offset of the current top-level value
+        self.key = None
+        self.failed = False
+
+    def feed(self, chunk: str) -> List[Tuple[str, Any]]:
+        """Add a chunk; returns the (key, value) pairs completed by it"""
+        if self.failed:
+            return []
+        self.buffer += chunk
+        completed = []
+        while self.pos < len(self.buffer):
+            char = self.buffer[self.pos]
+            if not self.started:
+                if char == "{":
+                    self.started = True
+                    self.depth = 1
+                    self.buffer = self.buffer[self.pos:]
+                    self.pos = 0
+                self.pos += 1
+                continue
+
+            if self.in_string:
+                if self.escaped:
+                    self.escaped = False
+                elif char == "\\":
+                    self.escaped = True
+                elif char == '"':
+                    self.in_string = False
+            elif char == '"':
+                self.in_string = True
+            elif char in "{[":
+                self.depth += 1
+            elif char in "}]":
+                self.depth -= 1
+                if self.depth == 0:
+                    completed.extend(self._close_member())
+                    self.started = False
+            elif char == ":" and self.depth == 1 and self.value_start is None:
+                try:
+                    self.key = json.loads(self.buffer[:self.pos].lstrip("{,").strip())
+                except ValueError:
+                    self.key = None
+                if not isinstance(self.key, str):
+                    self.failed = True
+                    return completed
+                self.value_start = self.pos + 1
+            elif char == "," and self.depth == 1:
+                completed.extend(self._close_member())
+                # Drop the consumed members so the buffer stays small
+                self.buffer = self.buffer[self.pos:]
+                self.pos = 0
+            self.pos += 1
+        return completed
+
+    def _close_member(self) -> List[Tuple[str, Any]]:
+        if self.value_start is None:
+            return []
+        raw = self.buffer[self.value_start:self.pos]
+        key, self.key, self.value_start = self.key, None, None
+        try:
+            return [(key, json.loads(raw))]
+        except ValueError:
+            return []
@@ -0,0 +1,110 @@
+"""
+Accuracy and latency of the rule-based CV parser vs the LLM, per section, on a labeled corpus.
+
+Each document in benchmarks/cv_corpus is the normalized text of a CV (<name>.txt, as
+produced by pdf_service) with its expected CVExtractionResponse (<name>.json).
+Accuracy is the F1 score over the extracted facts (field values, list items).
+    python -m benchmarks.cv_parser                 # rule-based path only
+    python -m benchmarks.cv_parser --llm           # also the LLM path (needs GOOGLE_API_KEY)
+"""
+import argparse
+import asyncio
+import json
+import statistics
+import time
+from pathlib import Path
+from typing import Dict, List
+from app.services import rule_parser
+from app.services.cv_sections import split_cv_sections
+
+CORPUS_DIR = Path(__file__).parent / "cv_corpus"
+
+def _norm(value) -> str:
+    return " ".join(str(value).lower().split())
+
+def facts(data: dict, fields) -> set:
+    """Flatten the given CVExtractionResponse fields into comparable facts"""
+    out = set()
+    for field in fields:
+        value = data.get(field)
+        if field == "profile":
+            out.update((field, key, _norm(v)) for key, v in (value or {}).items() if v)
+        elif field in ("experiences", "educations"):
+            for index, item in enumerate(value or []):
+                for key, v in item.items():
+                    for element in v if isinstance(v, list) else [v]:
+                        if element:
+                            out.add((field, index, key, _norm(element)))
+        elif field == "skill_categories":
+            out.update((field, _norm(c["category_name"]), _norm(s)) for c in value or [] for s in c["skills"])
+        else:
+            out.update((field, _norm(v)) for v in value or [])
+    return out
+
+def f1(predicted: set, expected: set) -> float:
+    if not predicted and not expected:
+        return 1.0
+    true_positives = len(predicted & expected)
+    if not true_positives:
+        return 0.0
+    precision, recall = true_positives / len(predicted), true_positives / len(expected)
+    return 2 * precision * recall / (precision + recall)
+
+async def run(threshold: float, use_llm: bool):
+    llm_service = None
+    if use_llm:
+        from app.services.llm_service import get_llm_service
+        llm_service = get_llm_service()
+
+    results: Dict[str, List[tuple]] = {"rules": [], "llm": []}
+    print(f"{'document':<22} {'section':<12} {'confidence':>10} {'path':>6} {'F1':>6} {'ms':>9}")
+    for text_path in sorted(CORPUS_DIR.glob("*.txt")):
+        text = text_path.read_text()
+        expected = json.loads(text_path.with_suffix(".json").read_text())
+        sections = split_cv_sections(text, 0)
+        if sections is None:
+            print(f"{text_path.stem:<22} {'(layout not recognised: whole document goes to the LLM)'}")
+            if llm_service:
+                start = time.perf_counter()
+                data = (await llm_service.invoke({"cv_text": text})).model_dump(mode="json")
+                elapsed = (time.perf_counter() - start) * 1000
+                score = f1(facts(data, expected), facts(expected, expected))
+                results["llm"].append((score, elapsed))
+                print(f"{'':<22} {'whole':<12} {'':>10} {'llm':>6} {score:>6.2f} {elapsed:>9.1f}")
+            continue
+
+        for section in sections:
+            start = time.perf_counter()
+            data, confidence = rule_parser.parse_section(section)
+            elapsed = (time.perf_counter() - start) * 1000
+            score = f1(facts(data, section.fields), facts(expected, section.fields))
+            accepted = confidence >= threshold
+            if accepted:
+                results["rules"].append((score, elapsed))
+            print(f"{text_path.stem:<22} {section.name:<12} {confidence:>10.2f} "
+                  f"{'rules' if accepted else '-':>6} {score:>6.2f} {elapsed:>9.3f}")
+
+            if llm_service:
+                start = time.perf_counter()
+                data = await llm_service._extract_section(section)
+                elapsed = (time.perf_counter() - start) * 1000
+                score = f1(facts(data, section.fields), facts(expected, section.fields))
+                results["llm"].append((score, elapsed))
+                print(f"{'':<22} {section.name:<12} {'':>10} {'llm':>6} {score:>6.2f} {elapsed:>9.1f}")
+
+    print()
+    for path, rows in results.items():
+        if rows:
+            scores, latencies = [row[0] for row in rows], [row[1] for row in rows]
+            print(f"{path:<6} {len(rows):>3} sections   mean F1 {statistics.mean(scores):.2f}   "
+                  f"mean {statistics.mean(latencies):.3f} ms   max {max(latencies):.3f} ms")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--threshold", type=float, default=0.8, help="CV_RULES_MIN_CONFIDENCE to evaluate")
+    parser.add_argument("--llm", action="store_true", help="also run every section through the LLM")
+    args = parser.parse_args()
+    asyncio.run(run(args.threshold, args.llm))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""
+Serialization cost of a portfolio response, per path, without the database.
+
+Builds an in-memory portfolio (ORM objects, relationships attached) with
+--experiences experiences and times turning it into the JSON response body:
+  response_model   what FastAPI does for `response_model=`: validate, jsonable_encoder, json.dumps
+  pydantic         validate_python(from_attributes) + dump_json, the default cached_read path
+  fast             app.core.serialization (FAST_SERIALIZATION), with orjson if installed
+                   (without orjson the app ignores FAST_SERIALIZATION; json is timed here anyway)
+  fast-stdlib      the same serializer encoded with the json module
+All bodies are checked to decode to the same data.
+    python -m benchmarks.serialization
+    python -m benchmarks.serialization --experiences 50 --runs 200
+"""
+import argparse
+import json
+import statistics
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from fastapi.encoders import jsonable_encoder
+from pydantic import TypeAdapter
+from app.core import serialization
+from app.models.models import (
+    Education, Experience, ExperienceDomain, ExperienceDuty, OtherSkill, Profile, Skill, SkillCategory,
+)
+from app.schemas import schemas
+
+def build_portfolio(experiences: int) -> dict:
+    now = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+    def audit(i: int) -> dict:
+        created_on = now + timedelta(minutes=i)
+        return {"id": uuid.uuid4(), "created_on": created_on, "modified_on": created_on, "state_code": 0, "status_code": 1}
+
+    categories = [SkillCategory(name=f"Category {c}", display_order=c, **audit(c)) for c in range(5)]
+    for category in categories:
+        category.skills = [Skill(name=f"Skill {s}", category_id=category.id, **audit(s)) for s in range(6)]
+    return {
+        "profile": Profile(name="Bench User", role="Engineer", bio="Bio " * 40, email="bench@example.com", **audit(0)),
+        "skill_categories": categories,
+        "other_skills": [OtherSkill(name=f"Other {i}", **audit(i)) for i in range(8)],
+        "experiences": [
+            Experience(
+                company_name=f"Company {i}", role="Senior Engineer", period_display="01/2020 - 12/2022",
+                tech_stack="Python, FastAPI, PostgreSQL, Redis, Docker", **audit(i),
+                duties=[ExperienceDuty(description=f"Delivered feature {d} of project {i} " * 3, **audit(d)) for d in range(5)],
+                domains=[ExperienceDomain(name=f"Domain {d}", **audit(d)) for d in range(2)],
+            )
+            for i in range(experiences)
+        ],
+        "educations": [
+            Education(school=f"University {i}", degree="BSc", major="Computer Science", education_year="2015", **audit(i))
+            for i in range(2)
+        ],
+    }
+
+def response_model_path(data) -> bytes:
+    model = schemas.Portfolio.model_validate(data, from_attributes=True)
+    return json.dumps(jsonable_encoder(model), ensure_ascii=False, separators=(",", ":")).encode()
+
+PORTFOLIO_ADAPTER = TypeAdapter(schemas.Portfolio)
+
+def pydantic_path(data) -> bytes:
+    return PORTFOLIO_ADAPTER.dump_json(PORTFOLIO_ADAPTER.validate_python(data, from_attributes=True))
+
+def fast_path(data) -> bytes:
+    return serialization.dump_json(schemas.Portfolio, data)
+
+def fast_stdlib_path(data) -> bytes:
+    value = serialization.serializer(schemas.Portfolio)(data)
+    return json.dumps(value, default=serialization._default, separators=(",", ":")).encode()
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--experiences", type=int, default=50)
+    parser.add_argument("--runs", type=int, default=200)
+    args = parser.parse_args()
+
+    data = build_portfolio(args.experiences)
+    paths = {"response_model": response_model_path, "pydantic": pydantic_path, "fast": fast_path}
+    if serialization.orjson is not None:
+        paths["fast-stdlib"] = fast_stdlib_path
+
+    expected = json.loads(response_model_path(data))
+    print(f"portfolio with {args.experiences} experiences; encoder for fast: "
+          f"{'orjson' if serialization.orjson else 'json (orjson not installed)'}\n")
+    print(f"{'path':<16}{'median ms':>10}{'p95 ms':>9}{'bytes':>9}{'speedup':>9}")
+    baseline = None
+    for name, serialize in paths.items():
+        body = serialize(data)
+        if json.loads(body) != expected:
+            raise SystemExit(f"{name}: body differs from the response_model path")
+        timings = []
+        for _ in range(args.runs):
+            start = time.perf_counter()
+            serialize(data)
+            timings.append((time.perf_counter() - start) * 1000)
+        median = statistics.median(timings)
+        baseline = baseline or median
+        p95 = statistics.quantiles(timings, n=20)[-1]
+        print(f"{name:<16}{median:>10.3f}{p95:>9.3f}{len(body):>9}{baseline / median:>8.1f}x")
+
+if __name__ == "__main__":
+    main()
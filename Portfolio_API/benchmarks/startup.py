@@ -0,0 +1,78 @@
+"""
+Import time of the API process, per module.
+
+Imports the app in fresh interpreters with `python -X importtime` and reports the
+total, the slowest modules (cumulative, including what they import) and the time
+per top-level package. Importing must not touch the database or build the LLM client.
+    python -m benchmarks.startup
+    python -m benchmarks.startup --module main --runs 5 --top 25
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+ROOT = Path(__file__).resolve().parent.parent
+# Imported lazily by the app; listed so a regression shows up in the report
+HEAVY_PACKAGES = ("langchain_core", "langchain_google_genai", "google", "pypdf")
+
+def import_once(module: str) -> Tuple[float, Dict[str, Tuple[int, int]]]:
+    """Wall time of one import and {module: (self_us, cumulative_us)} from -X importtime"""
+    start = time.perf_counter()
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT, env={**os.environ, "PYTHONDONTWRITEBYTECODE": "1"},
+        capture_output=True, text=True,
+    )
+    elapsed = time.perf_counter() - start
+    if completed.returncode != 0:
+        raise SystemExit(completed.stderr.strip().splitlines()[-1])
+
+    timings = {}
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        timings[name.strip()] = (int(self_us), int(cumulative_us))
+    return elapsed, timings
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--module", default="main", help="module to import (default: main)")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=20, help="slowest modules to list")
+    args = parser.parse_args()
+
+    import_once(args.module)  # warm the OS file cache
+    walls: List[float] = []
+    cumulative: Dict[str, List[int]] = defaultdict(list)
+    packages: Dict[str, List[int]] = defaultdict(list)
+    for _ in range(args.runs):
+        wall, timings = import_once(args.module)
+        walls.append(wall)
+        per_package = defaultdict(int)
+        for name, (self_us, cumulative_us) in timings.items():
+            cumulative[name].append(cumulative_us)
+            per_package[name.split(".")[0]] += self_us
+        for package, total in per_package.items():
+            packages[package].append(total)
+
+    print(f"import {args.module}: median {statistics.median(walls) * 1000:.0f} ms wall "
+          f"(interpreter included), min {min(walls) * 1000:.0f} ms, {args.runs} runs")
+    print("\nslowest modules (median cumulative ms)")
+    for name, values in sorted(cumulative.items(), key=lambda item: -statistics.median(item[1]))[:args.top]:
+        print(f"  {statistics.median(values) / 1000:>8.1f}  {name}")
+    print("\nper top-level package (median self ms)")
+    for name, values in sorted(packages.items(), key=lambda item: -statistics.median(item[1]))[:args.top]:
+        print(f"  {statistics.median(values) / 1000:>8.1f}  {name}")
+
+    loaded = [package for package in HEAVY_PACKAGES if package in packages]
+    print(f"\nlazily imported packages loaded at startup: {', '.join(loaded) or 'none'}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+"""
+Reclaim portfolio rows soft-deleted more than COMPACTION_RETENTION_DAYS ago
+(see app/services/compaction_service.py). Meant to run from a scheduler.
+    python compact_db.py                       # settings from .env
+    python compact_db.py --dry-run             # only report inactive / reclaimable rows
+    python compact_db.py --retention-days 7 --archive --vacuum
+"""
+import argparse
+import asyncio
+from app.services.compaction_service import compaction_service
+
+def print_table_stats(tables: dict):
+    print(f"{'table':<20}{'inactive':>10}{'reclaimable':>13}{'dead tuples':>13}{'dead %':>8}{'size MB':>9}")
+    for table, row in tables.items():
+        dead = row.get("dead_tuples", "-")
+        ratio = f"{row['dead_ratio'] * 100:.1f}" if "dead_ratio" in row else "-"
+        size = f"{row['total_bytes'] / 2**20:.1f}" if "total_bytes" in row else "-"
+        print(f"{table:<20}{row['inactive_rows']:>10}{row['reclaimable_rows']:>13}{dead:>13}{ratio:>8}{size:>9}")
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--retention-days", type=int, help="default: COMPACTION_RETENTION_DAYS")
+    parser.add_argument("--batch-size", type=int, help="default: COMPACTION_BATCH_SIZE")
+    parser.add_argument("--archive", action="store_true", default=None, help="copy rows to archived_rows first")
+    parser.add_argument("--max-batches", type=int, help="stop after this many batches")
+    parser.add_argument("--vacuum", action="store_true", help="VACUUM (ANALYZE) the tables afterwards (PostgreSQL)")
+    parser.add_argument("--dry-run", action="store_true")
+    args = parser.parse_args()
+
+    print_table_stats(await compaction_service.table_stats(args.retention_days))
+    if args.dry_run:
+        return
+
+    removed = await compaction_service.run(args.retention_days, args.batch_size, args.archive, args.max_batches)
+    stats = compaction_service.stats()
+    print(f"\n✅ Reclaimed {sum(removed.values())} rows in {stats['batches']} batches, "
+          f"{stats['last_run_seconds']:.1f}s ({stats['rows_archived']} archived)")
+    for table, count in removed.items():
+        if count:
+            print(f"  - {table}: {count}")
+
+    print()
+    if args.vacuum:
+        await compaction_service.vacuum()
+        print_table_stats(await compaction_service.table_stats(args.retention_days))
+    else:
+        print_table_stats(stats["tables"])
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -1,17 +1,35 @@
 import uvicorn
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+from fastapi import APIRouter, Depends, FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
+from app.api import deps
 from app.api.v1.api import api_router
+from app.api.uploads import UploadSizeLimitMiddleware, upload_stats
 from app.core.config import settings
-from app.core.database import engine
-from app.models.models import Base
+from app.core import metrics, response_cache, serialization
+from app.core.database import get_pool_stats
+from app.services import auth_service
+from app.services.cv_job_service import cv_job_queue
+from app.services.compaction_service import compaction_service
+from app.services.cv_extraction_service import cv_extraction_cache
+from app.services.pdf_service import pdf_extractor
+from app.services.llm_service import get_llm_stats
 
-# Create tables
-Base.metadata.create_all(bind=engine)
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    serialization.warn_if_unavailable()
+    await cv_job_queue.start()
+    compaction_service.start()
+    yield
+    await compaction_service.stop()
+    await cv_job_queue.stop()
+    pdf_extractor.shutdown()
+    await auth_service.close_http_client()
 
 app = FastAPI(
     title=settings.PROJECT_NAME,
-    openapi_url=f"{settings.API_V1_STR}/openapi.json"
+    openapi_url=f"{settings.API_V1_STR}/openapi.json",
+    lifespan=lifespan
 )
 
 # Configure CORS
@@ -23,11 +41,67 @@ app.add_middleware(
     allow_headers=["*"],  # Allow all headers
 )
 
+# Rejects oversized CV uploads while they are received
+app.add_middleware(UploadSizeLimitMiddleware)
+
+# Outermost: request latency, query count and database time per route
+app.add_middleware(metrics.MetricsMiddleware)
+
 app.include_router(api_router, prefix=settings.API_V1_STR)
 
 @app.get("/")
 def root():
     return {"message": "Welcome to Portfolio API Architecture", "docs": "/docs"}
 
+# Metrics and statistics expose internals: only served with the MONITORING_TOKEN bearer token
+monitoring = APIRouter(dependencies=[Depends(deps.verify_monitoring_token)])
+
+@monitoring.get("/metrics", include_in_schema=False)
+def metrics_route():
+    """Prometheus metrics: request latency, queries and DB time per request, pool checkouts, CV stages"""
+    return Response(content=metrics.render(), media_type="text/plain; version=0.0.4")
+
+@monitoring.get("/health/db-pool")
+def db_pool_stats():
+    """Client-side connection pool statistics"""
+    return get_pool_stats()
+
+@monitoring.get("/health/response-cache")
+def response_cache_stats():
+    """Server-side portfolio response cache statistics"""
+    return response_cache.stats()
+
+@monitoring.get("/health/cv-jobs")
+def cv_job_stats():
+    """Background CV job queue depth and processing times"""
+    return cv_job_queue.stats()
+
+@monitoring.get("/health/cv-extraction-cache")
+def cv_extraction_cache_stats():
+    """Hits and misses of the persisted CV extraction cache"""
+    return cv_extraction_cache.stats()
+
+@monitoring.get("/health/uploads")
+def upload_stats_route():
+    """CV upload sizes, rejections and memory high-water mark"""
+    return upload_stats.stats()
+
+@monitoring.get("/health/compaction")
+def compaction_stats():
+    """Rows reclaimed by the compaction job, and inactive rows / table bloat per table as of its last run"""
+    return compaction_service.stats()
+
+@monitoring.get("/health/pdf-extraction")
+def pdf_extraction_stats():
+    """PDF text extraction throughput and CPU time"""
+    return pdf_extractor.stats()
+
+@monitoring.get("/health/llm")
+def llm_stats():
+    """LLM queue wait vs model latency, retries and timeouts"""
+    return get_llm_stats()
+
+app.include_router(monitoring)
+
 if __name__ == "__main__":
     uvicorn.run("main:app", host="0.0.0.0", port=8000, reload=True)
@@ -1,34 +1,46 @@
 """
-Database migration script to update schema to Dataverse-compatible format
-Run this script once to recreate all tables with new schema
+Apply the pending schema migrations (migrations/NNNN_*.py) in order.
+Safe to run on every deploy: applied versions are recorded in schema_migrations.
+    python migrate_db.py               # apply all pending migrations
+    python migrate_db.py --status      # list applied and pending migrations
+    python migrate_db.py --target 2    # stop after version 2
 """
-from app.core.database import engine, Base
-from app.models.models import (
-    User, Profile, SkillCategory, Skill, OtherSkill,
-    Experience, ExperienceDuty, ExperienceDomain, Education
-)
+import argparse
+from sqlalchemy import create_engine
+from sqlalchemy.pool import NullPool
+from app.core import migrations
+from app.core.config import settings
 
-def migrate_database():
+# Not the app's engine: migrations need a direct or session-mode connection (see MIGRATION_DATABASE_URL)
+engine = create_engine(settings.MIGRATION_DATABASE_URL or settings.DATABASE_URL, poolclass=NullPool)
+
+def migrate_database(target=None):
+    if engine.dialect.name == "postgresql" and engine.url.port == migrations.TRANSACTION_POOLER_PORT:
+        print(f"⚠️  Migrating through a transaction-mode pooler (port {engine.url.port}): the migration lock is not "
+              "reliable there, set MIGRATION_DATABASE_URL to a direct or session-mode URL")
     print("Starting database migration...")
-    
-    # Drop all tables
-    print("Dropping existing tables...")
-    Base.metadata.drop_all(bind=engine)
-    
-    # Create all tables with new schema
-    print("Creating tables with Dataverse-compatible schema...")
-    Base.metadata.create_all(bind=engine)
-    
-    print("✅ Migration completed successfully!")
-    print("\nCreated tables:")
-    print("  - profiles")
-    print("  - skill_categories")
-    print("  - skills")
-    print("  - other_skills")
-    print("  - experiences")
-    print("  - experience_duties")
-    print("  - experience_domains")
-    print("  - educations")
+    applied = migrations.upgrade(
+        engine, target,
+        on_start=lambda migration: print(f"  applying {migration.version:04d}_{migration.name}..."),
+    )
+    if applied:
+        print(f"✅ Applied {len(applied)} migration(s)")
+    else:
+        print("✅ Database schema is up to date")
+
+def show_status():
+    with engine.connect() as connection:
+        applied = migrations.applied_versions(connection)
+    for migration in migrations.discover():
+        state = "applied" if migration.version in applied else "pending"
+        print(f"  {migration.version:04d}_{migration.name:<30} {state}")
 
 if __name__ == "__main__":
-    migrate_database()
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--status", action="store_true", help="list migrations without applying them")
+    parser.add_argument("--target", type=int, help="last version to apply")
+    args = parser.parse_args()
+    if args.status:
+        show_status()
+    else:
+        migrate_database(args.target)
@@ -0,0 +1,98 @@
+"""
+Tables as they were created by Base.metadata.create_all before migrations existed.
+
+Existing tables are left untouched, so this is a no-op on databases created by
+the old startup code and only records the baseline version there. The table
+definitions are frozen here on purpose: later schema changes get their own script.
+"""
+import uuid
+from datetime import datetime
+from sqlalchemy import Column, DateTime, ForeignKey, Integer, MetaData, String, Table, Text
+from sqlalchemy.dialects.postgresql import UUID
+
+metadata = MetaData()
+
+def _audit_columns():
+    return [
+        Column("created_on", DateTime(timezone=True), default=datetime.utcnow, nullable=False),
+        Column("modified_on", DateTime(timezone=True), default=datetime.utcnow, nullable=False),
+        Column("state_code", Integer, default=0, nullable=False),
+        Column("status_code", Integer, default=1, nullable=False),
+    ]
+
+def _id():
+    return Column("id", UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+
+def _user_id():
+    return Column("user_id", UUID(as_uuid=True), ForeignKey("users.id"), nullable=True)
+
+Table(
+    "users", metadata, _id(),
+    Column("email", String(255), unique=True, nullable=False, index=True),
+    Column("full_name", String(255)),
+    Column("google_id", String(255), unique=True),
+    Column("picture_url", String(500)),
+    *_audit_columns(),
+)
+Table(
+    "profiles", metadata, _id(), _user_id(),
+    Column("name", String(255), nullable=False),
+    Column("role", String(255)),
+    Column("bio", Text),
+    Column("email", String(255)),
+    Column("phone", String(50)),
+    Column("location", String(255)),
+    Column("skype", String(255)),
+    Column("linkedin_url", String(255)),
+    Column("github_url", String(255)),
+    Column("profile_image_url", String(255)),
+    *_audit_columns(),
+)
+Table(
+    "skill_categories", metadata, _id(), _user_id(),
+    Column("name", String(100), nullable=False),
+    Column("display_order", Integer, default=0),
+    *_audit_columns(),
+)
+Table(
+    "skills", metadata, _id(),
+    Column("name", String(100), nullable=False),
+    Column("category_id", UUID(as_uuid=True), ForeignKey("skill_categories.id")),
+    *_audit_columns(),
+)
+Table(
+    "other_skills", metadata, _id(), _user_id(),
+    Column("name", String(255), nullable=False),
+    *_audit_columns(),
+)
+Table(
+    "experiences", metadata, _id(), _user_id(),
+    Column("company_name", String(255), nullable=False),
+    Column("role", String(255), nullable=False),
+    Column("period_display", String(100)),
+    Column("tech_stack", Text),
+    *_audit_columns(),
+)
+Table(
+    "experience_duties", metadata, _id(),
+    Column("description", Text, nullable=False),
+    Column("experience_id", UUID(as_uuid=True), ForeignKey("experiences.id")),
+    *_audit_columns(),
+)
+Table(
+    "experience_domains", metadata, _id(),
+    Column("name", String(255), nullable=False),
+    Column("experience_id", UUID(as_uuid=True), ForeignKey("experiences.id")),
+    *_audit_columns(),
+)
+Table(
+    "educations", metadata, _id(), _user_id(),
+    Column("school", String(255), nullable=False),
+    Column("degree", String(200)),
+    Column("major", String(200)),
+    Column("education_year", String(50)),
+    *_audit_columns(),
+)
+
+def upgrade(connection):
+    metadata.create_all(connection, checkfirst=True)
@@ -0,0 +1,57 @@
+"""
+Tables of the CV processing pipeline: background jobs (cv_jobs) and the
+extraction cache (cv_extractions).
+
+Databases that got cv_jobs from the old startup code before batches existed
+are missing its batch_id column, which create_all never added.
+"""
+import uuid
+from datetime import datetime
+from sqlalchemy import (
+    JSON, Column, DateTime, ForeignKey, Index, Integer, LargeBinary, MetaData, String, Table, Text,
+)
+from sqlalchemy.dialects.postgresql import UUID
+from app.core.migrations import has_column
+
+metadata = MetaData()
+Table("users", metadata, Column("id", UUID(as_uuid=True), primary_key=True))
+
+def _audit_columns():
+    return [
+        Column("created_on", DateTime(timezone=True), default=datetime.utcnow, nullable=False),
+        Column("modified_on", DateTime(timezone=True), default=datetime.utcnow, nullable=False),
+        Column("state_code", Integer, default=0, nullable=False),
+        Column("status_code", Integer, default=1, nullable=False),
+    ]
+
+cv_jobs = Table(
+    "cv_jobs", metadata,
+    Column("id", UUID(as_uuid=True), primary_key=True, default=uuid.uuid4),
+    Column("user_id", UUID(as_uuid=True), ForeignKey("users.id"), nullable=False),
+    Column("batch_id", UUID(as_uuid=True), index=True),
+    Column("mode", String(20), nullable=False),
+    Column("status", String(20), nullable=False, default="queued"),
+    Column("file_name", String(255)),
+    Column("pdf_content", LargeBinary),
+    Column("result", JSON),
+    Column("error", Text),
+    Column("started_on", DateTime(timezone=True)),
+    Column("finished_on", DateTime(timezone=True)),
+    *_audit_columns(),
+)
+cv_extractions = Table(
+    "cv_extractions", metadata,
+    Column("content_hash", String(64), primary_key=True),
+    Column("extractor_version", String(64), primary_key=True),
+    Column("result", JSON, nullable=False),
+    Column("size_bytes", Integer, nullable=False),
+    Column("hit_count", Integer, default=0, nullable=False),
+    Column("last_used_on", DateTime(timezone=True), default=datetime.utcnow, nullable=False),
+    *_audit_columns(),
+)
+
+def upgrade(connection):
+    metadata.create_all(connection, tables=[cv_jobs, cv_extractions], checkfirst=True)
+    if not has_column(connection, "cv_jobs", "batch_id"):
+        connection.exec_driver_sql("ALTER TABLE cv_jobs ADD COLUMN batch_id UUID")
+        Index("ix_cv_jobs_batch_id", cv_jobs.c.batch_id).create(connection, checkfirst=True)
@@ -0,0 +1,43 @@
+"""
+Indexes for the queries in crud.py.
+
+- Foreign keys: every portfolio read, the version query behind the HTTP cache
+  validators and the CV replace filter on user_id (or on the parent id for
+  skills, duties and domains), none of which were indexed.
+- Partial indexes on the active rows (state_code = 0) that the portfolio reads
+  return, in the order they are returned; a CV replace soft-deletes every row,
+  so inactive rows pile up and would otherwise be scanned on each read.
+- Pending CV jobs, looked up by the job queue on startup, and the last use of
+  cached extractions, used by the cache eviction.
+
+Built with CREATE INDEX CONCURRENTLY on PostgreSQL, so writes are not blocked.
+"""
+from app.core.migrations import create_index
+
+TRANSACTIONAL = False
+
+INDEXES = [
+    # Foreign keys
+    ("ix_profiles_user_id", "profiles", "user_id", None),
+    ("ix_skill_categories_user_id", "skill_categories", "user_id", None),
+    ("ix_skills_category_id", "skills", "category_id", None),
+    ("ix_other_skills_user_id", "other_skills", "user_id", None),
+    ("ix_experiences_user_id", "experiences", "user_id", None),
+    ("ix_experience_duties_experience_id", "experience_duties", "experience_id", None),
+    ("ix_experience_domains_experience_id", "experience_domains", "experience_id", None),
+    ("ix_educations_user_id", "educations", "user_id", None),
+    ("ix_cv_jobs_user_id", "cv_jobs", "user_id", None),
+    # Active rows, matching the `user_id = ? AND state_code = 0` filters and their ORDER BY
+    ("ix_profiles_user_active", "profiles", "user_id", "state_code = 0"),
+    ("ix_skill_categories_user_active", "skill_categories", "user_id, display_order", "state_code = 0"),
+    ("ix_other_skills_user_active", "other_skills", "user_id", "state_code = 0"),
+    ("ix_experiences_user_active", "experiences", "user_id, created_on DESC", "state_code = 0"),
+    ("ix_educations_user_active", "educations", "user_id", "state_code = 0"),
+    # Background jobs and extraction cache
+    ("ix_cv_jobs_pending", "cv_jobs", "status, created_on", "status IN ('queued', 'processing')"),
+    ("ix_cv_extractions_last_used_on", "cv_extractions", "last_used_on", None),
+]
+
+def upgrade(connection):
+    for name, table, columns, where in INDEXES:
+        create_index(connection, name, table, columns, where)
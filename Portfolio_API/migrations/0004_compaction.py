@@ -0,0 +1,33 @@
+"""
+Support for the compaction of soft-deleted rows (app/services/compaction_service.py).
+
+- archived_rows: where rows go when COMPACTION_ARCHIVE is set.
+- Partial indexes on modified_on over the inactive rows (state_code <> 0), so
+  each compaction batch finds its rows without scanning the active ones.
+"""
+from datetime import datetime
+from sqlalchemy import JSON, Column, DateTime, MetaData, String, Table
+from sqlalchemy.dialects.postgresql import UUID
+from app.core.migrations import create_index
+
+TRANSACTIONAL = False
+
+COMPACTED_TABLES = [
+    "experiences", "experience_duties", "experience_domains", "educations",
+    "skill_categories", "skills", "other_skills",
+]
+
+metadata = MetaData()
+archived_rows = Table(
+    "archived_rows", metadata,
+    Column("table_name", String(64), primary_key=True),
+    Column("id", UUID(as_uuid=True), primary_key=True),
+    Column("user_id", UUID(as_uuid=True), index=True),
+    Column("data", JSON, nullable=False),
+    Column("archived_on", DateTime(timezone=True), default=datetime.utcnow, nullable=False),
+)
+
+def upgrade(connection):
+    metadata.create_all(connection, checkfirst=True)
+    for table in COMPACTED_TABLES:
+        create_index(connection, f"ix_{table}_inactive", table, "modified_on", "state_code <> 0")
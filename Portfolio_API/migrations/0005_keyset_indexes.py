@@ -0,0 +1,22 @@
+"""
+Indexes matching the keyset pagination of the list endpoints.
+
+The active-row indexes of 0003 are extended with the full ORDER BY of each list
+(ending with id, which makes the position unique), so a page is an index range
+scan that starts at the cursor, and replace them.
+"""
+from app.core.migrations import create_index, drop_index
+
+TRANSACTIONAL = False
+
+INDEXES = [
+    ("ix_skill_categories_user_active_keyset", "skill_categories", "user_id, display_order, id", "ix_skill_categories_user_active"),
+    ("ix_other_skills_user_active_keyset", "other_skills", "user_id, created_on, id", "ix_other_skills_user_active"),
+    ("ix_experiences_user_active_keyset", "experiences", "user_id, created_on DESC, id DESC", "ix_experiences_user_active"),
+    ("ix_educations_user_active_keyset", "educations", "user_id, created_on, id", "ix_educations_user_active"),
+]
+
+def upgrade(connection):
+    for name, table, columns, replaces in INDEXES:
+        create_index(connection, name, table, columns, "state_code = 0")
+        drop_index(connection, replaces)
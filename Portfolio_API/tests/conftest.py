@@ -0,0 +1,27 @@
+"""
+Test settings: a throwaway SQLite database, configured before anything imports app.core.config.
+"""
+import os
+import tempfile
+
+_DB_PATH = os.path.join(tempfile.mkdtemp(prefix="portfolio-tests-"), "test.db")
+for name in ("DB_USER", "DB_PASSWORD", "DB_HOST", "DB_PORT", "DB_NAME"):
+    os.environ.setdefault(name, "test")
+os.environ["DATABASE_URL"] = f"sqlite:///{_DB_PATH}"
+os.environ["ASYNC_DATABASE_URL"] = f"sqlite+aiosqlite:///{_DB_PATH}"
+
+import pytest
+
+@pytest.fixture
+def user_id():
+    """A fresh schema with one user"""
+    from app.core.database import Base, SessionLocal, engine
+    from app.models.models import User
+
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+    with SessionLocal() as db:
+        user = User(email="test@example.com", google_id="test")
+        db.add(user)
+        db.commit()
+        return user.id
@@ -0,0 +1,45 @@
+import asyncio
+import pytest
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+from app.api import deps
+from app.core import security
+from app.core.database import AsyncSessionLocal
+from app.core.user_cache import user_cache
+from app.crud import crud
+from app.schemas import schemas
+
+@pytest.fixture
+def client():
+    app = FastAPI()
+
+    @app.get("/me")
+    def me(user: schemas.User = Depends(deps.get_current_user)):
+        return {"id": str(user.id)}
+
+    user_cache.clear()
+    return TestClient(app)
+
+def update_user(user_id, values: dict):
+    async def run():
+        async with AsyncSessionLocal() as db:
+            return await crud.update_user(db, user_id, values)
+    return asyncio.run(run())
+
+def test_deactivated_user_is_rejected_after_an_update(client, user_id):
+    headers = {"Authorization": f"Bearer {security.create_access_token(user_id)}"}
+    assert client.get("/me", headers=headers).status_code == 200
+    assert len(user_cache) == 1
+
+    assert update_user(user_id, {"state_code": 1})
+    assert len(user_cache) == 0
+    response = client.get("/me", headers=headers)
+    assert response.status_code == 403
+    assert response.json()["detail"] == "Inactive user"
+
+def test_cached_identity_is_refreshed_after_an_update(client, user_id):
+    headers = {"Authorization": f"Bearer {security.create_access_token(user_id)}"}
+    client.get("/me", headers=headers)
+    update_user(user_id, {"full_name": "Renamed"})
+    client.get("/me", headers=headers)
+    assert user_cache.get(headers["Authorization"].split()[1]).full_name == "Renamed"
@@ -0,0 +1,81 @@
+import asyncio
+from sqlalchemy import event
+from app.core.database import AsyncSessionLocal, async_engine
+from app.crud import crud
+from app.schemas.schemas import CVExtractionResponse
+
+def make_cv(experiences: int, skills: int) -> dict:
+    return CVExtractionResponse(
+        profile={"name": "Test User", "role": "Engineer"},
+        experiences=[
+            {
+                "company_name": f"Company {i}", "role": "Engineer", "period_display": "2020 - 2022",
+                "tech_stack": "Python", "duties": [f"Duty {i}.{d}" for d in range(3)], "domains": [f"Domain {i}"],
+            }
+            for i in range(experiences)
+        ],
+        educations=[{"school": "University", "degree": "BSc", "major": "Computer Science"}],
+        skill_categories=[
+            {"category_name": f"Category {c}", "skills": [f"Skill {c}.{s}" for s in range(skills // 5)]}
+            for c in range(5)
+        ],
+        other_skills=["Git", "Docker"],
+    ).model_dump()
+
+def count_statements(user_id, extraction: dict) -> int:
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    async def replace():
+        async with AsyncSessionLocal() as db:
+            await crud.bulk_replace_cv_data(db, extraction, user_id)
+
+    event.listen(async_engine.sync_engine, "before_cursor_execute", record)
+    try:
+        asyncio.run(replace())
+    finally:
+        event.remove(async_engine.sync_engine, "before_cursor_execute", record)
+    return len(statements)
+
+def test_statement_count_does_not_grow_with_cv_size(user_id):
+    # Warm up once so both measured runs update an existing profile and deactivate old rows
+    count_statements(user_id, make_cv(experiences=1, skills=5))
+
+    small = count_statements(user_id, make_cv(experiences=1, skills=5))
+    large = count_statements(user_id, make_cv(experiences=40, skills=100))
+    assert small == large
+
+def test_replace_keeps_only_the_new_rows_active(user_id):
+    count_statements(user_id, make_cv(experiences=3, skills=10))
+    count_statements(user_id, make_cv(experiences=2, skills=5))
+
+    async def read():
+        async with AsyncSessionLocal() as db:
+            return await crud.get_experiences(db, user_id), await crud.get_skill_categories(db, user_id)
+
+    experiences, categories = asyncio.run(read())
+    assert sorted(experience.company_name for experience in experiences) == ["Company 0", "Company 1"]
+    assert sum(len(category.skills) for category in categories) == 5
+
+def test_replace_does_not_touch_rows_that_are_already_inactive(user_id):
+    from sqlalchemy import select
+    from app.models.models import Experience, OtherSkill, Skill, SkillCategory
+
+    count_statements(user_id, make_cv(experiences=2, skills=5))
+    count_statements(user_id, make_cv(experiences=2, skills=5))
+
+    async def inactive_modified_on():
+        async with AsyncSessionLocal() as db:
+            return {
+                model.__tablename__: sorted(await db.scalars(select(model.modified_on).where(model.state_code == 1)))
+                for model in (Experience, SkillCategory, Skill, OtherSkill)
+            }
+
+    before = asyncio.run(inactive_modified_on())
+    count_statements(user_id, make_cv(experiences=2, skills=5))
+    after = asyncio.run(inactive_modified_on())
+    # The rows deactivated by the second replace keep their deactivation time
+    for table, stamps in before.items():
+        assert stamps and after[table][:len(stamps)] == stamps, table
@@ -0,0 +1,80 @@
+import io
+import zipfile
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from app.api import deps
+from app.api.v1.endpoints import cv
+from app.core.config import settings
+from app.schemas import schemas
+from app.services.cv_job_service import CVJobQueue
+
+PDF = b"%PDF-1.4\n" + b"0" * 200 + b"\n%%EOF\n"
+
+@pytest.fixture
+def client(user_id, monkeypatch):
+    monkeypatch.setattr(cv, "cv_job_queue", CVJobQueue(workers=1, max_queue_size=100))
+    app = FastAPI()
+    app.include_router(cv.router, prefix="/cv")
+    app.dependency_overrides[deps.get_current_user] = lambda: schemas.User(
+        id=user_id, email="test@example.com", google_id="test", created_on="2025-01-01T00:00:00",
+        modified_on="2025-01-01T00:00:00",
+    )
+    return TestClient(app)
+
+def make_zip(entries: dict, compression=zipfile.ZIP_DEFLATED) -> bytes:
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", compression) as archive:
+        for name, content in entries.items():
+            archive.writestr(name, content)
+    return buffer.getvalue()
+
+def upload(client, *files):
+    return client.post("/cv/batches", files=[("files", file) for file in files])
+
+def test_zip_pdfs_are_queued_and_other_entries_skipped(client):
+    archive = make_zip({
+        "cvs/alice.pdf": PDF,
+        "cvs/nested/bob.PDF": PDF,
+        "cvs/notes.txt": b"not a cv",
+        "__MACOSX/cvs/._alice.pdf": b"resource fork",
+    })
+    response = upload(client, ("cvs.zip", archive), ("carol.pdf", PDF))
+    assert response.status_code == 202
+    batch = response.json()
+    assert batch["total"] == 3
+    assert [job["file_name"] for job in batch["jobs"]] == ["alice.pdf", "bob.PDF", "carol.pdf"]
+    assert all(job["status"] == "queued" for job in batch["jobs"])
+
+def test_file_without_zip_magic_is_rejected(client):
+    response = upload(client, ("cvs.zip", b"not a zip at all"))
+    assert response.status_code == 400
+    assert "cvs.zip is not a valid zip archive" in response.json()["detail"]
+
+def test_non_pdf_entry_is_rejected(client):
+    response = upload(client, ("cvs.zip", make_zip({"fake.pdf": b"<html></html>"})))
+    assert response.status_code == 400
+    assert response.json()["detail"] == "fake.pdf is not a PDF file"
+
+def test_corrupt_entry_is_rejected_with_its_name(client):
+    archive = bytearray(make_zip({"broken.pdf": PDF}, compression=zipfile.ZIP_STORED))
+    archive[archive.index(b"0" * 200) + 100] ^= 0xFF  # breaks the CRC
+    response = upload(client, ("cvs.zip", bytes(archive)))
+    assert response.status_code == 400
+    assert response.json()["detail"].startswith("broken.pdf could not be extracted from cvs.zip")
+
+def test_entry_over_the_file_limit_is_rejected(client, monkeypatch):
+    monkeypatch.setattr(settings, "CV_MAX_FILE_BYTES", 100)
+    response = upload(client, ("cvs.zip", make_zip({"big.pdf": PDF})))
+    assert response.status_code == 413
+
+def test_too_many_pdfs_are_rejected(client, monkeypatch):
+    monkeypatch.setattr(settings, "CV_BATCH_MAX_FILES", 2)
+    response = upload(client, ("cvs.zip", make_zip({f"{i}.pdf": PDF for i in range(2)})), ("extra.pdf", PDF))
+    assert response.status_code == 400
+    assert "at most 2 PDFs" in response.json()["detail"]
+
+def test_batch_over_the_total_size_is_rejected(client, monkeypatch):
+    monkeypatch.setattr(settings, "CV_BATCH_MAX_BYTES", len(PDF) * 2)
+    response = upload(client, ("cvs.zip", make_zip({f"{i}.pdf": PDF for i in range(3)})))
+    assert response.status_code == 413
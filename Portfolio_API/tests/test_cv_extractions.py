@@ -0,0 +1,37 @@
+import asyncio
+from datetime import datetime, timedelta
+from sqlalchemy import event, select
+from app.core.database import AsyncSessionLocal, async_engine
+from app.crud import crud
+from app.models.models import CVExtraction
+
+def test_eviction_is_one_statement_and_keeps_the_most_recently_used(user_id):
+    now = datetime.utcnow()
+
+    async def run(entries: int) -> tuple:
+        async with AsyncSessionLocal() as db:
+            await db.execute(CVExtraction.__table__.delete())
+            db.add_all(
+                CVExtraction(
+                    content_hash=f"{i:064}", extractor_version="v", result={}, size_bytes=100, hit_count=0,
+                    last_used_on=now - timedelta(days=40 if i == 0 else 0, minutes=i),
+                )
+                for i in range(entries)
+            )
+            await db.commit()
+
+            statements = []
+            record = lambda conn, cursor, statement, *args: statements.append(statement)
+            event.listen(async_engine.sync_engine, "before_cursor_execute", record)
+            try:
+                evicted = await crud.evict_cv_extractions(db, unused_since=now - timedelta(days=30), max_bytes=250)
+            finally:
+                event.remove(async_engine.sync_engine, "before_cursor_execute", record)
+            kept = sorted(await db.scalars(select(CVExtraction.content_hash)))
+        return evicted, len(statements), kept
+
+    evicted, small, kept = asyncio.run(run(5))
+    # Entry 0 expired; 1 and 2 are the two most recently used that fit in 250 bytes
+    assert evicted == 3
+    assert kept == [f"{1:064}", f"{2:064}"]
+    assert asyncio.run(run(50))[1] == small
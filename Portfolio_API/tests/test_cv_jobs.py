@@ -0,0 +1,56 @@
+import asyncio
+import pytest
+from app.core.database import AsyncSessionLocal
+from app.crud import crud
+from app.models.models import CVJob
+from app.services.cv_job_service import CVJobQueue
+
+async def create_job(user_id):
+    async with AsyncSessionLocal() as db:
+        job = await crud.create_cv_job(db, b"%PDF-1.4", "cv.pdf", "preview", user_id)
+        return job.id
+
+async def job_status(job_id) -> str:
+    async with AsyncSessionLocal() as db:
+        return (await db.get(CVJob, job_id)).status
+
+def test_job_is_marked_failed_when_run_raises(user_id):
+    queue = CVJobQueue(workers=1, max_queue_size=5)
+
+    async def broken_run(db, job_id):
+        raise ConnectionError("connection dropped")
+
+    queue._run = broken_run
+
+    async def run():
+        job_id = await create_job(user_id)
+        with pytest.raises(ConnectionError):
+            await queue._process(job_id)
+        return job_id, await job_status(job_id)
+
+    job_id, status = asyncio.run(run())
+    assert status == "failed"
+    assert job_id not in queue._claimed
+    assert queue.failed == 1
+
+def test_cancelled_job_is_requeued_by_stop(user_id):
+    queue = CVJobQueue(workers=1, max_queue_size=5)
+    running = asyncio.Event()
+
+    async def slow_run(db, job_id):
+        running.set()
+        await asyncio.sleep(60)
+
+    queue._run = slow_run
+
+    async def run():
+        job_id = await create_job(user_id)
+        task = asyncio.create_task(queue._process(job_id))
+        await running.wait()
+        queue._tasks = [task]
+        await queue.stop()
+        return job_id, await job_status(job_id)
+
+    job_id, status = asyncio.run(run())
+    assert status == "queued"
+    assert not queue._claimed
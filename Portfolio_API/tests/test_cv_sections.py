@@ -0,0 +1,50 @@
+from app.services.cv_sections import is_heading, normalize_heading, split_cv_sections
+
+CV = """Jane Doe
+Senior Engineer - jane@example.com
+
+Summary
+Backend engineer with ten years of experience.
+
+Work Experience
+Acme Corp | Senior Engineer | 2020 - Present
+Built the billing platform.
+
+Kinh nghiệm làm việc
+Beta Ltd | Engineer | 2016 - 2020
+
+EDUCATION
+University of Somewhere, BSc Computer Science, 2016
+
+Projects
+Open source CLI tool.
+"""
+
+def sections_by_name(text: str, min_chars: int = 0) -> dict:
+    return {section.name: section for section in split_cv_sections(text, min_chars)}
+
+def test_headings_are_normalized():
+    assert normalize_heading("  WORK EXPERIENCE:  ") == "work experience"
+    assert normalize_heading("Kinh nghiệm làm việc") == "kinh nghiem lam viec"
+    assert normalize_heading("Skills & Abilities") == "skills and abilities"
+    assert is_heading("Education") and is_heading("Projects") and not is_heading("Acme Corp")
+
+def test_sections_are_split_by_heading():
+    sections = sections_by_name(CV)
+    assert list(sections) == ["experiences", "educations", "general"]
+    assert "Acme Corp" in sections["experiences"].text and "Beta Ltd" in sections["experiences"].text
+    assert sections["educations"].text == "University of Somewhere, BSc Computer Science, 2016"
+    # Header and unrecognised sections go to "general", with the fields of the missing sections
+    assert "Jane Doe" in sections["general"].text and "Open source CLI tool." in sections["general"].text
+    assert sections["general"].fields == ("profile", "skill_categories", "other_skills")
+
+def test_short_or_unrecognised_documents_are_not_split():
+    assert split_cv_sections(CV, min_chars=len(CV) + 1) is None
+    # Experience alone is not worth splitting
+    assert split_cv_sections("Jane Doe\nExperience\nAcme Corp\n", 0) is None
+    assert split_cv_sections("Jane Doe\nEducation\nUniversity\nSkills\nPython\n", 0) is None
+
+def test_long_lines_are_never_headings():
+    # The education heading is then part of the experiences, which are not worth splitting alone
+    text = CV.replace("EDUCATION", "Education " + "x" * 40)
+    assert split_cv_sections(text, 0) is None
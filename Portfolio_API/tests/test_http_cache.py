@@ -0,0 +1,51 @@
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from app.api.v1.endpoints import portfolio
+from app.core import security
+from app.core.database import SessionLocal
+from app.models.models import Profile
+
+@pytest.fixture
+def client(user_id):
+    with SessionLocal() as db:
+        db.add(Profile(user_id=user_id, name="Jane Doe"))
+        db.commit()
+    app = FastAPI()
+    app.include_router(portfolio.router)
+    return TestClient(app)
+
+def test_validators_and_shared_caching_on_explicit_user_reads(client, user_id):
+    response = client.get(f"/profile?user_id={user_id}")
+    assert response.status_code == 200
+    assert response.headers["ETag"].startswith('W/"')
+    assert "Last-Modified" in response.headers
+    assert response.headers["Cache-Control"].startswith("public, max-age=")
+    assert response.headers["Vary"] == "Authorization"
+
+@pytest.mark.parametrize("if_none_match", ["{etag}", "{strong}", '"other", {etag}', "*"])
+def test_matching_if_none_match_returns_304(client, user_id, if_none_match):
+    etag = client.get(f"/profile?user_id={user_id}").headers["ETag"]
+    header = if_none_match.format(etag=etag, strong=etag[2:])
+    response = client.get(f"/profile?user_id={user_id}", headers={"If-None-Match": header})
+    assert response.status_code == 304
+    assert response.content == b""
+    assert response.headers["ETag"] == etag
+
+def test_other_etag_returns_the_body(client, user_id):
+    response = client.get(f"/profile?user_id={user_id}", headers={"If-None-Match": '"something-else"'})
+    assert response.status_code == 200
+    assert response.json()["name"] == "Jane Doe"
+
+def test_if_modified_since(client, user_id):
+    last_modified = client.get(f"/profile?user_id={user_id}").headers["Last-Modified"]
+    assert client.get(f"/profile?user_id={user_id}", headers={"If-Modified-Since": last_modified}).status_code == 304
+    old = "Mon, 01 Jan 2001 00:00:00 GMT"
+    assert client.get(f"/profile?user_id={user_id}", headers={"If-Modified-Since": old}).status_code == 200
+    # If-None-Match takes precedence
+    headers = {"If-Modified-Since": last_modified, "If-None-Match": '"other"'}
+    assert client.get(f"/profile?user_id={user_id}", headers=headers).status_code == 200
+
+def test_authenticated_reads_are_private(client, user_id):
+    headers = {"Authorization": f"Bearer {security.create_access_token(user_id)}"}
+    assert client.get("/profile", headers=headers).headers["Cache-Control"] == "private, no-cache"
@@ -0,0 +1,37 @@
+import asyncio
+from types import SimpleNamespace
+import pytest
+from app.services import llm_service
+from app.services.cv_sections import CVSection
+from app.services.llm_service import LLMService
+
+def test_failed_section_cancels_the_others(monkeypatch):
+    async def extract(pdf_content):
+        return "text", 1
+
+    monkeypatch.setattr(llm_service, "pdf_extractor", SimpleNamespace(extract=extract))
+    sections = [CVSection("experiences", ("experiences",), "a"), CVSection("general", ("profile",), "b")]
+    cancelled = []
+
+    async def extract_section(section):
+        if section.name == "general":
+            raise ValueError("model output is not valid JSON")
+        try:
+            await asyncio.sleep(60)
+        except asyncio.CancelledError:
+            cancelled.append(section.name)
+            raise
+
+    # Only the orchestration is exercised, so the langchain client is never created
+    service = LLMService.__new__(LLMService)
+    service._plan = lambda text: ([], sections, {})
+    service._extract_section = extract_section
+
+    async def run():
+        with pytest.raises(ValueError):
+            await service.parse_cv(b"%PDF-")
+        await asyncio.sleep(0)
+        # Checked before asyncio.run cancels whatever is left at shutdown
+        return list(cancelled)
+
+    assert asyncio.run(run()) == ["experiences"]
@@ -0,0 +1,42 @@
+import asyncio
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+from app.core.config import settings
+from app.core.database import async_engine
+from app.services.compaction_service import COMPACTED_TABLES, compaction_service
+from main import app
+
+TOKEN = "monitoring-test-token"
+
+@pytest.fixture
+def client():
+    # Without the context manager the lifespan (job workers, compaction loop) is not started
+    return TestClient(app)
+
+@pytest.mark.parametrize("path", ["/metrics", "/health/cv-jobs", "/health/compaction"])
+def test_monitoring_endpoints_are_hidden_without_a_token(client, path):
+    assert client.get(path).status_code == 404
+
+def test_monitoring_endpoints_require_the_token(client, monkeypatch):
+    monkeypatch.setattr(settings, "MONITORING_TOKEN", TOKEN)
+    assert client.get("/health/cv-jobs").status_code == 401
+    assert client.get("/health/cv-jobs", headers={"Authorization": "Bearer wrong"}).status_code == 401
+    assert client.get("/health/cv-jobs", headers={"Authorization": f"Bearer {TOKEN}"}).status_code == 200
+    assert client.get("/metrics", headers={"Authorization": f"Bearer {TOKEN}"}).status_code == 200
+
+def test_compaction_stats_come_from_the_last_run(client, monkeypatch, user_id):
+    monkeypatch.setattr(settings, "MONITORING_TOKEN", TOKEN)
+    monkeypatch.setattr(settings, "COMPACTION_BATCH_PAUSE", 0)
+    asyncio.run(compaction_service.run())
+
+    statements = []
+    record = lambda conn, cursor, statement, *args: statements.append(statement)
+    event.listen(async_engine.sync_engine, "before_cursor_execute", record)
+    try:
+        response = client.get("/health/compaction", headers={"Authorization": f"Bearer {TOKEN}"})
+    finally:
+        event.remove(async_engine.sync_engine, "before_cursor_execute", record)
+    assert response.status_code == 200
+    assert statements == []
+    assert sorted(response.json()["tables"]) == sorted(COMPACTED_TABLES)
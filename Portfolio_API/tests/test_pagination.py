@@ -0,0 +1,59 @@
+from datetime import datetime, timedelta
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import update
+from app.api.v1.endpoints import portfolio
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.models.models import Experience, Skill, SkillCategory
+
+@pytest.fixture
+def client():
+    app = FastAPI()
+    app.include_router(portfolio.router)
+    return TestClient(app)
+
+def add_experiences(user_id, count: int):
+    start = datetime(2020, 1, 1)
+    with SessionLocal() as db:
+        db.add_all(
+            Experience(
+                user_id=user_id, company_name=f"Company {i:02}", role="Engineer", period_display="2020",
+                tech_stack="Python", created_on=start + timedelta(days=i), modified_on=start + timedelta(days=i),
+            )
+            for i in range(count)
+        )
+        db.commit()
+
+def test_list_without_limit_returns_the_default_page_size(client, user_id):
+    add_experiences(user_id, settings.PAGE_SIZE_DEFAULT + 10)
+
+    first = client.get(f"/experience?user_id={user_id}")
+    assert first.status_code == 200
+    assert len(first.json()) == settings.PAGE_SIZE_DEFAULT
+    assert first.json()[0]["company_name"] == f"Company {settings.PAGE_SIZE_DEFAULT + 9:02}"  # newest first
+
+    cursor = first.headers["X-Next-Cursor"]
+    second = client.get(f"/experience?user_id={user_id}&cursor={cursor}")
+    assert [row["company_name"] for row in second.json()] == [f"Company {i:02}" for i in range(9, -1, -1)]
+    assert "X-Next-Cursor" not in second.headers
+
+def test_explicit_limit_and_fields(client, user_id):
+    add_experiences(user_id, 3)
+    response = client.get(f"/experience?user_id={user_id}&limit=2&fields=company_name")
+    assert response.json() == [{"company_name": "Company 02"}, {"company_name": "Company 01"}]
+    assert client.get(f"/experience?user_id={user_id}&limit={settings.PAGE_SIZE_MAX + 1}").status_code == 422
+
+def test_skill_categories_list_only_active_skills(client, user_id):
+    with SessionLocal() as db:
+        category = SkillCategory(user_id=user_id, name="Backend", skills=[Skill(name="Python"), Skill(name="Perl")])
+        db.add(category)
+        db.commit()
+        db.execute(update(Skill).where(Skill.name == "Perl").values(state_code=1))
+        db.commit()
+
+    categories = client.get(f"/skills/categories?user_id={user_id}").json()
+    assert [skill["name"] for skill in categories[0]["skills"]] == ["Python"]
+    portfolio_categories = client.get(f"/portfolio?user_id={user_id}").json()["skill_categories"]
+    assert [skill["name"] for skill in portfolio_categories[0]["skills"]] == ["Python"]
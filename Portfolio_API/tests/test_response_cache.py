@@ -0,0 +1,73 @@
+import asyncio
+import uuid
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from app.api.v1.endpoints import portfolio
+from app.core import response_cache, security
+from app.core.response_cache import CachedResponse, InMemoryResponseCache
+
+@pytest.fixture
+def cache(monkeypatch):
+    backend = InMemoryResponseCache(max_bytes=1024 * 1024, ttl=600)
+    monkeypatch.setattr(response_cache, "backend", backend)
+    return backend
+
+@pytest.fixture
+def client(cache):
+    app = FastAPI()
+    app.include_router(portfolio.router)
+    return TestClient(app)
+
+def test_write_then_read_returns_a_new_etag_and_body(client, cache, user_id):
+    headers = {"Authorization": f"Bearer {security.create_access_token(user_id)}"}
+    profile_id = client.post("/profile", json={"name": "Jane Doe"}, headers=headers).json()["id"]
+
+    first = client.get(f"/profile?user_id={user_id}")
+    assert client.get(f"/profile?user_id={user_id}").headers["ETag"] == first.headers["ETag"]
+    assert cache.hits == 1
+
+    assert client.put(f"/profile/{profile_id}", json={"name": "Jane Smith"}, headers=headers).status_code == 200
+    second = client.get(f"/profile?user_id={user_id}", headers={"If-None-Match": first.headers["ETag"]})
+    assert second.status_code == 200
+    assert second.json()["name"] == "Jane Smith"
+    assert second.headers["ETag"] != first.headers["ETag"]
+    assert cache.invalidations >= 1
+
+def test_portfolio_is_invalidated_by_writes_to_a_section(client, user_id):
+    headers = {"Authorization": f"Bearer {security.create_access_token(user_id)}"}
+    before = client.get(f"/portfolio?user_id={user_id}")
+    assert before.json()["experiences"] == []
+
+    experience = {"company_name": "Acme", "role": "Engineer", "period_display": "2020", "tech_stack": "Python"}
+    assert client.post("/experience", json=experience, headers=headers).status_code == 201
+    after = client.get(f"/portfolio?user_id={user_id}")
+    assert [row["company_name"] for row in after.json()["experiences"]] == ["Acme"]
+    assert after.headers["ETag"] != before.headers["ETag"]
+
+def test_entry_loaded_before_an_invalidation_is_not_stored(cache):
+    user_id, entry = uuid.uuid4(), CachedResponse(body=b"{}", etag='W/"1"')
+
+    async def run():
+        generation = await cache.generation()
+        # A write commits (and invalidates) while the read is still loading from the database
+        await cache.invalidate_user(uuid.uuid4())
+        await cache.set(user_id, "/profile", entry, generation)
+        stale = await cache.get(user_id, "/profile")
+        await cache.set(user_id, "/profile", entry, await cache.generation())
+        return stale, await cache.get(user_id, "/profile")
+
+    stale, fresh = asyncio.run(run())
+    assert stale is None
+    assert fresh == entry
+
+def test_invalidation_only_drops_the_user_entries(cache):
+    alice, bob, entry = uuid.uuid4(), uuid.uuid4(), CachedResponse(body=b"{}", etag='W/"1"')
+
+    async def run():
+        await cache.set(alice, "/profile", entry, await cache.generation())
+        await cache.set(bob, "/profile", entry, await cache.generation())
+        await cache.invalidate_user(alice)
+        return await cache.get(alice, "/profile"), await cache.get(bob, "/profile")
+
+    assert asyncio.run(run()) == (None, entry)
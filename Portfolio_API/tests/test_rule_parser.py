@@ -0,0 +1,98 @@
+import pytest
+from app.services import rule_parser
+from app.services.cv_sections import CVSection
+
+PROFILE = """Nguyen Van An
+Senior Backend Engineer
+Ho Chi Minh City, Vietnam
+an.nguyen@example.com | +84 912 345 678
+linkedin.com/in/an-nguyen | github.com/annguyen
+Summary
+Backend engineer building payment systems."""
+
+EXPERIENCES = """Senior Engineer | Acme Corp | 01/2020 - Present
+• Built the billing platform
+• Led a team of
+four engineers
+Tech stack: Python, FastAPI, PostgreSQL
+Domain: Fintech, Payments
+Beta Ltd
+Software Developer
+Jun 2016 - Dec 2019 (3 years 7 months)
+Hanoi, Vietnam
+Maintained the mobile backend."""
+
+EDUCATIONS = """University of Science
+Bachelor of Engineering, Computer Science
+2012 - 2016"""
+
+SKILLS = """Languages: Python, Go
+• Frameworks: FastAPI; Django
+Git, Docker
+Jira"""
+
+def test_profile():
+    data, confidence = rule_parser.parse_profile(PROFILE)
+    assert data["profile"] == {
+        "name": "Nguyen Van An",
+        "role": "Senior Backend Engineer",
+        "email": "an.nguyen@example.com",
+        "phone": "+84 912 345 678",
+        "linkedin_url": "linkedin.com/in/an-nguyen",
+        "github_url": "github.com/annguyen",
+        "location": "Ho Chi Minh City, Vietnam",
+        "bio": "Backend engineer building payment systems.",
+    }
+    assert confidence == 1.0
+
+def test_profile_without_a_name_is_left_to_the_llm():
+    assert rule_parser.parse_profile("contact: an@example.com") == ({"profile": None}, 0.0)
+
+def test_experiences_in_template_and_linkedin_layouts():
+    data, confidence = rule_parser.parse_experiences(EXPERIENCES)
+    assert data["experiences"] == [
+        {
+            "company_name": "Acme Corp", "role": "Senior Engineer", "period_display": "01/2020 - Present",
+            "tech_stack": "Python, FastAPI, PostgreSQL",
+            "duties": ["Built the billing platform", "Led a team of four engineers"],
+            "domains": ["Fintech", "Payments"],
+        },
+        {
+            "company_name": "Beta Ltd", "role": "Software Developer", "period_display": "Jun 2016 - Dec 2019",
+            "tech_stack": "", "duties": ["Maintained the mobile backend."], "domains": [],
+        },
+    ]
+    assert confidence == 1.0
+
+def test_experiences_without_periods_are_left_to_the_llm():
+    assert rule_parser.parse_experiences("Worked at several startups.")[1] == 0.0
+
+def test_educations():
+    data, confidence = rule_parser.parse_educations(EDUCATIONS)
+    assert data["educations"] == [{
+        "school": "University of Science", "degree": "Bachelor of Engineering",
+        "major": "Computer Science", "education_year": "2012 - 2016",
+    }]
+    assert confidence == pytest.approx(1.0)
+
+def test_skills_outside_a_category_become_other_skills():
+    data, confidence = rule_parser.parse_skills(SKILLS)
+    assert data == {
+        "skill_categories": [
+            {"category_name": "Languages", "skills": ["Python", "Go"]},
+            {"category_name": "Frameworks", "skills": ["FastAPI", "Django"]},
+        ],
+        "other_skills": ["Git", "Docker", "Jira"],
+    }
+    assert confidence == 1.0
+
+def test_sentences_in_skills_lower_the_confidence():
+    text = SKILLS + "\nStrong communication skills and a passion for building reliable systems."
+    data, confidence = rule_parser.parse_skills(text)
+    assert data["other_skills"] == ["Git", "Docker", "Jira"]
+    assert confidence == pytest.approx(0.8)
+
+def test_general_section_standing_in_for_missing_sections_is_left_to_the_llm():
+    section = CVSection("general", ("profile", "skill_categories", "other_skills"), PROFILE)
+    assert rule_parser.parse_section(section) == ({}, 0.0)
+    assert rule_parser.parse_section(CVSection("general", ("profile",), PROFILE))[1] == 1.0
@@ -0,0 +1,43 @@
+import asyncio
+import json
+from pydantic import TypeAdapter
+from app.core import serialization
+from app.core.database import AsyncSessionLocal
+from app.crud import crud
+from app.schemas import schemas
+
+PORTFOLIO_ADAPTER = TypeAdapter(schemas.Portfolio)
+
+def test_fast_path_matches_pydantic_on_a_stored_portfolio(user_id):
+    extraction = schemas.CVExtractionResponse(
+        # Only the required profile fields: the optional columns are stored as NULL
+        profile={"name": "Test User"},
+        experiences=[
+            {
+                "company_name": "Company", "role": "Engineer", "period_display": "2020 - 2022",
+                "tech_stack": "Python", "duties": ["Shipped things"], "domains": ["Fintech"],
+            },
+            {"company_name": "Other", "role": "Intern", "period_display": "2019", "tech_stack": ""},
+        ],
+        educations=[{"school": "University", "degree": "BSc", "major": "Computer Science"}],
+        skill_categories=[
+            {"category_name": "Backend", "skills": ["Python", "SQL"]},
+            {"category_name": "Empty", "skills": []},
+        ],
+        other_skills=["Git"],
+    ).model_dump()
+
+    async def load():
+        async with AsyncSessionLocal() as db:
+            await crud.bulk_replace_cv_data(db, extraction, user_id)
+        async with AsyncSessionLocal() as db:
+            data = await crud.get_portfolio(db, user_id)
+            fast = serialization.dump_json(schemas.Portfolio, data)
+            default = PORTFOLIO_ADAPTER.dump_json(PORTFOLIO_ADAPTER.validate_python(data, from_attributes=True))
+            return fast, default
+
+    fast, default = asyncio.run(load())
+    assert json.loads(fast) == json.loads(default)
+    portfolio = json.loads(fast)
+    assert portfolio["profile"]["bio"] is None
+    assert portfolio["educations"][0]["education_year"] is None
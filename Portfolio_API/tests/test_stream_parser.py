@@ -0,0 +1,39 @@
+import json
+from app.services.stream_parser import JSONSectionStream
+
+DOCUMENT = {
+    "profile": {"name": "Jane \"JD\" Doe", "bio": "Likes {braces}, [brackets]: and \\ backslashes"},
+    "experiences": [{"company_name": "A, Inc.", "duties": ["Built \"things\"", "Ran {x: 1}"]}],
+    "other_skills": ["C++", "\"quoted\""],
+}
+
+def feed_in(chunks) -> list:
+    stream = JSONSectionStream()
+    return [pair for chunk in chunks for pair in stream.feed(chunk)]
+
+def test_sections_in_a_single_chunk():
+    assert feed_in([json.dumps(DOCUMENT)]) == list(DOCUMENT.items())
+
+def test_sections_split_at_every_character():
+    # Splits keys, escaped quotes and nested objects across chunk boundaries
+    text = "```json\n" + json.dumps(DOCUMENT, indent=2) + "\n```"
+    assert feed_in(list(text)) == list(DOCUMENT.items())
+
+def test_each_section_is_returned_once_its_value_is_complete():
+    stream = JSONSectionStream()
+    assert stream.feed('{"profile": {"name": "Jane"') == []
+    assert stream.feed('}, "other_') == [("profile", {"name": "Jane"})]
+    assert stream.feed('skills": ["Go"') == []
+    assert stream.feed("]}") == [("other_skills", ["Go"])]
+
+def test_escaped_backslash_before_a_closing_quote():
+    assert feed_in(['{"a": "ends with \\\\', '", "b": 1}']) == [("a", "ends with \\"), ("b", 1)]
+
+def test_malformed_key_stops_the_stream_without_raising():
+    stream = JSONSectionStream()
+    assert stream.feed('{"profile": {"name": "Jane"}, profile: [') == [("profile", {"name": "Jane"})]
+    assert stream.failed
+    assert stream.feed('1], "other_skills": []}') == []
+
+def test_invalid_value_is_skipped():
+    assert feed_in(['{"profile": {"name": nope}, "other_skills": ["Go"]}']) == [("other_skills", ["Go"])]
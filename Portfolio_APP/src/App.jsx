@@ -327,7 +327,13 @@ const SkillsForm = ({ category, skills, onSave, onCancel }) => (
   </form>
 );
 
-const PDFUploadModal = ({ isOpen, onClose, onAction, isProcessing }) => {
+const CV_PROGRESS_MESSAGES = {
+  text_extracted: 'Đã đọc nội dung file PDF...',
+  model_started: 'AI đang phân tích CV...',
+  cache_hit: 'CV này đã được phân tích trước đó, đang tải kết quả...',
+};
+
+const PDFUploadModal = ({ isOpen, onClose, onAction, isProcessing, progress }) => {
   const [file, setFile] = useState(null);
 
   const handleFileChange = (e) => {
@@ -346,7 +352,7 @@ const PDFUploadModal = ({ isOpen, onClose, onAction, isProcessing }) => {
           <div className="p-12 text-center space-y-4">
             <div className="animate-spin rounded-full h-16 w-16 border-b-2 border-primary mx-auto"></div>
             <p className="text-white font-bold text-lg animate-pulse">Đang dùng AI phân tích CV của bạn...</p>
-            <p className="text-text-muted text-sm italic">Quá trình này có thể mất vài giây tùy vào độ dài CV.</p>
+            <p className="text-text-muted text-sm italic">{progress || 'Quá trình này có thể mất vài giây tùy vào độ dài CV.'}</p>
           </div>
         ) : (
           <>
@@ -417,7 +423,7 @@ const PDFUploadModal = ({ isOpen, onClose, onAction, isProcessing }) => {
 
 // --- End Form Components ---
 
-const Navbar = ({ isAdmin, onPDFAction, isProcessing, user, onLogin, onLogout }) => {
+const Navbar = ({ isAdmin, onPDFAction, isProcessing, cvProgress, user, onLogin, onLogout }) => {
   const [isPDFModalOpen, setIsPDFModalOpen] = useState(false);
 
   return (
@@ -465,6 +471,7 @@ const Navbar = ({ isAdmin, onPDFAction, isProcessing, user, onLogin, onLogout })
         isOpen={isPDFModalOpen}
         onClose={() => setIsPDFModalOpen(false)}
         isProcessing={isProcessing}
+        progress={cvProgress}
         onAction={(action, file) => {
           onPDFAction(action, file);
           // Don't close immediately if replace, let the handler manage it?
@@ -493,6 +500,7 @@ function App() {
   const [editing, setEditing] = useState({ section: null, id: null });
   const [localData, setLocalData] = useState(null);
   const [isProcessingCV, setIsProcessingCV] = useState(false);
+  const [cvProgress, setCvProgress] = useState('');
   const [extractedCVData, setExtractedCVData] = useState(null);
 
   React.useEffect(() => {
@@ -748,7 +756,22 @@ function App() {
     setIsProcessingCV(true);
     try {
       // action can be 'preview' or 'replace'
-      const response = await mutate(cvService.process, fileData, action);
+      let response;
+      if (action === 'preview') {
+        // Render each section as soon as the server has extracted it
+        const partial = {};
+        response = await cvService.streamPreview(fileData, (event, data) => {
+          if (event === 'progress') {
+            setCvProgress(CV_PROGRESS_MESSAGES[data.stage] || '');
+          } else if (event === 'section') {
+            partial[data.name] = data.data;
+            setCvProgress(`Đã trích xuất: ${Object.keys(partial).join(', ')}`);
+            setLocalData(transformFromApiFormat.cvExtraction(partial));
+          }
+        });
+      } else {
+        response = await mutate(cvService.process, fileData, action);
+      }
       const analyzedData = response.data;
       setExtractedCVData(analyzedData);
 
@@ -765,6 +788,7 @@ function App() {
       alert(`Lỗi khi xử lý CV: ${err.message}`);
     } finally {
       setIsProcessingCV(false);
+      setCvProgress('');
     }
   };
 
@@ -805,6 +829,7 @@ function App() {
           isAdmin={isAdmin}
           onPDFAction={handlePDFAction}
           isProcessing={isProcessingCV}
+          cvProgress={cvProgress}
           user={user}
           onLogin={login}
           onLogout={handleLogout}
@@ -1,11 +1,5 @@
 import React, { createContext, useContext, useState, useEffect } from 'react';
-import {
-    profileService,
-    skillCategoryService,
-    otherSkillService,
-    experienceService,
-    educationService,
-} from '../services/portfolioService';
+import { portfolioService } from '../services/portfolioService';
 import { transformFromApiFormat } from '../utils/dataTransform';
 
 const PortfolioContext = createContext();
@@ -31,20 +25,14 @@ export const PortfolioProvider = ({ children }) => {
             const preferredUserId = localStorage.getItem('preferred_user_id');
             const params = preferredUserId ? { user_id: preferredUserId } : {};
 
-            const [profile, categories, otherSkills, experiences, educations] = await Promise.all([
-                profileService.getProfile(params).catch(() => null),
-                skillCategoryService.getAll(params),
-                otherSkillService.getAll(params),
-                experienceService.getAll(params),
-                educationService.getAll(params),
-            ]);
+            const portfolio = await portfolioService.getPortfolio(params);
 
             setData({
-                profile: profile ? transformFromApiFormat.profile(profile) : null,
-                skillsByCategory: transformFromApiFormat.skillsByCategory(categories),
-                otherSkills: transformFromApiFormat.otherSkills(otherSkills),
-                experience: experiences.map(transformFromApiFormat.experience),
-                education: educations.map(transformFromApiFormat.education),
+                profile: portfolio.profile ? transformFromApiFormat.profile(portfolio.profile) : null,
+                skillsByCategory: transformFromApiFormat.skillsByCategory(portfolio.skill_categories),
+                otherSkills: transformFromApiFormat.otherSkills(portfolio.other_skills),
+                experience: portfolio.experiences.map(transformFromApiFormat.experience),
+                education: portfolio.educations.map(transformFromApiFormat.education),
             });
         } catch (err) {
             setError(err.message);
@@ -62,6 +62,46 @@ class ApiClient {
     }
   }
 
+  /**
+   * POST and read a Server-Sent Events response, calling onEvent(event, data) for each event
+   */
+  async postEventStream(endpoint, data, onEvent) {
+    const headers = {};
+    const token = localStorage.getItem('auth_token');
+    if (token) {
+      headers['Authorization'] = `Bearer ${token}`;
+    }
+
+    const response = await fetch(`${this.baseURL}${endpoint}`, { method: 'POST', headers, body: data });
+    if (!response.ok) {
+      const error = await response.json().catch(() => ({ detail: 'An error occurred' }));
+      throw new Error(error.detail || `HTTP ${response.status}: ${response.statusText}`);
+    }
+
+    const reader = response.body.getReader();
+    const decoder = new TextDecoder();
+    let buffer = '';
+    for (;;) {
+      const { done, value } = await reader.read();
+      if (done) break;
+      buffer += decoder.decode(value, { stream: true });
+
+      // Events are separated by a blank line
+      let boundary;
+      while ((boundary = buffer.indexOf('\n\n')) !== -1) {
+        const raw = buffer.slice(0, boundary);
+        buffer = buffer.slice(boundary + 2);
+        let event = 'message';
+        let payload = '';
+        raw.split('\n').forEach((line) => {
+          if (line.startsWith('event:')) event = line.slice(6).trim();
+          else if (line.startsWith('data:')) payload += line.slice(5).trim();
+        });
+        onEvent(event, payload ? JSON.parse(payload) : null);
+      }
+    }
+  }
+
   get(endpoint, options = {}) {
     return this.request(endpoint, { ...options, method: 'GET' });
   }
@@ -14,6 +14,13 @@ const buildQuery = (params = {}) => {
   return queryString ? `?${queryString}` : '';
 };
 
+/**
+ * Portfolio API Service (whole portfolio in a single request)
+ */
+export const portfolioService = {
+  getPortfolio: (params) => apiClient.get(`/portfolio${buildQuery(params)}`),
+};
+
 /**
  * Profile API Service
  */
@@ -83,12 +90,39 @@ export const educationService = {
 /**
  * CV Extraction API Service
  */
+const CV_JOB_POLL_INTERVAL_MS = 1500;
+
 export const cvService = {
-  process: (file, mode = 'preview') => {
+  submitJob: (file, mode = 'preview') => {
     const formData = new FormData();
     formData.append('file', file);
     formData.append('mode', mode);
-    return apiClient.post('/cv/process', formData);
+    return apiClient.post('/cv/jobs', formData);
+  },
+  getJob: (id) => apiClient.get(`/cv/jobs/${id}`),
+  // Queue the CV and poll the background job until it finishes
+  process: async (file, mode = 'preview') => {
+    let job = await cvService.submitJob(file, mode);
+    while (job.status === 'queued' || job.status === 'processing') {
+      await new Promise((resolve) => setTimeout(resolve, CV_JOB_POLL_INTERVAL_MS));
+      job = await cvService.getJob(job.id);
+    }
+    if (job.status === 'failed') {
+      throw new Error(job.error || 'Error processing CV');
+    }
+    return { success: true, data: job.result };
+  },
+  // Preview with progress and sections delivered as soon as they are extracted
+  streamPreview: async (file, onEvent) => {
+    const formData = new FormData();
+    formData.append('file', file);
+    let result = null;
+    await apiClient.postEventStream('/cv/process/stream', formData, (event, data) => {
+      if (event === 'error') throw new Error(data.detail);
+      if (event === 'result') result = data;
+      onEvent(event, data);
+    });
+    return { success: true, data: result };
   },
 };
 